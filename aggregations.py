@@ -0,0 +1,253 @@
+"""
+THE SHOP INDIA - AGGREGATION ENGINE
+===================================
+Single-pass aggregation shared by the analysis report and the charts.
+
+The catalog is grouped once on Main_Category x Price_Band x Stock_Status.
+That small partial table holds every sum, count, min and max the report
+needs; the per-category, per-price-band and per-stock-status views are
+roll-ups of it and never touch the product rows again.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Price bands used throughout the report
+PRICE_BAND_BINS = [0, 1000, 2000, 3000, 5000, 50000]
+PRICE_BAND_LABELS = ['Budget (<₹1K)', 'Economy (₹1-2K)',
+                     'Mid-Range (₹2-3K)', 'Premium (₹3-5K)',
+                     'Luxury (>₹5K)']
+
+# Short names of the bands: 'budget' -> 'Budget (<₹1K)', ...
+BAND_ALIASES = {label.split(' ')[0].lower(): label for label in PRICE_BAND_LABELS}
+
+# Price_Band key of prices outside the band bins, where a missing band cannot be a key
+NO_BAND = 'Unbanded'
+
+GROUP_KEYS = ['Main_Category', 'Price_Band', 'Stock_Status']
+
+# How each partial column combines when partial tables are rolled up
+PARTIAL_COLUMNS = {
+    'Product_Count': 'sum',
+    'Revenue': 'sum',
+    'Units_Sold': 'sum',
+    'Price_Sum': 'sum',
+    'Rating_Sum': 'sum',
+    'Rating_Min': 'min',
+    'Rating_Max': 'max',
+    'Reviews': 'sum',
+    'OOS_Bestsellers': 'sum',
+    'High_Rated_Slow': 'sum',
+    'Date_Min': 'min',
+    'Date_Max': 'max',
+}
+
+
+def price_bands(prices):
+    """Bucket prices into the report's price bands"""
+    return pd.cut(prices, bins=PRICE_BAND_BINS, labels=PRICE_BAND_LABELS)
+
+
+def parse_size(value):
+    """Catalog size: '1.5K' -> 1500, '10M' -> 10000000, '2500' -> 2500"""
+    value = value.strip().upper()
+    scale = {'K': 1_000, 'M': 1_000_000}.get(value[-1:], 1)
+    number = value[:-1] if scale > 1 else value
+    return int(round(float(number) * scale))
+
+
+def add_price_band(df):
+    """Add the Price_Band column to a product table (in place) and return it"""
+    df['Price_Band'] = price_bands(df['Price_INR'])
+    return df
+
+
+def partial_aggregates(df, keys=GROUP_KEYS):
+    """
+    Group the product table once on GROUP_KEYS and return the partial
+    aggregate table (one row per observed key combination). keys may add
+    leading grouping columns (e.g. Region) to GROUP_KEYS.
+    """
+    work = df.assign(
+        OOS_Bestseller=((df['Stock_Status'] == 'Out of Stock') &
+                        (df['Performance_Tier'] == 'Bestseller')).astype(np.int64),
+        High_Rated_Slow=((df['Customer_Rating'] >= 4.5) &
+                         (df['Performance_Tier'] == 'Slow')).astype(np.int64),
+    )
+    if 'Price_Band' not in work.columns:
+        work['Price_Band'] = price_bands(work['Price_INR'])
+    if pd.api.types.is_datetime64_any_dtype(work['Date_Added']):
+        work['Date_Added'] = work['Date_Added'].dt.strftime('%Y-%m-%d')
+
+    partial = work.groupby(keys, observed=True, dropna=False).agg(
+        Product_Count=('Price_INR', 'size'),
+        Revenue=('Revenue_30_Days', 'sum'),
+        Units_Sold=('Units_Sold_30_Days', 'sum'),
+        Price_Sum=('Price_INR', 'sum'),
+        Rating_Sum=('Customer_Rating', 'sum'),
+        Rating_Min=('Customer_Rating', 'min'),
+        Rating_Max=('Customer_Rating', 'max'),
+        Reviews=('Num_Reviews', 'sum'),
+        OOS_Bestsellers=('OOS_Bestseller', 'sum'),
+        High_Rated_Slow=('High_Rated_Slow', 'sum'),
+        Date_Min=('Date_Added', 'min'),
+        Date_Max=('Date_Added', 'max'),
+    ).reset_index()
+
+    # Plain string keys so partial tables from different sources concatenate
+    partial[keys] = partial[keys].astype(object)
+    return partial
+
+
+class CatalogAggregates:
+    """
+    Every per-category, per-price-band and per-stock-status metric of a
+    catalog, rolled up from one partial aggregate table.
+
+    Attributes (all small DataFrames / scalars):
+        category     - per Main_Category: Product_Count, Total_Revenue,
+                       Total_Units_Sold, Avg_Price, Avg_Rating, Min_Rating,
+                       Max_Rating, Total_Reviews (sorted by category name)
+        price_band   - per Price_Band: Product_Count, Units_Sold, Revenue
+        stock        - Main_Category x Stock_Status product counts
+        stock_counts - products per Stock_Status, most common first
+        totals       - catalog-wide totals (dict)
+    """
+
+    def __init__(self, partial):
+        self.partial = partial
+        self._build()
+
+    @classmethod
+    def from_frame(cls, df):
+        """Aggregate a product table in one grouped pass"""
+        return cls(partial_aggregates(df))
+
+    @classmethod
+    def merge(cls, parts):
+        """Combine aggregates (or partial tables) of disjoint product sets"""
+        partials = [p.partial if isinstance(p, cls) else p for p in parts]
+        return cls(rollup(pd.concat(partials, ignore_index=True), GROUP_KEYS))
+
+    def _build(self):
+        partial = self.partial
+
+        cat = rollup(partial, ['Main_Category']).set_index('Main_Category')
+        self.category = pd.DataFrame({
+            'Product_Count': cat['Product_Count'],
+            'Total_Revenue': cat['Revenue'],
+            'Total_Units_Sold': cat['Units_Sold'],
+            'Avg_Price': cat['Price_Sum'] / cat['Product_Count'],
+            'Avg_Rating': cat['Rating_Sum'] / cat['Product_Count'],
+            'Min_Rating': cat['Rating_Min'],
+            'Max_Rating': cat['Rating_Max'],
+            'Total_Reviews': cat['Reviews'],
+        }).sort_index()
+
+        band = rollup(partial.dropna(subset=['Price_Band']), ['Price_Band'])
+        band = band.set_index('Price_Band').reindex(PRICE_BAND_LABELS)
+        band.index = pd.CategoricalIndex(band.index, categories=PRICE_BAND_LABELS,
+                                         ordered=True, name='Price_Band')
+        self.price_band = pd.DataFrame({
+            'Product_Count': band['Product_Count'].fillna(0).astype(np.int64),
+            'Units_Sold': band['Units_Sold'].fillna(0).astype(np.int64),
+            'Revenue': band['Revenue'].fillna(0.0),
+        })
+
+        stock = rollup(partial, ['Main_Category', 'Stock_Status'])
+        self.stock = (stock.set_index(['Main_Category', 'Stock_Status'])['Product_Count']
+                      .unstack(fill_value=0).sort_index().sort_index(axis=1))
+
+        self.stock_counts = self.stock.sum().sort_values(ascending=False, kind='stable')
+        self.stock_counts.name = 'count'
+
+        n = int(cat['Product_Count'].sum())
+        revenue = float(cat['Revenue'].sum())
+        units = int(cat['Units_Sold'].sum())
+        self.totals = {
+            'products': n,
+            'categories': len(cat),
+            'revenue': revenue,
+            'units': units,
+            'avg_price': float(cat['Price_Sum'].sum()) / n if n else np.nan,
+            'avg_order_value': revenue / units if units else np.nan,
+            'avg_rating': float(cat['Rating_Sum'].sum()) / n if n else np.nan,
+            'reviews': int(cat['Reviews'].sum()),
+            'oos_bestsellers': int(cat['OOS_Bestsellers'].sum()),
+            'high_rated_slow': int(cat['High_Rated_Slow'].sum()),
+            'date_min': cat['Date_Min'].min() if n else None,
+            'date_max': cat['Date_Max'].max() if n else None,
+        }
+
+    # ------------------------------------------------------------------
+    # Report tables (same layout as the original per-section groupbys)
+    # ------------------------------------------------------------------
+
+    def category_performance(self):
+        """SECTION 2 table, sorted by revenue"""
+        table = self.category[['Product_Count', 'Total_Revenue', 'Total_Units_Sold',
+                               'Avg_Price', 'Avg_Rating']].round(2)
+        return table.sort_values('Total_Revenue', ascending=False)
+
+    def price_distribution(self):
+        """SECTION 4 table"""
+        table = self.price_band.round(2)
+        table['Avg_Revenue_Per_Product'] = (
+            table['Revenue'] / table['Product_Count']
+        ).round(2)
+        return table
+
+    def stock_analysis(self):
+        """SECTION 5 table"""
+        table = self.stock.copy()
+        for status in ['In Stock', 'Low Stock', 'Out of Stock']:
+            if status not in table.columns:
+                table[status] = 0
+        table['Total'] = table.sum(axis=1)
+        table['Out_of_Stock_%'] = (table['Out of Stock'] / table['Total'] * 100).round(2)
+        return table
+
+    def rating_analysis(self):
+        """SECTION 6 table, sorted by average rating"""
+        table = self.category[['Avg_Rating', 'Min_Rating', 'Max_Rating',
+                               'Total_Reviews']].round(2)
+        return table.sort_values('Avg_Rating', ascending=False)
+
+
+def rollup(partial, keys):
+    """Roll a partial aggregate table up to the given subset of GROUP_KEYS"""
+    spec = {col: how for col, how in PARTIAL_COLUMNS.items() if col in partial.columns}
+    return partial.groupby(keys, sort=True, observed=True, dropna=False).agg(spec).reset_index()
+
+
+def top_k_per_group(df, by, metric, k=3, ascending=False, tie_breaker=None):
+    """
+    Top k rows of every group in one grouped pass (no per-group masks).
+
+    by may be one column or a list of columns; groups come out in order of
+    first appearance, each ranked by `metric` (largest first unless
+    ascending=True) with a 1-based Rank column. Ties are broken by
+    `tie_breaker` (ascending) and then by row order, so results are
+    deterministic for any k - matching DataFrame.nlargest(keep='first').
+    """
+    if len(df) == 0 or k <= 0:
+        return df.iloc[:0].assign(Rank=np.array([], dtype=np.int64))
+
+    group_codes = df.groupby(by, sort=False, observed=True).ngroup().to_numpy()
+    values = df[metric].to_numpy(dtype=float)
+    sort_keys = [np.arange(len(df))]
+    if tie_breaker is not None:
+        sort_keys.append(pd.factorize(df[tie_breaker], sort=True)[0])
+    sort_keys += [values if ascending else -values, group_codes]
+
+    order = np.lexsort(sort_keys)
+    order = order[group_codes[order] >= 0]          # rows with a missing key
+    sorted_codes = group_codes[order]
+
+    # Position of every sorted row within its group
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    sizes = np.diff(np.r_[starts, len(order)])
+    rank = np.arange(len(order)) - np.repeat(starts, sizes)
+
+    keep = rank < k
+    return df.iloc[order[keep]].assign(Rank=rank[keep] + 1)
@@ -0,0 +1,239 @@
+"""
+THE SHOP INDIA - BENCHMARK SUITE
+================================
+Times the pipeline stages and measures their peak memory at several
+synthetic catalog sizes:
+
+    generate        generate_shop_india_data() (row loop up to LOOP_MAX_PRODUCTS,
+                    batched generator above)
+    analysis        the grouped aggregation pass, the row-level report inputs
+                    and each report section (output discarded)
+    csv             saving the dataset, parsing it back (plain and typed) and
+                    loading the cached Feather snapshot
+    charts          the chart summaries (in memory and in chunked passes) and
+                    each chart of create_visualizations.py rendered from them
+
+Wall time is the best of --repeat untraced runs; peak memory is the
+tracemalloc peak of one extra traced run (Python and NumPy allocations;
+memory-mapped snapshot columns are not counted). Results are written as JSON
+together with the git commit and library versions, and two result files
+can be compared stage by stage.
+
+Usage:
+    python benchmark.py --sizes 1.5K,100K,1M,10M --output bench_results.json
+    python benchmark.py --sizes 1M --stages analysis,csv
+    python benchmark.py --compare bench_before.json bench_after.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from aggregations import CatalogAggregates, parse_size
+from chart_summaries import ChartSummary
+from data_loader import feather, load_products, read_products_csv
+from report import REPORT_SECTIONS, report_inputs
+from shop_india_analysis import generate_shop_india_data
+
+DEFAULT_SIZES = '1.5K,100K,1M,10M'
+STAGES = ['generate', 'analysis', 'csv', 'charts']
+LOOP_MAX_PRODUCTS = 100_000     # larger catalogs use the batched generator
+SLOWER_THRESHOLD = 1.10         # --compare flags stages at least 10% slower
+CHART_CHUNKSIZE = 1_000_000     # rows per chunk of the chunked chart summaries
+
+
+def measure(fn, repeat=1, trace_memory=True):
+    """
+    Run fn() `repeat` times untraced and once under tracemalloc.
+
+    Returns (result, best wall seconds, peak traced bytes or None).
+    """
+    best = float('inf')
+    result = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - start)
+
+        peak = None
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                result = fn()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    return result, best, peak
+
+
+class Benchmark:
+    """Collects one record per (catalog size, stage)"""
+
+    def __init__(self, repeat=1, trace_memory=True):
+        self.repeat = repeat
+        self.trace_memory = trace_memory
+        self.results = []
+
+    def run(self, size, stage, fn, rows=None, **extra):
+        result, wall, peak = measure(fn, self.repeat, self.trace_memory)
+        record = {
+            'size': size,
+            'stage': stage,
+            'wall_s': round(wall, 6),
+            'peak_mib': None if peak is None else round(peak / 2**20, 3),
+            'rows': size if rows is None else rows,
+            **extra,
+        }
+        self.results.append(record)
+        peak_text = '' if peak is None else f"{record['peak_mib']:>10.1f} MiB"
+        print(f"  {stage:<32}{wall:>10.3f} s{peak_text}")
+        return result
+
+
+def bench_size(bench, size, stages, workdir):
+    """Run the selected stages for one catalog size"""
+    print(f"\n📏 {size:,} products")
+
+    batched = size > LOOP_MAX_PRODUCTS
+    df = bench.run(size, 'generate', lambda: generate_shop_india_data(size, batched=batched),
+                   mode='batched' if batched else 'loop') if 'generate' in stages else \
+        generate_shop_india_data(size, batched=True)
+
+    if 'analysis' in stages:
+        agg = bench.run(size, 'analysis.aggregate', lambda: CatalogAggregates.from_frame(df))
+        inputs = bench.run(size, 'analysis.report_inputs', lambda: report_inputs(df))
+        for name, section in REPORT_SECTIONS.items():
+            bench.run(size, f'analysis.{name}', lambda: section(agg, inputs))
+
+    if 'csv' in stages or 'charts' in stages:
+        csv_path = os.path.join(workdir, f'products_{size}.csv')
+        if 'csv' in stages:
+            bench.run(size, 'csv.save', lambda: df.to_csv(csv_path, index=False))
+        else:
+            df.to_csv(csv_path, index=False)
+        del df
+
+        if 'csv' in stages:
+            bench.run(size, 'csv.load', lambda: pd.read_csv(csv_path))
+            bench.run(size, 'csv.load_typed', lambda: read_products_csv(csv_path))
+            if feather is not None:
+                load_products(csv_path)         # build the snapshot
+                bench.run(size, 'csv.load_snapshot', lambda: load_products(csv_path))
+
+        if 'charts' in stages:
+            # matplotlib/seaborn are only needed for this stage
+            from create_visualizations import CHARTS, render_task
+
+            loaded = read_products_csv(csv_path)
+            summary = bench.run(size, 'charts.summary', lambda: ChartSummary.from_frame(loaded))
+            del loaded
+            bench.run(size, 'charts.summary_chunked',
+                      lambda: ChartSummary.from_csv(csv_path, CHART_CHUNKSIZE))
+            for number, (_, _, chart_data, _) in CHARTS.items():
+                bench.run(size, f'chart{number}',
+                          lambda: render_task(number, chart_data(summary), workdir))
+
+        for path in os.listdir(workdir):
+            os.remove(os.path.join(workdir, path))
+
+
+def environment():
+    """Commit and library versions the results were measured with"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run_benchmarks(sizes, stages=STAGES, repeat=1, trace_memory=True):
+    """Benchmark every size; returns the results document"""
+    bench = Benchmark(repeat, trace_memory)
+    with tempfile.TemporaryDirectory(prefix='shop_india_bench_') as workdir:
+        for size in sizes:
+            bench_size(bench, size, stages, workdir)
+    return {'environment': environment(), 'repeat': repeat, 'results': bench.results}
+
+
+def compare(before_path, after_path, threshold=SLOWER_THRESHOLD):
+    """Print the wall time and peak memory ratio of every common (size, stage)"""
+    def load(path):
+        with open(path, encoding='utf-8') as f:
+            doc = json.load(f)
+        return doc, {(r['size'], r['stage']): r for r in doc['results']}
+
+    before_doc, before = load(before_path)
+    after_doc, after = load(after_path)
+    print(f"Before: {before_path} ({before_doc['environment'].get('commit')})")
+    print(f"After:  {after_path} ({after_doc['environment'].get('commit')})\n")
+
+    print(f"{'Size':>12}  {'Stage':<32}{'Before (s)':>12}{'After (s)':>12}{'Ratio':>8}"
+          f"{'Peak ratio':>12}")
+    print("-" * 88)
+    slower = []
+    for key in sorted(before.keys() & after.keys()):
+        b, a = before[key], after[key]
+        ratio = a['wall_s'] / b['wall_s'] if b['wall_s'] else float('nan')
+        peak_ratio = (a['peak_mib'] / b['peak_mib']
+                      if a.get('peak_mib') and b.get('peak_mib') else float('nan'))
+        flag = '  ⚠️' if ratio >= threshold else ''
+        if flag:
+            slower.append(key)
+        print(f"{key[0]:>12,}  {key[1]:<32}{b['wall_s']:>12.3f}{a['wall_s']:>12.3f}"
+              f"{ratio:>8.2f}{peak_ratio:>12.2f}{flag}")
+    print(f"\n{len(slower)} stage(s) at least {threshold - 1:.0%} slower")
+    return slower
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark The Shop India pipeline stages")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f"comma-separated catalog sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f"comma-separated stages to run (default: {','.join(STAGES)})")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="untraced runs per stage; the best wall time is kept")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the traced run (no peak memory, half the time)")
+    parser.add_argument('--output', default='bench_results.json', help="results file (JSON)")
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'),
+                        help="compare two results files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        sys.exit(0)
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stage(s): {sorted(unknown)} (choose from {', '.join(STAGES)})")
+
+    sizes = [parse_size(v) for v in args.sizes.split(',') if v.strip()]
+    doc = run_benchmarks(sizes, stages, args.repeat, trace_memory=not args.no_memory)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(doc, f, indent=2)
+    print(f"\n✓ Results saved to: {args.output}")
@@ -0,0 +1,244 @@
+"""
+THE SHOP INDIA - BUNDLE RECOMMENDER
+===================================
+Pairs every high-rated slow-mover (Customer_Rating >= 4.5, Performance_Tier
+'Slow') with the in-stock bestsellers most similar to it, for the
+"bundle high-rated slow-movers with bestsellers" recommendation.
+
+Every product is a sparse one-hot vector over Main_Category, Sub_Category,
+Price_Band, Color and Fabric. The similarity of a slow-mover and a
+bestseller is the weighted count of attributes they share (FEATURE_WEIGHTS),
+i.e. one sparse matrix product; ties go to the bestseller with more units
+sold, then to catalog order.
+
+Products with the same five attributes score identically, so the matching
+runs on distinct attribute profiles: each slow-mover profile is matched
+once, and of every bestseller profile only its top-N sellers can ever be a
+partner. The profile x candidate products are computed in blocks of about
+BLOCK_ELEMENTS scores (bounded memory), spread over a process pool for
+large catalogs, and only the top N partners per block row are kept.
+
+Usage:
+    python bundle_recommender.py product_analysis_data.csv --partners 5
+    python bundle_recommender.py --products 1M --output bundle_recommendations.csv
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from aggregations import parse_size, price_bands
+
+DEFAULT_OUTPUT = 'bundle_recommendations.csv'
+DEFAULT_PARTNERS = 5
+SLOW_MOVER_MIN_RATING = 4.5
+BLOCK_ELEMENTS = 4_000_000          # profile x candidate scores per block
+PARALLEL_MIN_ELEMENTS = 200_000_000  # below this matching stays in-process
+
+# Attribute -> weight of a match (integers, so scores are exact)
+FEATURE_WEIGHTS = {
+    'Sub_Category': 4,
+    'Main_Category': 2,
+    'Price_Band': 2,
+    'Color': 1,
+    'Fabric': 1,
+}
+
+BUNDLE_COLUMNS = ['Product_ID', 'Product_Name', 'Main_Category', 'Sub_Category', 'Price_INR',
+                  'Color', 'Fabric', 'Units_Sold_30_Days', 'Stock_Status', 'Customer_Rating',
+                  'Performance_Tier']
+
+
+def slow_mover_mask(df):
+    """High-rated slow-movers (the bundle anchors)"""
+    return (df['Customer_Rating'] >= SLOW_MOVER_MIN_RATING) & (df['Performance_Tier'] == 'Slow')
+
+
+def partner_mask(df):
+    """Bestsellers that can be bundled (in stock)"""
+    return (df['Performance_Tier'] == 'Bestseller') & (df['Stock_Status'] != 'Out of Stock')
+
+
+def feature_codes(df):
+    """
+    [product, attribute] column index of every attribute value in the
+    one-hot feature space (-1 where the value is missing), and its width
+    """
+    codes = np.empty((len(df), len(FEATURE_WEIGHTS)), dtype=np.int64)
+    width = 0
+    for j, col in enumerate(FEATURE_WEIGHTS):
+        values = price_bands(df['Price_INR']) if col == 'Price_Band' else df[col]
+        col_codes, uniques = pd.factorize(values.astype(object))
+        codes[:, j] = np.where(col_codes >= 0, col_codes + width, -1)
+        width += len(uniques)
+    return codes, width
+
+
+def feature_matrix(codes, width, weighted):
+    """Sparse one-hot rows of `codes` (weighted by FEATURE_WEIGHTS or 0/1)"""
+    weights = np.array(list(FEATURE_WEIGHTS.values()), dtype=np.int32)
+    rows, attrs = np.nonzero(codes >= 0)
+    data = weights[attrs] if weighted else np.ones(len(rows), dtype=np.int32)
+    return sparse.csr_matrix((data, (rows, codes[rows, attrs])), shape=(len(codes), width))
+
+
+def top_partners(profiles, candidates, n_partners):
+    """
+    Top n_partners candidate columns of every profile row by score; a
+    lower column wins ties (candidates are ordered by preference).
+    Returns (partner columns, scores), both [row, n_partners].
+    """
+    scores = (profiles @ candidates).toarray()
+    n = scores.shape[1]
+    key = scores.astype(np.int64) * n + (n - 1 - np.arange(n))
+    k = min(n_partners, n)
+    best = np.argpartition(-key, k - 1, axis=1)[:, :k] if k < n else np.tile(np.arange(n), (len(key), 1))
+    order = np.argsort(-np.take_along_axis(key, best, axis=1), axis=1)
+    best = np.take_along_axis(best, order, axis=1)
+    return best, np.take_along_axis(scores, best, axis=1)
+
+
+def _first_per_group(groups, n):
+    """Mask of the first n members of every group (in array order)"""
+    order = np.argsort(groups, kind='stable')
+    sorted_groups = groups[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_groups)) + 1]
+    rank = np.arange(len(groups)) - np.repeat(starts, np.diff(np.r_[starts, len(groups)]))
+    keep = np.zeros(len(groups), dtype=bool)
+    keep[order[rank < n]] = True
+    return keep
+
+
+# ============================================================================
+# RECOMMENDATION
+# ============================================================================
+
+def recommend_bundles(df, n_partners=DEFAULT_PARTNERS, workers=None):
+    """
+    Top n_partners bestseller partners of every high-rated slow-mover.
+
+    Returns one row per (slow-mover, partner): the slow-mover's columns,
+    Rank, the partner's Partner_* columns, Score (weighted shared
+    attributes), Similarity (Score / total weight) and Shared (attribute
+    names). Slow-movers keep catalog order; partners with nothing in
+    common are left out.
+    """
+    codes, width = feature_codes(df)
+    slow = np.flatnonzero(slow_mover_mask(df).to_numpy())
+    partners = np.flatnonzero(partner_mask(df).to_numpy())
+    # Preference order: most units sold first, then catalog order
+    units = df['Units_Sold_30_Days'].to_numpy()
+    partners = partners[np.argsort(-units[partners], kind='stable')]
+    if len(slow) == 0 or len(partners) == 0:
+        return _bundle_table(df, slow, np.empty((len(slow), 0), dtype=np.int64),
+                             np.empty((len(slow), 0), dtype=np.int64), codes)
+
+    profiles, slow_profile = np.unique(codes[slow], axis=0, return_inverse=True)
+    _, partner_profile = np.unique(codes[partners], axis=0, return_inverse=True)
+    candidates = partners[_first_per_group(partner_profile.ravel(), n_partners)]
+
+    profile_matrix = feature_matrix(profiles, width, weighted=True)
+    candidate_matrix = feature_matrix(codes[candidates], width, weighted=False).T.tocsc()
+    block_rows = max(1, BLOCK_ELEMENTS // len(candidates))
+    blocks = [profile_matrix[s:s + block_rows] for s in range(0, len(profiles), block_rows)]
+
+    elements = len(profiles) * len(candidates)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if elements >= PARALLEL_MIN_ELEMENTS else 1
+    if workers <= 1 or len(blocks) <= 1:
+        results = [top_partners(block, candidate_matrix, n_partners) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(top_partners, blocks, [candidate_matrix] * len(blocks),
+                                    [n_partners] * len(blocks)))
+    best = np.concatenate([b for b, _ in results])
+    scores = np.concatenate([s for _, s in results])
+
+    slow_profile = slow_profile.ravel()
+    return _bundle_table(df, slow, candidates[best[slow_profile]], scores[slow_profile], codes)
+
+
+def _bundle_table(df, slow, partner_rows, scores, codes):
+    """Long table of the (slow-mover, partner) pairs with a positive score"""
+    n = partner_rows.shape[1]
+    anchor = np.repeat(slow, n)
+    partner = partner_rows.ravel()
+    score = scores.ravel()
+    keep = score > 0
+    anchor, partner, score = anchor[keep], partner[keep], score[keep]
+
+    names = np.array(list(FEATURE_WEIGHTS))
+    shared = (codes[anchor] == codes[partner]) & (codes[anchor] >= 0)
+    labels = np.array([', '.join(names[np.array(bits, dtype=bool)])
+                       for bits in np.ndindex(*(2,) * len(names))], dtype=object)
+    shared_label = labels[shared.astype(np.int64) @ (1 << np.arange(len(names))[::-1])]
+
+    columns = [c for c in BUNDLE_COLUMNS if c in df.columns]
+    anchors = df.iloc[anchor][[c for c in columns if c not in ('Stock_Status', 'Performance_Tier')]]
+    partners = df.iloc[partner][['Product_ID', 'Product_Name', 'Main_Category', 'Sub_Category',
+                                 'Price_INR', 'Units_Sold_30_Days']]
+    table = anchors.reset_index(drop=True)
+    table['Rank'] = np.tile(np.arange(1, n + 1), len(slow))[keep]
+    for col in partners.columns:
+        table[f'Partner_{col.replace("Product_", "")}'] = partners[col].to_numpy()
+    table['Score'] = score.astype(np.int64)
+    table['Similarity'] = (score / sum(FEATURE_WEIGHTS.values())).round(3)
+    table['Shared'] = shared_label
+    return table
+
+
+def print_bundles(table, seconds=None, shown=10):
+    pd.set_option('display.width', 200)
+    print("=" * 80)
+    print("THE SHOP INDIA - BUNDLE RECOMMENDATIONS")
+    print("=" * 80 + "\n")
+    timing = '' if seconds is None else f" in {seconds:.2f}s"
+    anchors = table['Product_ID'].nunique()
+    print(f"{anchors:,} high-rated slow-movers paired with {len(table):,} bestseller "
+          f"partners{timing}\n")
+    if table.empty:
+        return
+
+    print("Partners by shared attributes:")
+    print(table['Shared'].value_counts().head(10).to_string())
+    print()
+
+    print(f"Top {shown} slow-movers by rating and their best partner:")
+    best = table[table['Rank'] == 1].sort_values('Customer_Rating', ascending=False,
+                                                 kind='stable').head(shown)
+    print(best[['Product_Name', 'Main_Category', 'Customer_Rating', 'Units_Sold_30_Days',
+                'Partner_Name', 'Partner_Units_Sold_30_Days', 'Similarity']].to_string(index=False))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Bundle high-rated slow-movers with bestsellers")
+    parser.add_argument('csv_path', nargs='?', default='product_analysis_data.csv')
+    parser.add_argument('--products', help="recommend for a generated catalog of this size "
+                                           "instead (e.g. 1M)")
+    parser.add_argument('--partners', type=int, default=DEFAULT_PARTNERS,
+                        help="bestseller partners per slow-mover")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes (default: one per CPU for large catalogs)")
+    parser.add_argument('--output', help=f"write all bundles to this CSV (e.g. {DEFAULT_OUTPUT})")
+    args = parser.parse_args()
+
+    if args.partners < 1:
+        parser.error("--partners must be at least 1")
+    if args.products:
+        from shop_india_analysis import generate_shop_india_data
+        df = generate_shop_india_data(parse_size(args.products), batched=True)
+    else:
+        df = pd.read_csv(args.csv_path, usecols=BUNDLE_COLUMNS)
+
+    start = time.perf_counter()
+    bundles = recommend_bundles(df, args.partners, args.workers)
+    print_bundles(bundles, time.perf_counter() - start)
+
+    if args.output:
+        bundles.to_csv(args.output, index=False)
+        print(f"\n✓ Bundles saved to: {args.output}")
@@ -0,0 +1,224 @@
+"""
+THE SHOP INDIA - CATALOG GENERATOR
+==================================
+Catalog definitions and a batched (column-at-a-time) product generator.
+
+The per-row loop in shop_india_analysis.py is kept for the original 1,520
+product report; this module draws every column as a whole NumPy array so
+that realistic load-test catalogs of millions of products can be built in
+seconds.
+
+Large catalogs are split into fixed-size Product_ID ranges (shards). Each
+shard draws from its own child of a SeedSequence, so the output is
+bit-identical whether the shards run in one process or on a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# CATALOG DEFINITIONS (Based on Website Scraping)
+# ============================================================================
+
+# Actual categories from The Shop India website
+CATEGORIES = {
+    'Dining': ['Table Cloths', 'Table Runners', 'Mats & Napkins', 'Kitchen Linen'],
+    'Bedroom': ['Throws & Coverlets', 'Quilts & Duvet Covers', 'Sheets & Bedcovers', 'Pillows'],
+    'Living': ['Cushions', 'Curtains', 'Rugs', 'Floor Cushions', 'Decor', 'Lights & Shades'],
+    'Women': ['Dresses', 'Jackets & Shrugs', 'Kimonos & Kaftans', 'Tunics & Kurtas', 'Sarees'],
+    'Men': ['Kurtas', 'Pants & Pyjamas', 'Shirts & Tunics', 'Loungewear'],
+    'Kids': ['Dresses', 'Tunics & Kurtas', 'PJ Sets', 'Tops & Shirts'],
+    'Wellness': ['Towels & Robes', 'Bath & Body', 'Aromatherapy'],
+    'Accessories': ['Scarves & Wraps', 'Dupattas & Sarongs', 'Bags', 'Hair Accessories']
+}
+
+# Number of products per category in the original catalog (1,520 total)
+CATEGORY_PRODUCT_COUNTS = {
+    'Dining': 180, 'Bedroom': 220, 'Living': 250, 'Women': 280,
+    'Men': 140, 'Kids': 180, 'Wellness': 120, 'Accessories': 150
+}
+
+# Price ranges (INR) based on actual website data
+CATEGORY_PRICE_RANGES = {
+    'Dining': (500, 3500), 'Bedroom': (1500, 8000), 'Living': (800, 6000),
+    'Women': (1200, 4500), 'Men': (1200, 4500), 'Kids': (800, 2500),
+    'Wellness': (500, 3500), 'Accessories': (500, 3500)
+}
+
+# Colors observed on website
+COLORS = ['Blue', 'Black', 'White', 'Beige', 'Green', 'Red', 'Yellow', 'Pink',
+          'Cream', 'Navy', 'Emerald', 'Indigo', 'Multi', 'Natural', 'Aqua']
+
+# Fabrics from website
+FABRICS = ['Cotton Voile', '100% Cotton', 'Cotton Textured', 'Cotton Sheeting',
+           'Cotton Cambric', 'Chanderi Silk', 'Wool', 'Cotton Canvas', 'Silk']
+
+# Stock statuses
+STOCK_STATUS = ['In Stock', 'Low Stock', 'Out of Stock']
+
+# Performance tiers and their share of the catalog
+PERFORMANCE_TIERS = ['Bestseller', 'Average', 'Slow']
+TIER_PROBABILITIES = [0.15, 0.60, 0.25]
+
+# Best sellers sell 50-200 units, average 10-50, slow movers 1-10
+TIER_UNITS_RANGES = {'Bestseller': (50, 200), 'Average': (10, 50), 'Slow': (1, 10)}
+
+# Stock status (more likely in stock if bestseller)
+TIER_STOCK_PROBABILITIES = {
+    'Bestseller': [0.7, 0.2, 0.1], 'Average': [0.6, 0.2, 0.2], 'Slow': [0.6, 0.2, 0.2]
+}
+
+# Customer rating ranges
+TIER_RATING_RANGES = {'Bestseller': (4.2, 5.0), 'Average': (3.5, 4.8), 'Slow': (3.5, 4.8)}
+
+PREMIUM_SHARE = 0.1             # 10% premium products
+PREMIUM_MULTIPLIER = (1.5, 2.5)
+REVIEW_RATE = (0.1, 0.3)        # reviews per unit sold
+MAX_AGE_DAYS = 730              # products added within the last two years
+
+DEFAULT_PRODUCT_COUNT = sum(CATEGORY_PRODUCT_COUNTS.values())
+DEFAULT_SEED = 42
+SHARD_SIZE = 1_000_000          # products per shard (fixes the random streams)
+
+
+def category_product_counts(n_products=None):
+    """
+    Number of products per category, scaled to n_products while keeping the
+    original category mix (largest-remainder rounding, so counts sum exactly)
+    """
+    if n_products is None or n_products == DEFAULT_PRODUCT_COUNT:
+        return dict(CATEGORY_PRODUCT_COUNTS)
+    if n_products < 0:
+        raise ValueError(f"n_products must be non-negative, got {n_products}")
+
+    weights = np.array(list(CATEGORY_PRODUCT_COUNTS.values()), dtype=float)
+    exact = weights / weights.sum() * n_products
+    counts = np.floor(exact).astype(np.int64)
+    remainder = n_products - counts.sum()
+    # Stable sort keeps the tie-break in catalog order
+    counts[np.argsort(-(exact - counts), kind='stable')[:remainder]] += 1
+    return dict(zip(CATEGORY_PRODUCT_COUNTS, counts.tolist()))
+
+
+def format_product_ids(numbers):
+    """Render integer product numbers as TSI%04d strings"""
+    return pd.Series(numbers).map('TSI{:04d}'.format).to_numpy(dtype=object)
+
+
+# ============================================================================
+# BATCHED GENERATION
+# ============================================================================
+
+def _category_codes(n_products, start=0, stop=None):
+    """
+    Category code of every product in [start, stop) of an n_products catalog.
+    Categories occupy contiguous Product_ID blocks in catalog order.
+    """
+    stop = n_products if stop is None else stop
+    bounds = np.cumsum(list(category_product_counts(n_products).values()))
+    return np.searchsorted(bounds, np.arange(start, stop), side='right')
+
+
+def _draw_columns(rng, cat_codes, first_number, as_of):
+    """
+    Draw every product column for the given category codes with one array
+    call per column. Product numbers start at first_number.
+    """
+    n = len(cat_codes)
+    categories = list(CATEGORIES)
+
+    # Subcategory: uniform within each category
+    sub_names = [s for c in categories for s in CATEGORIES[c]]
+    n_subs = np.array([len(CATEGORIES[c]) for c in categories])
+    sub_offset = np.concatenate([[0], np.cumsum(n_subs)[:-1]])
+    sub_idx = sub_offset[cat_codes] + rng.integers(0, n_subs[cat_codes], size=n)
+
+    # Price: category range, 10% premium products
+    price_low = np.array([CATEGORY_PRICE_RANGES[c][0] for c in categories], dtype=float)
+    price_high = np.array([CATEGORY_PRICE_RANGES[c][1] for c in categories], dtype=float)
+    base_price = rng.uniform(price_low[cat_codes], price_high[cat_codes])
+    premium = rng.random(n) < PREMIUM_SHARE
+    base_price[premium] *= rng.uniform(*PREMIUM_MULTIPLIER, size=premium.sum())
+
+    # Performance tier drives units, stock and rating
+    tier = rng.choice(len(PERFORMANCE_TIERS), size=n, p=TIER_PROBABILITIES)
+    units_low = np.array([TIER_UNITS_RANGES[t][0] for t in PERFORMANCE_TIERS])
+    units_high = np.array([TIER_UNITS_RANGES[t][1] for t in PERFORMANCE_TIERS])
+    units_sold = rng.integers(units_low[tier], units_high[tier])
+
+    stock_cdf = np.cumsum([TIER_STOCK_PROBABILITIES[t] for t in PERFORMANCE_TIERS], axis=1)
+    stock_idx = (rng.random(n)[:, None] >= stock_cdf[tier, :-1]).sum(axis=1)
+
+    rating_low = np.array([TIER_RATING_RANGES[t][0] for t in PERFORMANCE_TIERS])
+    rating_high = np.array([TIER_RATING_RANGES[t][1] for t in PERFORMANCE_TIERS])
+    rating = rng.uniform(rating_low[tier], rating_high[tier])
+
+    num_reviews = np.maximum(1, (units_sold * rng.uniform(*REVIEW_RATE, size=n)).astype(np.int64))
+
+    # Product name is "<subcategory> <color>"; look names up from a small table
+    name_color = rng.integers(0, len(COLORS), size=n)
+    name_table = np.array([f'{s} {c}' for s in sub_names for c in COLORS], dtype=object)
+    color_idx = rng.integers(0, len(COLORS), size=n)
+    fabric_idx = rng.integers(0, len(FABRICS), size=n)
+
+    # Dates: at most MAX_AGE_DAYS distinct values, formatted once
+    age_days = rng.integers(1, MAX_AGE_DAYS, size=n)
+    date_table = np.array([(as_of - timedelta(days=int(d))).strftime('%Y-%m-%d')
+                           for d in range(MAX_AGE_DAYS)], dtype=object)
+
+    return pd.DataFrame({
+        'Product_ID': format_product_ids(np.arange(first_number, first_number + n)),
+        'Product_Name': name_table[sub_idx * len(COLORS) + name_color],
+        'Main_Category': np.array(categories, dtype=object)[cat_codes],
+        'Sub_Category': np.array(sub_names, dtype=object)[sub_idx],
+        'Price_INR': np.round(base_price, 2),
+        'Color': np.array(COLORS, dtype=object)[color_idx],
+        'Fabric': np.array(FABRICS, dtype=object)[fabric_idx],
+        'Units_Sold_30_Days': units_sold,
+        'Revenue_30_Days': np.round(base_price * units_sold, 2),
+        'Stock_Status': np.array(STOCK_STATUS, dtype=object)[stock_idx],
+        'Customer_Rating': np.round(rating, 2),
+        'Num_Reviews': num_reviews,
+        'Performance_Tier': np.array(PERFORMANCE_TIERS, dtype=object)[tier],
+        'Date_Added': date_table[age_days],
+    })
+
+
+def _generate_shard(seed, shard, n_products, shard_size, as_of):
+    """Generate Product_ID range [shard * shard_size, ...) from its own child seed"""
+    start = shard * shard_size
+    stop = min(start + shard_size, n_products)
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(shard,)))
+    return _draw_columns(rng, _category_codes(n_products, start, stop), start + 1, as_of)
+
+
+def generate_catalog(n_products=DEFAULT_PRODUCT_COUNT, seed=DEFAULT_SEED, as_of=None,
+                     n_workers=1, shard_size=SHARD_SIZE):
+    """
+    Generate a product catalog of n_products rows, one batched pass per shard.
+
+    Uses the same category/subcategory mix and per-tier distributions as
+    generate_shop_india_data(). Shard i draws from
+    SeedSequence(seed, spawn_key=(i,)), and Product_IDs are numbered
+    contiguously across shards, so the result depends only on n_products,
+    seed, as_of and shard_size - never on n_workers. Date_Added is relative
+    to `as_of` (default: today).
+    """
+    if shard_size < 1:
+        raise ValueError(f"shard_size must be positive, got {shard_size}")
+    as_of = date.today() if as_of is None else as_of
+    n_shards = max(1, -(-n_products // shard_size))
+    n_workers = os.cpu_count() if n_workers is None else n_workers
+    args = [(seed, shard, n_products, shard_size, as_of) for shard in range(n_shards)]
+
+    if n_workers <= 1 or n_shards == 1:
+        shards = [_generate_shard(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, n_shards)) as pool:
+            shards = list(pool.map(_generate_shard, *zip(*args)))
+
+    return pd.concat(shards, ignore_index=True)
@@ -0,0 +1,167 @@
+"""
+THE SHOP INDIA - CHART SUMMARIES
+================================
+Everything the charts draw, reduced to small summaries so rendering cost
+does not grow with the catalog:
+
+    agg            CatalogAggregates (category totals, stock crosstab)
+    price_hist     50-bin Price_INR histogram counts and bin edges
+    median_price   overall median price
+    price_boxes    per-category box plot statistics (quartiles, whiskers,
+                   fliers) in matplotlib's bxp() format
+    top_sellers    top 3 products by units sold per category
+
+ChartSummary.from_frame() computes them exactly from a loaded table.
+ChartSummary.from_csv() reads the CSV in two chunked passes and never
+holds more than one chunk:
+
+    pass 1   partial aggregates, price min/max, per-category price
+             quantile sketches (quartiles and median within the sketch's
+             relative accuracy) and top-seller candidates
+    pass 2   fixed-bin histogram counts over [min, max] (exact), the
+             whiskers (exact: extreme prices inside the 1.5 IQR fences) and
+             the fliers, merged onto FLIER_LEVELS price levels
+
+Usage:
+    python chart_summaries.py product_analysis_data.csv --chunksize 250000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from aggregations import CatalogAggregates, partial_aggregates, top_k_per_group
+from streaming import DEFAULT_CHUNKSIZE, STREAM_COLUMNS, QuantileSketch
+
+HIST_BINS = 50
+TOP_SELLERS = 3
+WHISKER_IQR = 1.5
+FLIER_LEVELS = 2000         # distinct flier positions per category (chunked path)
+CHUNK_COLUMNS = list(dict.fromkeys(STREAM_COLUMNS + ['Product_ID']))
+
+
+def box_stats(label, prices):
+    """bxp() statistics of one group of prices (as matplotlib.cbook.boxplot_stats)"""
+    prices = np.asarray(prices, dtype=float)
+    q1, med, q3 = np.percentile(prices, [25, 50, 75])
+    iqr = q3 - q1
+    inside_hi = prices[prices <= q3 + WHISKER_IQR * iqr]
+    inside_lo = prices[prices >= q1 - WHISKER_IQR * iqr]
+    whishi = q3 if len(inside_hi) == 0 or inside_hi.max() < q3 else inside_hi.max()
+    whislo = q1 if len(inside_lo) == 0 or inside_lo.min() > q1 else inside_lo.min()
+    return {
+        'label': label, 'mean': prices.mean(), 'med': med, 'q1': q1, 'q3': q3, 'iqr': iqr,
+        'whislo': whislo, 'whishi': whishi,
+        'fliers': prices[(prices < whislo) | (prices > whishi)],
+    }
+
+
+class ChartSummary:
+    """Small chart inputs of a catalog (see module docstring)"""
+
+    def __init__(self, agg, price_hist, median_price, price_boxes, top_sellers):
+        self.agg = agg
+        self.price_hist = price_hist
+        self.median_price = median_price
+        self.price_boxes = price_boxes
+        self.top_sellers = top_sellers
+
+    @classmethod
+    def from_frame(cls, df, agg=None):
+        """Exact summaries of a loaded product table"""
+        agg = CatalogAggregates.from_frame(df) if agg is None else agg
+        prices = df['Price_INR'].to_numpy(dtype=float)
+        counts, edges = np.histogram(prices, bins=HIST_BINS)
+        groups = df.groupby(df['Main_Category'].astype(str), sort=True)['Price_INR']
+        boxes = [box_stats(name, values.to_numpy()) for name, values in groups]
+        top = top_k_per_group(df, 'Main_Category', 'Units_Sold_30_Days', k=TOP_SELLERS)
+        return cls(agg, (counts, edges), float(np.median(prices)), boxes,
+                   top[['Main_Category', 'Units_Sold_30_Days', 'Rank']])
+
+    @classmethod
+    def from_csv(cls, csv_path, chunksize=DEFAULT_CHUNKSIZE, relative_accuracy=0.005):
+        """Summaries of a product CSV in two chunked passes"""
+        def chunks():
+            return pd.read_csv(csv_path, usecols=CHUNK_COLUMNS, chunksize=chunksize)
+
+        # Pass 1: aggregates, price range, quartile sketches, top-seller candidates
+        partials, candidates = [], []
+        overall = QuantileSketch(relative_accuracy)
+        sketches = {}
+        offset = 0
+        for chunk in chunks():
+            partials.append(partial_aggregates(chunk))
+            chunk = chunk.assign(Row_Order=np.arange(offset, offset + len(chunk)))
+            offset += len(chunk)
+            candidates.append(top_k_per_group(chunk, 'Main_Category', 'Units_Sold_30_Days',
+                                              k=TOP_SELLERS).drop(columns='Rank'))
+            overall.add(chunk['Price_INR'].to_numpy())
+            for name, values in chunk.groupby('Main_Category', sort=False)['Price_INR']:
+                sketches.setdefault(str(name), QuantileSketch(relative_accuracy)).add(
+                    values.to_numpy())
+        if offset == 0:
+            raise ValueError(f"No product rows in {csv_path}")
+
+        agg = CatalogAggregates.merge(partials)
+        candidates = pd.concat(candidates, ignore_index=True).sort_values('Row_Order',
+                                                                          kind='stable')
+        top = top_k_per_group(candidates, 'Main_Category', 'Units_Sold_30_Days', k=TOP_SELLERS)
+
+        names = sorted(sketches)
+        quartiles = {name: [sketches[name].quantile(q) for q in (0.25, 0.5, 0.75)]
+                     for name in names}
+        fences = {name: (q1 - WHISKER_IQR * (q3 - q1), q3 + WHISKER_IQR * (q3 - q1))
+                  for name, (q1, _, q3) in quartiles.items()}
+        lo, hi = overall.min, overall.max
+        flier_step = (hi - lo) / FLIER_LEVELS or 1.0
+
+        # Pass 2: histogram counts, whiskers and fliers
+        counts = np.zeros(HIST_BINS, dtype=np.int64)
+        whiskers = {name: [np.inf, -np.inf] for name in names}
+        fliers = {name: [] for name in names}
+        for chunk in chunks():
+            prices = chunk['Price_INR'].to_numpy(dtype=float)
+            counts += np.histogram(prices, bins=HIST_BINS, range=(lo, hi))[0]
+            for name, values in chunk.groupby('Main_Category', sort=False)['Price_INR']:
+                name = str(name)
+                values = values.to_numpy(dtype=float)
+                low, high = fences[name]
+                inside = values[(values >= low) & (values <= high)]
+                if len(inside):
+                    whiskers[name][0] = min(whiskers[name][0], inside.min())
+                    whiskers[name][1] = max(whiskers[name][1], inside.max())
+                outside = values[(values < low) | (values > high)]
+                if len(outside):
+                    fliers[name].append(np.unique(np.round((outside - lo) / flier_step)))
+
+        boxes = []
+        for name in names:
+            q1, med, q3 = quartiles[name]
+            whislo, whishi = whiskers[name]
+            levels = np.unique(np.concatenate(fliers[name])) if fliers[name] else np.array([])
+            boxes.append({
+                'label': name, 'mean': sketches[name].mean, 'med': med, 'q1': q1, 'q3': q3,
+                'iqr': q3 - q1,
+                'whislo': min(whislo, q1) if np.isfinite(whislo) else q1,
+                'whishi': max(whishi, q3) if np.isfinite(whishi) else q3,
+                'fliers': lo + levels * flier_step,
+            })
+        edges = np.histogram_bin_edges([lo, hi], bins=HIST_BINS, range=(lo, hi))
+        return cls(agg, (counts, edges), overall.quantile(0.5), boxes,
+                   top[['Main_Category', 'Units_Sold_30_Days', 'Rank']])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Chart summaries of a product CSV")
+    parser.add_argument('csv_path', nargs='?', default='product_analysis_data.csv')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    summary = ChartSummary.from_csv(args.csv_path, args.chunksize)
+    counts, edges = summary.price_hist
+    print(f"Price histogram: {HIST_BINS} bins over ₹{edges[0]:,.0f} - ₹{edges[-1]:,.0f}, "
+          f"{counts.sum():,} products (median ₹{summary.median_price:,.0f})\n")
+    print(pd.DataFrame([{k: v for k, v in box.items() if k != 'fliers'} |
+                        {'fliers': len(box['fliers'])} for box in summary.price_boxes])
+          .set_index('label').round(2).to_string())
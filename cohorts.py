@@ -0,0 +1,216 @@
+"""
+THE SHOP INDIA - LAUNCH COHORTS & ROLLING WINDOWS
+=================================================
+Time dimension of the catalog, keyed on Date_Added (the launch date).
+
+The catalog is bucketed once into a dense day x category array of
+launched products, revenue (in paise, so sums stay exact) and units sold,
+stored as running totals over the days. Any window - a cohort month or
+week, a trailing 30/90-day window, an arbitrary date range - is then the
+difference of two rows of that array, so queries never rescan the products.
+The array is a few hundred KB for two years of launches and can be saved
+and reloaded (.npz).
+
+Usage:
+    python cohorts.py build product_analysis_data.csv       # writes launch_cohorts.npz
+    python cohorts.py cohorts --freq month
+    python cohorts.py rolling --days 90 --metric Revenue
+    python cohorts.py window 2025-01-01 2025-03-31 --category Bedroom
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_COHORTS_PATH = 'launch_cohorts.npz'
+METRICS = ['Products', 'Revenue', 'Units']
+ROLLING_WINDOWS = [30, 90]
+FREQUENCIES = {'month': 'M', 'week': 'W'}
+
+
+class LaunchCalendar:
+    """
+    Running totals of launches per category and day.
+
+    Attributes:
+        categories - category names (axis 0)
+        date_epoch - first day (datetime64[D]) of the day axis
+        running    - int64 array [category, day + 1, metric]; running[:, d]
+                     holds the totals of days before day d (METRICS order,
+                     Revenue in paise)
+    """
+
+    def __init__(self, categories, date_epoch, running):
+        self.categories = list(categories)
+        self.date_epoch = np.datetime64(date_epoch, 'D')
+        self.running = running
+
+    @classmethod
+    def from_frame(cls, df):
+        """Bucket a product table by Main_Category and Date_Added in one pass"""
+        dates = pd.to_datetime(df['Date_Added']).to_numpy().astype('datetime64[D]')
+        if len(dates) == 0:
+            raise ValueError("Cannot build launch cohorts from an empty catalog")
+        cat_codes, categories = pd.factorize(df['Main_Category'].astype(str), sort=True)
+        date_epoch = dates.min()
+        days = (dates - date_epoch).astype(np.int64)
+        n_days = int(days.max()) + 1
+
+        daily = np.zeros((len(categories), n_days, len(METRICS)), dtype=np.int64)
+        values = np.column_stack([
+            np.ones(len(df), dtype=np.int64),
+            np.rint(df['Revenue_30_Days'].to_numpy(dtype=float) * 100).astype(np.int64),
+            df['Units_Sold_30_Days'].to_numpy(dtype=np.int64),
+        ])
+        np.add.at(daily, (cat_codes, days), values)
+
+        running = np.zeros((len(categories), n_days + 1, len(METRICS)), dtype=np.int64)
+        np.cumsum(daily, axis=1, out=running[:, 1:])
+        return cls(categories, date_epoch, running)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path=DEFAULT_COHORTS_PATH):
+        np.savez_compressed(path, categories=np.array(self.categories),
+                            date_epoch=np.array(self.date_epoch), running=self.running)
+
+    @classmethod
+    def load(cls, path=DEFAULT_COHORTS_PATH):
+        with np.load(path) as data:
+            return cls(data['categories'].tolist(), data['date_epoch'][()], data['running'])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def n_days(self):
+        return self.running.shape[1] - 1
+
+    def dates(self):
+        """Every day of the day axis (datetime64[D])"""
+        return self.date_epoch + np.arange(self.n_days)
+
+    def _day(self, date):
+        """Day-axis position of a date, clipped to [0, n_days]"""
+        day = (np.datetime64(pd.Timestamp(date).date(), 'D') - self.date_epoch).astype(np.int64)
+        return int(np.clip(day, 0, self.n_days))
+
+    def _frame(self, totals, index):
+        """[category, row, metric] totals -> long DataFrame (Revenue in rupees)"""
+        n_cat, n_rows = totals.shape[:2]
+        return pd.DataFrame({
+            'Main_Category': np.repeat(self.categories, n_rows),
+            index.name: np.tile(index.to_numpy(), n_cat),
+            'Products': totals[..., 0].ravel(),
+            'Revenue': totals[..., 1].ravel() / 100,
+            'Units': totals[..., 2].ravel(),
+        })
+
+    def window(self, start, end, category=None):
+        """
+        Launches with start <= Date_Added <= end: products, revenue and
+        units, per category (or one category as a Series)
+        """
+        if pd.Timestamp(start) > pd.Timestamp(end):
+            raise ValueError(f"Window start {start} is after its end {end}")
+        if category is not None and category not in self.categories:
+            raise ValueError(f"Unknown category {category!r}; choose from "
+                             f"{', '.join(self.categories)}")
+        lo, hi = self._day(start), self._day(pd.Timestamp(end) + pd.Timedelta(days=1))
+        totals = self.running[:, hi] - self.running[:, lo]
+        table = pd.DataFrame(totals, index=pd.Index(self.categories, name='Main_Category'),
+                             columns=METRICS)
+        table['Revenue'] = table['Revenue'] / 100
+        return table if category is None else table.loc[category]
+
+    def cohorts(self, freq='month', by_category=False):
+        """
+        Launch cohorts per calendar month or week (weeks start on Monday):
+        products launched, their revenue and units (last 30 days)
+        """
+        periods = pd.DatetimeIndex(self.dates()).to_period(FREQUENCIES[freq])
+        first = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+        bounds = np.r_[first, self.n_days]
+        totals = self.running[:, bounds[1:]] - self.running[:, bounds[:-1]]
+        index = pd.Index(periods[first].astype(str), name='Cohort')
+
+        table = self._frame(totals, index)
+        if by_category:
+            return table
+        return table.groupby('Cohort', sort=False)[METRICS].sum()
+
+    def rolling(self, days=30, metric='Revenue'):
+        """
+        Trailing `days`-day window of a metric per category, for every day:
+        launches in (day - days, day]. Returns a date x category table.
+        """
+        if days < 1:
+            raise ValueError(f"Rolling window must be at least 1 day, got {days}")
+        m = METRICS.index(metric)
+        end = np.arange(1, self.n_days + 1)
+        start = np.maximum(end - days, 0)
+        totals = self.running[:, end, m] - self.running[:, start, m]
+        table = pd.DataFrame(totals.T, index=pd.DatetimeIndex(self.dates(), name='Date'),
+                             columns=pd.Index(self.categories, name='Main_Category'))
+        return table / 100 if metric == 'Revenue' else table
+
+    def latest_windows(self, windows=ROLLING_WINDOWS):
+        """Products, revenue and units launched in the last N days, per window"""
+        last = self.date_epoch + self.n_days - 1
+        return {n: self.window(last - np.timedelta64(n - 1, 'D'), last) for n in windows}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Launch cohorts and rolling windows")
+    parser.add_argument('--cohorts-file', default=DEFAULT_COHORTS_PATH,
+                        help="precomputed cohort array (.npz)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="bucket a catalog CSV into the cohort array")
+    build.add_argument('csv_path', nargs='?', default='product_analysis_data.csv')
+
+    cohorts = commands.add_parser('cohorts', help="monthly or weekly launch cohorts")
+    cohorts.add_argument('--freq', choices=list(FREQUENCIES), default='month')
+    cohorts.add_argument('--by-category', action='store_true')
+
+    rolling = commands.add_parser('rolling', help="trailing window per category and day")
+    rolling.add_argument('--days', type=int, default=30)
+    rolling.add_argument('--metric', choices=METRICS, default='Revenue')
+    rolling.add_argument('--tail', type=int, default=10, help="most recent days shown")
+
+    window = commands.add_parser('window', help="launches between two dates (inclusive)")
+    window.add_argument('start')
+    window.add_argument('end')
+    window.add_argument('--category')
+
+    args = parser.parse_args()
+    pd.set_option('display.width', 200)
+    pd.set_option('display.float_format', '{:,.2f}'.format)
+
+    if args.command == 'build':
+        calendar = LaunchCalendar.from_frame(
+            pd.read_csv(args.csv_path, usecols=['Main_Category', 'Revenue_30_Days',
+                                                'Units_Sold_30_Days', 'Date_Added']))
+        calendar.save(args.cohorts_file)
+        print(f"✓ {calendar.n_days} days x {len(calendar.categories)} categories "
+              f"({calendar.running.nbytes / 1024:.0f} KB) saved to: {args.cohorts_file}")
+        for days, table in calendar.latest_windows().items():
+            print(f"\nLaunched in the last {days} days:")
+            print(table.to_string())
+    else:
+        calendar = LaunchCalendar.load(args.cohorts_file)
+        try:
+            if args.command == 'cohorts':
+                print(calendar.cohorts(args.freq, args.by_category).to_string())
+            elif args.command == 'rolling':
+                print(calendar.rolling(args.days, args.metric).tail(args.tail).to_string())
+            else:
+                print(calendar.window(args.start, args.end, args.category).to_string())
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
@@ -0,0 +1,156 @@
+"""
+THE SHOP INDIA - COMPACT PRODUCT TABLE
+======================================
+Compact in-memory layout for the product table, so several catalog
+versions fit in memory at once.
+
+    Product_ID            -> Product_Key      integer key, rendered as TSI%04d
+    text columns          -> dictionary-encoded categoricals
+    Price_INR / Revenue   -> Price_Paise / Revenue_Paise (fixed-point, 2 dp)
+    Customer_Rating       -> Rating_x100      fixed-point (2 dp)
+    integer columns are stored in the smallest unsigned type that fits
+    Date_Added            -> Date_Offset      days since `date_epoch`
+
+Every conversion is exact for the values the generator and the CSV
+produce, so CompactCatalog.to_frame() restores the standard table.
+
+Usage:
+    python compact_table.py product_analysis_data.csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from catalog_generator import format_product_ids
+
+DICTIONARY_COLUMNS = ['Product_Name', 'Main_Category', 'Sub_Category', 'Color', 'Fabric',
+                      'Stock_Status', 'Performance_Tier', 'Price_Band']
+
+# (standard column, compact column, scale) for fixed-point columns
+FIXED_POINT_COLUMNS = [
+    ('Price_INR', 'Price_Paise', 100),
+    ('Revenue_30_Days', 'Revenue_Paise', 100),
+    ('Customer_Rating', 'Rating_x100', 100),
+]
+
+COUNT_COLUMNS = ['Units_Sold_30_Days', 'Num_Reviews']
+
+STANDARD_COLUMNS = ['Product_ID', 'Product_Name', 'Main_Category', 'Sub_Category',
+                    'Price_INR', 'Color', 'Fabric', 'Units_Sold_30_Days',
+                    'Revenue_30_Days', 'Stock_Status', 'Customer_Rating', 'Num_Reviews',
+                    'Performance_Tier', 'Date_Added', 'Price_Band']
+
+
+def _smallest_uint(values):
+    """Cast non-negative integers to the smallest unsigned type that holds them"""
+    values = np.asarray(values)
+    top = int(values.max()) if len(values) else 0
+    if values.min(initial=0) < 0:
+        raise ValueError("Compact columns must be non-negative")
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if top <= np.iinfo(dtype).max:
+            return values.astype(dtype)
+
+
+def bytes_per_row(df):
+    """Deep memory footprint of a table divided by its row count"""
+    return df.memory_usage(deep=True, index=False).sum() / max(len(df), 1)
+
+
+class CompactCatalog:
+    """
+    Product table in the compact layout.
+
+    Attributes:
+        table      - compact DataFrame (see module docstring)
+        date_epoch - date that Date_Offset counts from
+    """
+
+    def __init__(self, table, date_epoch):
+        self.table = table
+        self.date_epoch = date_epoch
+
+    @classmethod
+    def from_frame(cls, df):
+        """Encode a standard product table (generated or loaded from CSV)"""
+        table = pd.DataFrame(index=pd.RangeIndex(len(df)))
+
+        table['Product_Key'] = _smallest_uint(
+            df['Product_ID'].astype(str).str.slice(3).astype(np.int64).to_numpy())
+
+        for col in DICTIONARY_COLUMNS:
+            if col in df.columns:
+                table[col] = df[col].astype('category').array
+
+        for col, compact_col, scale in FIXED_POINT_COLUMNS:
+            table[compact_col] = _smallest_uint(
+                np.round(df[col].to_numpy(dtype=float) * scale).astype(np.int64))
+
+        for col in COUNT_COLUMNS:
+            table[col] = _smallest_uint(df[col].to_numpy(dtype=np.int64))
+
+        dates = pd.to_datetime(df['Date_Added']).to_numpy().astype('datetime64[D]')
+        date_epoch = dates.min() if len(dates) else np.datetime64('1970-01-01')
+        table['Date_Offset'] = _smallest_uint((dates - date_epoch).astype(np.int64))
+
+        return cls(table, date_epoch)
+
+    def __len__(self):
+        return len(self.table)
+
+    def product_ids(self):
+        """Product_Key rendered back as TSI%04d strings"""
+        return format_product_ids(self.table['Product_Key'].to_numpy())
+
+    def dates(self):
+        """Date_Added as datetime64[D] values"""
+        return self.date_epoch + self.table['Date_Offset'].to_numpy().astype('timedelta64[D]')
+
+    def to_frame(self):
+        """Decode back to the standard product table layout"""
+        t = self.table
+        df = pd.DataFrame({'Product_ID': self.product_ids()})
+        for col in DICTIONARY_COLUMNS:
+            if col in t.columns:
+                df[col] = t[col].to_numpy()
+        for col, compact_col, scale in FIXED_POINT_COLUMNS:
+            df[col] = t[compact_col].to_numpy(dtype=np.int64) / scale
+        for col in COUNT_COLUMNS:
+            df[col] = t[col].to_numpy(dtype=np.int64)
+        df['Date_Added'] = np.datetime_as_string(self.dates(), unit='D')
+        return df[[col for col in STANDARD_COLUMNS if col in df.columns]]
+
+    def bytes_per_row(self):
+        """Deep memory footprint per row of the compact table"""
+        return bytes_per_row(self.table)
+
+
+def memory_report(df, compact=None):
+    """Print bytes per row of a standard table and of its compact layout"""
+    compact = CompactCatalog.from_frame(df) if compact is None else compact
+    before = bytes_per_row(df)
+    after = compact.bytes_per_row()
+
+    print(f"{'Column':<22}{'Before (B/row)':>16}{'After (B/row)':>16}")
+    print("-" * 54)
+    before_cols = df.memory_usage(deep=True, index=False) / max(len(df), 1)
+    after_cols = compact.table.memory_usage(deep=True, index=False) / max(len(compact), 1)
+    compact_names = {'Product_ID': 'Product_Key', 'Date_Added': 'Date_Offset',
+                     **{col: c for col, c, _ in FIXED_POINT_COLUMNS}}
+    for col in df.columns:
+        print(f"{col:<22}{before_cols[col]:>16.1f}"
+              f"{after_cols.get(compact_names.get(col, col), 0.0):>16.1f}")
+    print("-" * 54)
+    print(f"{'Total':<22}{before:>16.1f}{after:>16.1f}")
+    print(f"\nCompaction: {before / after:.1f}x smaller ({len(df):,} rows)")
+    return before, after
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare bytes per row before/after compaction")
+    parser.add_argument('csv_path', nargs='?', default='product_analysis_data.csv')
+    args = parser.parse_args()
+
+    memory_report(pd.read_csv(args.csv_path))
@@ -2,232 +2,529 @@
 THE SHOP INDIA - DATA VISUALIZATIONS
 =====================================
 Creates professional charts for analysis presentation
+
+Each chart is an independent render task that receives only the small,
+pre-aggregated data it needs (see chart_summaries.py): no chart plots raw
+product rows. Tasks run on a process pool with the non-interactive Agg
+backend. With --chunksize the summaries are built from the CSV in chunked
+passes, so catalogs larger than memory can be charted.
+
+Charts are content-addressed: a chart's cache key hashes its input data,
+the style settings and its render code. A chart is redrawn only when its
+key differs from the one recorded in chart_cache_manifest.json (or its PNG
+is missing); the manifest also records the hits and misses of each run.
+
+Usage:
+    python create_visualizations.py                  # all six charts
+    python create_visualizations.py --charts 1,4     # a subset
+    python create_visualizations.py --workers 1      # render in-process
+    python create_visualizations.py --force          # ignore the chart cache
+    python create_visualizations.py --csv big.csv --chunksize 1000000
 """
 
+import argparse
+import hashlib
+import inspect
+import json
+import os
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
+
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
-# Set style
-sns.set_style("whitegrid")
-sns.set_palette("husl")
-plt.rcParams['figure.figsize'] = (14, 8)
-plt.rcParams['font.size'] = 10
+from chart_summaries import ChartSummary
+from data_loader import load_products
+from instrumentation import Instrumentation, track
+
+
+MANIFEST_NAME = 'chart_cache_manifest.json'
 
-# Load data
-df = pd.read_csv('product_analysis_data.csv')
+# Style settings (part of every chart's cache key)
+STYLE = {
+    'seaborn_style': 'whitegrid',
+    'palette': 'husl',
+    'figure.figsize': (14, 8),
+    'font.size': 10,
+    'dpi': 300,
+}
+
+
+def apply_style():
+    """Chart style shared by every render task"""
+    sns.set_style(STYLE['seaborn_style'])
+    sns.set_palette(STYLE['palette'])
+    plt.rcParams['figure.figsize'] = STYLE['figure.figsize']
+    plt.rcParams['font.size'] = STYLE['font.size']
 
-print("Creating visualizations...")
 
 # ============================================================================
 # CHART 1: Revenue by Category
 # ============================================================================
 
-fig, ax = plt.subplots(figsize=(12, 6))
+def chart1_data(summary):
+    return {'category_revenue': summary.agg.category['Total_Revenue'].sort_values(ascending=False)}
+
+
+def render_chart1(data, path):
+    category_revenue = data['category_revenue']
 
-category_revenue = df.groupby('Main_Category')['Revenue_30_Days'].sum().sort_values(ascending=False)
+    fig, ax = plt.subplots(figsize=(12, 6))
 
-colors = plt.cm.Set3(np.linspace(0, 1, len(category_revenue)))
-bars = ax.barh(category_revenue.index, category_revenue.values / 1000000, color=colors)
+    colors = plt.cm.Set3(np.linspace(0, 1, len(category_revenue)))
+    bars = ax.barh(category_revenue.index, category_revenue.values / 1000000, color=colors)
 
-# Add value labels
-for i, (idx, val) in enumerate(category_revenue.items()):
-    ax.text(val/1000000 + 0.5, i, f'₹{val/1000000:.1f}M', 
-            va='center', fontweight='bold')
+    # Add value labels
+    for i, (idx, val) in enumerate(category_revenue.items()):
+        ax.text(val/1000000 + 0.5, i, f'₹{val/1000000:.1f}M',
+                va='center', fontweight='bold')
 
-ax.set_xlabel('Revenue (Million ₹)', fontsize=12, fontweight='bold')
-ax.set_title('The Shop India - Category Revenue Performance (Last 30 Days)', 
-             fontsize=14, fontweight='bold', pad=20)
-ax.grid(axis='x', alpha=0.3)
+    ax.set_xlabel('Revenue (Million ₹)', fontsize=12, fontweight='bold')
+    ax.set_title('The Shop India - Category Revenue Performance (Last 30 Days)',
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.grid(axis='x', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=STYLE['dpi'], bbox_inches='tight')
+    plt.close()
 
-plt.tight_layout()
-plt.savefig('chart1_category_revenue.png', dpi=300, bbox_inches='tight')
-print("✓ Created: chart1_category_revenue.png")
-plt.close()
 
 # ============================================================================
 # CHART 2: Price Distribution
 # ============================================================================
 
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-
-# Price histogram
-ax1.hist(df['Price_INR'], bins=50, color='skyblue', edgecolor='black', alpha=0.7)
-ax1.axvline(df['Price_INR'].median(), color='red', linestyle='--', 
-            linewidth=2, label=f'Median: ₹{df["Price_INR"].median():.0f}')
-ax1.axvline(df['Price_INR'].mean(), color='green', linestyle='--', 
-            linewidth=2, label=f'Mean: ₹{df["Price_INR"].mean():.0f}')
-ax1.set_xlabel('Price (₹)', fontsize=11, fontweight='bold')
-ax1.set_ylabel('Number of Products', fontsize=11, fontweight='bold')
-ax1.set_title('Price Distribution', fontsize=12, fontweight='bold')
-ax1.legend()
-ax1.grid(alpha=0.3)
+def chart2_data(summary):
+    counts, edges = summary.price_hist
+    return {
+        'hist_counts': counts,
+        'hist_edges': edges,
+        'price_boxes': summary.price_boxes,
+        'median_price': summary.median_price,
+        'mean_price': summary.agg.totals['avg_price'],
+    }
+
+
+def render_chart2(data, path):
+    edges = data['hist_edges']
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    # Price histogram (pre-binned counts drawn as weighted bins)
+    ax1.hist(edges[:-1], bins=edges, weights=data['hist_counts'], color='skyblue',
+             edgecolor='black', alpha=0.7)
+    ax1.axvline(data['median_price'], color='red', linestyle='--',
+                linewidth=2, label=f'Median: ₹{data["median_price"]:.0f}')
+    ax1.axvline(data['mean_price'], color='green', linestyle='--',
+                linewidth=2, label=f'Mean: ₹{data["mean_price"]:.0f}')
+    ax1.set_xlabel('Price (₹)', fontsize=11, fontweight='bold')
+    ax1.set_ylabel('Number of Products', fontsize=11, fontweight='bold')
+    ax1.set_title('Price Distribution', fontsize=12, fontweight='bold')
+    ax1.legend()
+    ax1.grid(alpha=0.3)
+
+    # Box plot by category (precomputed quartiles, whiskers and fliers)
+    ax2.bxp(data['price_boxes'])
+    ax2.grid(alpha=0.3)
+    ax2.set_xlabel('Category', fontsize=11, fontweight='bold')
+    ax2.set_ylabel('Price (₹)', fontsize=11, fontweight='bold')
+    ax2.set_title('Price Range by Category', fontsize=12, fontweight='bold')
+    plt.sca(ax2)
+    plt.xticks(rotation=45, ha='right')
+
+    plt.suptitle('The Shop India - Pricing Analysis', fontsize=14, fontweight='bold', y=1.02)
+    plt.tight_layout()
+    plt.savefig(path, dpi=STYLE['dpi'], bbox_inches='tight')
+    plt.close()
 
-# Box plot by category
-df.boxplot(column='Price_INR', by='Main_Category', ax=ax2)
-ax2.set_xlabel('Category', fontsize=11, fontweight='bold')
-ax2.set_ylabel('Price (₹)', fontsize=11, fontweight='bold')
-ax2.set_title('Price Range by Category', fontsize=12, fontweight='bold')
-plt.sca(ax2)
-plt.xticks(rotation=45, ha='right')
-
-plt.suptitle('The Shop India - Pricing Analysis', fontsize=14, fontweight='bold', y=1.02)
-plt.tight_layout()
-plt.savefig('chart2_price_analysis.png', dpi=300, bbox_inches='tight')
-print("✓ Created: chart2_price_analysis.png")
-plt.close()
 
 # ============================================================================
 # CHART 3: Best Sellers by Category
 # ============================================================================
 
-fig, ax = plt.subplots(figsize=(14, 8))
+def chart3_data(summary):
+    # Top 3 from each category
+    top_df = summary.top_sellers
+    top_units = (top_df.pivot(index='Main_Category', columns='Rank', values='Units_Sold_30_Days')
+                 .sort_index().reindex(columns=range(1, 4)).fillna(0))
+    return {'top_units': top_units}
+
 
-# Get top 3 from each category
-top_products = []
-for category in df['Main_Category'].unique():
-    cat_top = df[df['Main_Category'] == category].nlargest(3, 'Units_Sold_30_Days')
-    top_products.append(cat_top)
+def render_chart3(data, path):
+    top_units = data['top_units']
 
-top_df = pd.concat(top_products)
-top_df = top_df.sort_values(['Main_Category', 'Units_Sold_30_Days'], ascending=[True, False])
+    fig, ax = plt.subplots(figsize=(14, 8))
 
-# Create grouped bar chart
-categories = top_df['Main_Category'].unique()
-x = np.arange(len(categories))
-width = 0.25
+    # Create grouped bar chart
+    categories = top_units.index
+    x = np.arange(len(categories))
+    width = 0.25
 
-for i in range(3):
-    values = []
-    for cat in categories:
-        cat_data = top_df[top_df['Main_Category'] == cat]
-        if len(cat_data) > i:
-            values.append(cat_data.iloc[i]['Units_Sold_30_Days'])
-        else:
-            values.append(0)
-    
-    ax.bar(x + i*width, values, width, label=f'#{i+1} Bestseller', alpha=0.8)
+    for i in range(3):
+        ax.bar(x + i*width, top_units[i + 1].values, width, label=f'#{i+1} Bestseller', alpha=0.8)
 
-ax.set_ylabel('Units Sold (30 Days)', fontsize=12, fontweight='bold')
-ax.set_title('Top 3 Best-Selling Products per Category', fontsize=14, fontweight='bold', pad=20)
-ax.set_xticks(x + width)
-ax.set_xticklabels(categories, rotation=45, ha='right')
-ax.legend()
-ax.grid(axis='y', alpha=0.3)
+    ax.set_ylabel('Units Sold (30 Days)', fontsize=12, fontweight='bold')
+    ax.set_title('Top 3 Best-Selling Products per Category', fontsize=14, fontweight='bold', pad=20)
+    ax.set_xticks(x + width)
+    ax.set_xticklabels(categories, rotation=45, ha='right')
+    ax.legend()
+    ax.grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=STYLE['dpi'], bbox_inches='tight')
+    plt.close()
 
-plt.tight_layout()
-plt.savefig('chart3_bestsellers.png', dpi=300, bbox_inches='tight')
-print("✓ Created: chart3_bestsellers.png")
-plt.close()
 
 # ============================================================================
 # CHART 4: Stock Status Analysis
 # ============================================================================
 
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+def chart4_data(summary):
+    return {'stock_counts': summary.agg.stock_counts, 'stock_by_cat': summary.agg.stock}
+
+
+def render_chart4(data, path):
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+    # Overall stock status pie chart
+    stock_counts = data['stock_counts']
+    colors_pie = ['#2ecc71', '#f39c12', '#e74c3c']
+    ax1.pie(stock_counts.values, labels=stock_counts.index, autopct='%1.1f%%',
+            colors=colors_pie, startangle=90)
+    ax1.set_title('Overall Stock Status', fontsize=12, fontweight='bold')
 
-# Overall stock status pie chart
-stock_counts = df['Stock_Status'].value_counts()
-colors_pie = ['#2ecc71', '#f39c12', '#e74c3c']
-ax1.pie(stock_counts.values, labels=stock_counts.index, autopct='%1.1f%%',
-        colors=colors_pie, startangle=90)
-ax1.set_title('Overall Stock Status', fontsize=12, fontweight='bold')
+    # Stock status by category
+    stock_by_cat = data['stock_by_cat']
+    stock_by_cat.plot(kind='bar', stacked=True, ax=ax2, color=colors_pie, alpha=0.8)
+    ax2.set_xlabel('Category', fontsize=11, fontweight='bold')
+    ax2.set_ylabel('Number of Products', fontsize=11, fontweight='bold')
+    ax2.set_title('Stock Status by Category', fontsize=12, fontweight='bold')
+    ax2.legend(title='Status')
+    plt.sca(ax2)
+    plt.xticks(rotation=45, ha='right')
 
-# Stock status by category
-stock_by_cat = pd.crosstab(df['Main_Category'], df['Stock_Status'])
-stock_by_cat.plot(kind='bar', stacked=True, ax=ax2, color=colors_pie, alpha=0.8)
-ax2.set_xlabel('Category', fontsize=11, fontweight='bold')
-ax2.set_ylabel('Number of Products', fontsize=11, fontweight='bold')
-ax2.set_title('Stock Status by Category', fontsize=12, fontweight='bold')
-ax2.legend(title='Status')
-plt.sca(ax2)
-plt.xticks(rotation=45, ha='right')
+    plt.suptitle('The Shop India - Inventory Analysis', fontsize=14, fontweight='bold', y=1.02)
+    plt.tight_layout()
+    plt.savefig(path, dpi=STYLE['dpi'], bbox_inches='tight')
+    plt.close()
 
-plt.suptitle('The Shop India - Inventory Analysis', fontsize=14, fontweight='bold', y=1.02)
-plt.tight_layout()
-plt.savefig('chart4_stock_analysis.png', dpi=300, bbox_inches='tight')
-print("✓ Created: chart4_stock_analysis.png")
-plt.close()
 
 # ============================================================================
 # CHART 5: Customer Ratings
 # ============================================================================
 
-fig, ax = plt.subplots(figsize=(12, 6))
+def chart5_data(summary):
+    return {
+        'rating_by_cat': summary.agg.category['Avg_Rating'].sort_values(ascending=False),
+        'avg_rating': summary.agg.totals['avg_rating'],
+    }
 
-rating_by_cat = df.groupby('Main_Category')['Customer_Rating'].mean().sort_values(ascending=False)
 
-colors_ratings = ['#27ae60' if x >= 4.2 else '#f39c12' if x >= 4.0 else '#e74c3c' 
-                  for x in rating_by_cat.values]
+def render_chart5(data, path):
+    rating_by_cat = data['rating_by_cat']
 
-bars = ax.barh(rating_by_cat.index, rating_by_cat.values, color=colors_ratings)
+    fig, ax = plt.subplots(figsize=(12, 6))
 
-# Add value labels
-for i, (idx, val) in enumerate(rating_by_cat.items()):
-    ax.text(val + 0.01, i, f'{val:.2f}', va='center', fontweight='bold')
+    colors_ratings = ['#27ae60' if x >= 4.2 else '#f39c12' if x >= 4.0 else '#e74c3c'
+                      for x in rating_by_cat.values]
 
-# Add benchmark line
-ax.axvline(4.0, color='red', linestyle='--', linewidth=2, label='Benchmark (4.0)', alpha=0.5)
-ax.axvline(df['Customer_Rating'].mean(), color='blue', linestyle='--', 
-           linewidth=2, label=f'Average ({df["Customer_Rating"].mean():.2f})', alpha=0.5)
+    bars = ax.barh(rating_by_cat.index, rating_by_cat.values, color=colors_ratings)
 
-ax.set_xlabel('Average Customer Rating', fontsize=12, fontweight='bold')
-ax.set_title('Customer Satisfaction by Category', fontsize=14, fontweight='bold', pad=20)
-ax.set_xlim(3.5, 5.0)
-ax.legend()
-ax.grid(axis='x', alpha=0.3)
+    # Add value labels
+    for i, (idx, val) in enumerate(rating_by_cat.items()):
+        ax.text(val + 0.01, i, f'{val:.2f}', va='center', fontweight='bold')
+
+    # Add benchmark line
+    ax.axvline(4.0, color='red', linestyle='--', linewidth=2, label='Benchmark (4.0)', alpha=0.5)
+    ax.axvline(data['avg_rating'], color='blue', linestyle='--',
+               linewidth=2, label=f'Average ({data["avg_rating"]:.2f})', alpha=0.5)
+
+    ax.set_xlabel('Average Customer Rating', fontsize=12, fontweight='bold')
+    ax.set_title('Customer Satisfaction by Category', fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlim(3.5, 5.0)
+    ax.legend()
+    ax.grid(axis='x', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=STYLE['dpi'], bbox_inches='tight')
+    plt.close()
 
-plt.tight_layout()
-plt.savefig('chart5_customer_ratings.png', dpi=300, bbox_inches='tight')
-print("✓ Created: chart5_customer_ratings.png")
-plt.close()
 
 # ============================================================================
 # CHART 6: Performance Matrix (Revenue vs Units)
 # ============================================================================
 
-fig, ax = plt.subplots(figsize=(12, 8))
-
-category_data = df.groupby('Main_Category').agg({
-    'Revenue_30_Days': 'sum',
-    'Units_Sold_30_Days': 'sum',
-    'Customer_Rating': 'mean'
-}).reset_index()
-
-# Scatter plot
-scatter = ax.scatter(category_data['Units_Sold_30_Days'], 
-                    category_data['Revenue_30_Days'] / 1000000,
-                    s=category_data['Customer_Rating'] * 200,
-                    c=range(len(category_data)),
-                    cmap='viridis',
-                    alpha=0.6,
-                    edgecolors='black',
-                    linewidth=2)
-
-# Add labels
-for idx, row in category_data.iterrows():
-    ax.annotate(row['Main_Category'], 
-                (row['Units_Sold_30_Days'], row['Revenue_30_Days']/1000000),
-                xytext=(5, 5), textcoords='offset points',
-                fontweight='bold', fontsize=10)
-
-ax.set_xlabel('Total Units Sold (30 Days)', fontsize=12, fontweight='bold')
-ax.set_ylabel('Total Revenue (Million ₹)', fontsize=12, fontweight='bold')
-ax.set_title('Category Performance Matrix\n(Bubble Size = Customer Rating)', 
-             fontsize=14, fontweight='bold', pad=20)
-ax.grid(alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('chart6_performance_matrix.png', dpi=300, bbox_inches='tight')
-print("✓ Created: chart6_performance_matrix.png")
-plt.close()
-
-print("\n✅ All visualizations created successfully!")
-print("\nGenerated Charts:")
-print("  1. chart1_category_revenue.png - Revenue by category")
-print("  2. chart2_price_analysis.png - Price distribution analysis")
-print("  3. chart3_bestsellers.png - Best sellers comparison")
-print("  4. chart4_stock_analysis.png - Inventory status")
-print("  5. chart5_customer_ratings.png - Customer satisfaction")
-print("  6. chart6_performance_matrix.png - Performance matrix")
+def chart6_data(summary):
+    category_data = summary.agg.category[['Total_Revenue', 'Total_Units_Sold', 'Avg_Rating']]
+    category_data = category_data.rename(columns={
+        'Total_Revenue': 'Revenue_30_Days',
+        'Total_Units_Sold': 'Units_Sold_30_Days',
+        'Avg_Rating': 'Customer_Rating'
+    }).reset_index()
+    return {'category_data': category_data}
+
+
+def render_chart6(data, path):
+    category_data = data['category_data']
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+
+    # Scatter plot
+    scatter = ax.scatter(category_data['Units_Sold_30_Days'],
+                        category_data['Revenue_30_Days'] / 1000000,
+                        s=category_data['Customer_Rating'] * 200,
+                        c=range(len(category_data)),
+                        cmap='viridis',
+                        alpha=0.6,
+                        edgecolors='black',
+                        linewidth=2)
+
+    # Add labels
+    for idx, row in category_data.iterrows():
+        ax.annotate(row['Main_Category'],
+                    (row['Units_Sold_30_Days'], row['Revenue_30_Days']/1000000),
+                    xytext=(5, 5), textcoords='offset points',
+                    fontweight='bold', fontsize=10)
+
+    ax.set_xlabel('Total Units Sold (30 Days)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Total Revenue (Million ₹)', fontsize=12, fontweight='bold')
+    ax.set_title('Category Performance Matrix\n(Bubble Size = Customer Rating)',
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.grid(alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=STYLE['dpi'], bbox_inches='tight')
+    plt.close()
+
+
+# ============================================================================
+# RENDER TASKS
+# ============================================================================
+
+# number -> (file name, description, data function, render function)
+CHARTS = {
+    1: ('chart1_category_revenue.png', 'Revenue by category', chart1_data, render_chart1),
+    2: ('chart2_price_analysis.png', 'Price distribution analysis', chart2_data, render_chart2),
+    3: ('chart3_bestsellers.png', 'Best sellers comparison', chart3_data, render_chart3),
+    4: ('chart4_stock_analysis.png', 'Inventory status', chart4_data, render_chart4),
+    5: ('chart5_customer_ratings.png', 'Customer satisfaction', chart5_data, render_chart5),
+    6: ('chart6_performance_matrix.png', 'Performance matrix', chart6_data, render_chart6),
+}
+
+
+def render_task(number, data, output_dir='.'):
+    """Render one chart from its pre-aggregated data; returns the file path"""
+    file_name, _, _, render = CHARTS[number]
+    path = os.path.join(output_dir, file_name)
+    apply_style()
+    render(data, path)
+    return path
+
+
+def measured_render_task(number, data, output_dir, instrument, rows=None):
+    """render_task measured by `instrument` (a worker copy); returns (path, records)"""
+    with instrument.section(f'chart{number}', rows=rows):
+        path = render_task(number, data, output_dir)
+    return path, instrument.records
+
+
+# ============================================================================
+# CHART CACHE
+# ============================================================================
+
+def _hash_update(h, obj):
+    """Feed a chart input (dicts, pandas objects, scalars) into a hash"""
+    if isinstance(obj, dict):
+        for key in sorted(obj):
+            h.update(repr(key).encode())
+            _hash_update(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f'{type(obj).__name__}:{len(obj)}'.encode())
+        for item in obj:
+            _hash_update(h, item)
+    elif isinstance(obj, np.ndarray):
+        h.update(repr((obj.dtype.str, obj.shape)).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        labels = list(obj.columns) if isinstance(obj, pd.DataFrame) else [obj.name]
+        h.update(repr((labels, list(obj.index.names), str(obj.dtypes))).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    else:
+        h.update(repr(obj).encode())
+
+
+def chart_key(number, data):
+    """Content hash of a chart's inputs, style settings and render code"""
+    file_name, _, _, render = CHARTS[number]
+    h = hashlib.sha256()
+    _hash_update(h, {
+        'chart': file_name,
+        'style': STYLE,
+        'matplotlib': matplotlib.__version__,
+        'render': inspect.getsource(render),
+    })
+    _hash_update(h, data)
+    return h.hexdigest()
+
+
+def load_manifest(output_dir):
+    """Chart cache manifest of an output directory (empty if none)"""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'charts': {}}
+
+
+def save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def parse_chart_list(value):
+    """'1,4' -> [1, 4]; 'all' -> every chart"""
+    if value == 'all':
+        return sorted(CHARTS)
+    numbers = sorted({int(v) for v in value.split(',') if v.strip()})
+    unknown = [n for n in numbers if n not in CHARTS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown chart(s): {unknown} (choose from 1-{len(CHARTS)})")
+    return numbers
+
+
+def create_visualizations(csv_path='product_analysis_data.csv', charts=None,
+                          output_dir='.', workers=None, use_cache=True, instrument=None,
+                          chunksize=None):
+    """
+    Summarize the dataset once and render the selected charts (default:
+    all) on a process pool of `workers` processes. The dataset is loaded
+    whole, or read in chunks of `chunksize` rows when given. With use_cache,
+    charts whose cache key is unchanged are reused instead of re-rendered.
+    With an Instrumentation, loading, chart data and each render are measured.
+
+    Returns (rendered, cached): the chart numbers drawn in this run and the
+    ones reused from the cache.
+    """
+    charts = sorted(CHARTS) if charts is None else charts
+
+    if chunksize:
+        # Chunked passes over the CSV; the table is never loaded whole
+        with track(instrument, 'chart_data') as record:
+            summary = ChartSummary.from_csv(csv_path, chunksize)
+            if record is not None:
+                record['rows'] = summary.agg.totals['products']
+    else:
+        # Load data (typed columns, cached snapshot next to the CSV)
+        with track(instrument, 'load') as record:
+            df = load_products(csv_path)
+            if record is not None:
+                record['rows'] = len(df)
+        with track(instrument, 'chart_data', rows=len(df)):
+            summary = ChartSummary.from_frame(df)
+        del df
+    rows = summary.agg.totals['products']
+
+    # Each chart task gets only its own small inputs
+    tasks = [(number, CHARTS[number][2](summary)) for number in charts]
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    keys = {number: chart_key(number, data) for number, data in tasks}
+
+    hits = []
+    if use_cache:
+        for number, _ in tasks:
+            file_name = CHARTS[number][0]
+            cached = manifest['charts'].get(file_name, {})
+            if (cached.get('key') == keys[number] and
+                    os.path.exists(os.path.join(output_dir, file_name))):
+                hits.append(number)
+                print(f"✓ Unchanged (cached): {file_name}")
+        tasks = [(number, data) for number, data in tasks if number not in hits]
+
+    workers = min(len(tasks), os.cpu_count() or 1) if workers is None else workers
+
+    if workers <= 1 or len(tasks) <= 1:
+        for number, data in tasks:
+            with track(instrument, f'chart{number}', rows=rows):
+                path = render_task(number, data, output_dir)
+            print(f"✓ Created: {os.path.basename(path)}")
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            if instrument is None:
+                futures = [pool.submit(render_task, number, data, output_dir)
+                           for number, data in tasks]
+            else:
+                futures = [pool.submit(measured_render_task, number, data, output_dir,
+                                       instrument.fresh(), rows)
+                           for number, data in tasks]
+            for future in futures:
+                path = future.result()
+                if instrument is not None:
+                    path, records = path
+                    instrument.extend(records)
+                print(f"✓ Created: {os.path.basename(path)}")
+
+    rendered_at = datetime.now().isoformat(timespec='seconds')
+    for number, _ in tasks:
+        manifest['charts'][CHARTS[number][0]] = {'key': keys[number], 'rendered_at': rendered_at}
+    manifest['last_run'] = {
+        'timestamp': rendered_at,
+        'hits': [CHARTS[number][0] for number in hits],
+        'misses': [CHARTS[number][0] for number, _ in tasks],
+    }
+    save_manifest(output_dir, manifest)
+    return [number for number, _ in tasks], hits
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Render The Shop India analysis charts")
+    parser.add_argument('--csv', default='product_analysis_data.csv',
+                        help="product dataset to chart")
+    parser.add_argument('--charts', type=parse_chart_list, default='all',
+                        help="comma-separated chart numbers to render, e.g. 1,4 (default: all)")
+    parser.add_argument('--output-dir', default='.', help="directory for the PNG files")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="render processes (default: one per chart, up to the CPU count)")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="build the chart summaries in chunks of this many rows "
+                             "instead of loading the whole CSV")
+    parser.add_argument('--force', action='store_true',
+                        help="re-render every selected chart, ignoring the chart cache")
+    parser.add_argument('--timings', metavar='PATH',
+                        help="write per-chart timings to PATH (.json or .csv)")
+    parser.add_argument('--profile', metavar='SECTION',
+                        help="run one section (load, chart_data, chart1..chart6) under cProfile")
+    args = parser.parse_args()
+
+    instrument = None
+    if args.timings or args.profile:
+        instrument = Instrumentation(profile=args.profile, profile_dir=args.output_dir)
+
+    print("Creating visualizations...")
+    rendered, cached = create_visualizations(args.csv, args.charts, args.output_dir,
+                                             args.workers, use_cache=not args.force,
+                                             instrument=instrument, chunksize=args.chunksize)
+
+    if rendered:
+        print(f"\n✅ {len(rendered)} chart(s) rendered, {len(cached)} unchanged (cached)")
+    else:
+        print(f"\n✅ All {len(cached)} chart(s) unchanged (cached) - nothing re-rendered")
+    print("\nCharts:")
+    for number in sorted(rendered + cached):
+        file_name, description, _, _ = CHARTS[number]
+        status = '' if number in rendered else ' (cached)'
+        print(f"  {number}. {file_name} - {description}{status}")
+
+    if args.timings:
+        instrument.save(args.timings)
+        print(f"\n{instrument.summary()}")
+        print(f"\n✓ Timings saved to: {args.timings}")
@@ -0,0 +1,118 @@
+"""
+THE SHOP INDIA - TYPED DATA LOADER
+==================================
+Loads product_analysis_data.csv with an explicit schema and caches it as a
+columnar Feather snapshot next to the CSV.
+
+The first load parses the CSV (categoricals for the low-cardinality text
+columns, fixed numeric types, real dates) and writes the snapshot. Later
+loads memory-map the snapshot instead of parsing text. The snapshot stores
+the CSV's size and modification time and is rebuilt whenever they change.
+
+Feather needs pyarrow; without it the loader still applies the schema but
+parses the CSV every time.
+"""
+
+import os
+
+import pandas as pd
+
+from aggregations import PRICE_BAND_LABELS
+
+try:
+    import pyarrow.feather as feather
+    import pyarrow.ipc as ipc
+except ImportError:         # optional: snapshot cache disabled
+    feather = None
+
+DEFAULT_CSV_PATH = 'product_analysis_data.csv'
+
+# Explicit schema of the product CSV
+CSV_DTYPES = {
+    'Product_ID': str,
+    'Product_Name': 'category',
+    'Main_Category': 'category',
+    'Sub_Category': 'category',
+    'Price_INR': 'float64',
+    'Color': 'category',
+    'Fabric': 'category',
+    'Units_Sold_30_Days': 'int32',
+    'Revenue_30_Days': 'float64',
+    'Stock_Status': 'category',
+    'Customer_Rating': 'float64',
+    'Num_Reviews': 'int32',
+    'Performance_Tier': 'category',
+    'Price_Band': pd.CategoricalDtype(PRICE_BAND_LABELS, ordered=True),
+}
+DATE_COLUMNS = ['Date_Added']
+
+# Snapshot metadata keys
+_FINGERPRINT_KEY = b'shop_india_csv_fingerprint'
+
+
+def snapshot_path_for(csv_path):
+    """Snapshot file that caches csv_path (same name, .feather extension)"""
+    return os.path.splitext(csv_path)[0] + '.feather'
+
+
+def _csv_fingerprint(csv_path):
+    """Size and modification time of the CSV; changes whenever the CSV does"""
+    stat = os.stat(csv_path)
+    return f'{stat.st_size}:{stat.st_mtime_ns}'.encode()
+
+
+def read_products_csv(csv_path=DEFAULT_CSV_PATH):
+    """Parse the product CSV with the explicit schema"""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {col: dtype for col, dtype in CSV_DTYPES.items() if col in header}
+    dates = [col for col in DATE_COLUMNS if col in header]
+    return pd.read_csv(csv_path, dtype=dtypes, parse_dates=dates)
+
+
+def _snapshot_is_fresh(snapshot_path, fingerprint):
+    """True if the snapshot exists and was built from the current CSV"""
+    if not os.path.exists(snapshot_path):
+        return False
+    try:
+        with ipc.open_file(snapshot_path) as reader:
+            metadata = reader.schema.metadata or {}
+    except Exception:       # unreadable / partially written snapshot
+        return False
+    return metadata.get(_FINGERPRINT_KEY) == fingerprint
+
+
+def _write_snapshot(df, snapshot_path, fingerprint):
+    """Write the snapshot atomically, tagged with the CSV fingerprint"""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), _FINGERPRINT_KEY: fingerprint})
+    tmp_path = snapshot_path + '.tmp'
+    # Uncompressed so later loads can memory-map the columns directly
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, snapshot_path)
+
+
+def load_products(csv_path=DEFAULT_CSV_PATH, use_cache=True):
+    """
+    Load the product table with typed columns.
+
+    With use_cache (and pyarrow installed) the table is read from the
+    memory-mapped Feather snapshot next to the CSV, which is (re)built from
+    the CSV only when the CSV has changed since the snapshot was written.
+    """
+    if not use_cache or feather is None:
+        return read_products_csv(csv_path)
+
+    snapshot_path = snapshot_path_for(csv_path)
+    fingerprint = _csv_fingerprint(csv_path)
+    if _snapshot_is_fresh(snapshot_path, fingerprint):
+        return feather.read_table(snapshot_path, memory_map=True).to_pandas()
+
+    df = read_products_csv(csv_path)
+    try:
+        _write_snapshot(df, snapshot_path, fingerprint)
+    except OSError as e:    # read-only data directory: serve uncached
+        print(f"⚠️  Could not write snapshot {snapshot_path}: {e}")
+    return df
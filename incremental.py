@@ -0,0 +1,548 @@
+"""
+THE SHOP INDIA - INCREMENTAL RE-ANALYSIS
+========================================
+Applies catalog delta files to stored aggregate state and re-emits the
+report without rescanning the full catalog.
+
+The state holds:
+- the partial aggregate table (sums and counts are updated by adding the
+  partial table of new rows and subtracting that of old rows; rating and
+  date min/max come from small per-group value histograms)
+- top-K pools for the best sellers, top rated products, first row per
+  category and price/units extremes. Each pool keeps the exact top
+  K + POOL_SLACK rows of its groups and only rescans a group's rows when
+  deletions shrink it below K
+- the out-of-stock bestseller set and quantile sketches for describe()
+- a keyed product store (base table + small insert tail + tombstones)
+  used to look up the old version of updated and deleted products
+
+The state file is a snapshot plus a delta log next to it (<state>.log):
+applying a delta appends it to the log, loading replays the log onto the
+snapshot, and the snapshot is only rewritten once the log holds
+SNAPSHOT_FRACTION of the catalog, so an apply writes O(delta) bytes.
+
+A delta file is a CSV with an `Op` column (insert / update / delete), the
+Product_ID and any product columns. Updates only change the non-empty
+fields; Price_Band is always re-derived from Price_INR.
+
+Usage:
+    python incremental.py init product_analysis_data.csv
+    python incremental.py apply catalog_delta.csv --verify
+    python incremental.py export updated_catalog.csv
+"""
+
+import argparse
+import os
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+
+from aggregations import (GROUP_KEYS, NO_BAND, PARTIAL_COLUMNS, CatalogAggregates,
+                          add_price_band, partial_aggregates, top_k_per_group)
+from catalog_generator import PERFORMANCE_TIERS, STOCK_STATUS
+from report import (TOP_RATED_COUNT, TOP_SELLERS_PER_CATEGORY, oos_bestseller_mask,
+                    print_report, report_inputs)
+from streaming import QuantileSketch
+
+DEFAULT_STATE_PATH = 'analysis_state.pkl'
+DELTA_OPS = ('insert', 'update', 'delete')
+
+POOL_SLACK = 32             # extra rows per top-K group before a rescan is needed
+COMPACT_FRACTION = 0.1      # fold the insert tail into the base table beyond this
+SNAPSHOT_FRACTION = 0.1     # rewrite the snapshot once the delta log holds this share
+
+SUM_COLUMNS = [col for col, how in PARTIAL_COLUMNS.items() if how == 'sum']
+NUMERIC_COLUMNS = {'Price_INR': 'float64', 'Revenue_30_Days': 'float64',
+                   'Customer_Rating': 'float64', 'Units_Sold_30_Days': 'int64',
+                   'Num_Reviews': 'int64'}
+
+
+class TopKPool:
+    """
+    Exact top `k + slack` rows per group (or overall when by is None),
+    ranked by metric with ties broken by catalog row order.
+
+    Invariant: every row outside the pool ranks below every pool row of its
+    group, so the pool is always the exact top-|pool| of the group.
+    """
+
+    def __init__(self, by, metric, k, ascending=False, slack=POOL_SLACK):
+        self.by = by
+        self.metric = metric
+        self.k = k
+        self.ascending = ascending
+        self.size = k + slack
+        self.rows = None
+        self.counts = None
+
+    def _keys(self, rows):
+        if self.by is None:
+            return pd.Series('All', index=rows.index, dtype=object)
+        return rows[self.by].astype(object)
+
+    def _rank(self, rows, size):
+        ranked = top_k_per_group(rows.assign(_Group=self._keys(rows)), '_Group', self.metric,
+                                 k=size, ascending=self.ascending, tie_breaker='Row_Order')
+        return ranked.drop(columns='_Group')
+
+    def build(self, rows):
+        self.rows = self._rank(rows, self.size)
+        self.counts = self._keys(rows).value_counts()
+
+    def _better(self, rows, threshold):
+        """Rows that rank strictly above the threshold row of their group"""
+        metric, thr_metric = rows[self.metric].to_numpy(), threshold[self.metric].to_numpy()
+        first = metric < thr_metric if self.ascending else metric > thr_metric
+        tie = (metric == thr_metric) & (rows['Row_Order'].to_numpy() < threshold['Row_Order'].to_numpy())
+        return first | tie
+
+    def update(self, old_rows, new_rows, fetch_group):
+        """
+        Apply removed/replaced rows (old_rows) and inserted/new versions of
+        rows (new_rows). fetch_group(key) returns every live row of a group
+        and is only called when a group's pool falls below k.
+        """
+        pool = self.rows
+        pool_keys = self._keys(pool)
+
+        # Worst pool row of the groups that have rows outside the pool
+        pool_sizes = pool_keys.value_counts()
+        incomplete = self.counts.index[self.counts > pool_sizes.reindex(self.counts.index).fillna(0)]
+        worst = pool.assign(_Group=pool_keys).groupby('_Group', sort=False).tail(1)
+        worst = worst[worst['_Group'].isin(incomplete)].set_index('_Group')
+
+        self.counts = self.counts.add(self._keys(new_rows).value_counts(), fill_value=0)
+        self.counts = self.counts.sub(self._keys(old_rows).value_counts(), fill_value=0)
+        self.counts = self.counts[self.counts > 0].astype(np.int64)
+
+        pool = pool[~pool['Product_ID'].isin(old_rows['Product_ID'])]
+
+        # New rows ranking below a group's threshold join the unseen rows
+        candidates = new_rows
+        if len(candidates) and len(worst):
+            threshold = worst.reindex(self._keys(candidates).to_numpy())
+            unbounded = threshold[self.metric].isna().to_numpy()
+            keep = unbounded | self._better(candidates, threshold.fillna(0))
+            candidates = candidates[keep]
+
+        pool = self._rank(pd.concat([pool, candidates]), self.size)
+
+        # Rescan groups that no longer hold enough rows to answer top-k
+        pool_sizes = self._keys(pool).value_counts().reindex(self.counts.index).fillna(0)
+        short = self.counts.index[pool_sizes < np.minimum(self.k, self.counts)]
+        if len(short):
+            pool = pool[~self._keys(pool).isin(short)]
+            refill = [self._rank(fetch_group(key), self.size) for key in short]
+            pool = self._rank(pd.concat([pool, *refill]), self.size)
+        self.rows = pool
+
+    def top(self, k=None):
+        """Top k (default: self.k) rows per group, with Rank"""
+        return self._rank(self.rows, self.k if k is None else k)
+
+
+class IncrementalState:
+    """Aggregate state of a catalog that delta files can be applied to"""
+
+    def __init__(self, df):
+        df = add_price_band(df.reset_index(drop=True).copy())
+        df['Price_Band'] = df['Price_Band'].astype(object).fillna(NO_BAND)
+        df['Row_Order'] = np.arange(len(df), dtype=np.int64)
+        if df['Product_ID'].duplicated().any():
+            raise ValueError("Product_ID values must be unique")
+
+        self.columns = [col for col in df.columns if col != 'Row_Order']
+        self.base = df.set_index('Product_ID', drop=False)
+        self.tail = self.base.iloc[:0].copy()
+        self.tombstones = set()
+        self.next_row = len(df)
+        self.generation = 0         # snapshot number; log records of older ones are stale
+        self.logged_rows = 0
+
+        self.partial = self._partial(df)
+        self.rating_counts = self._value_counts(df, 'Customer_Rating')
+        self.date_counts = self._value_counts(df, 'Date_Added')
+
+        self.pools = {
+            'top_sellers': TopKPool('Main_Category', 'Units_Sold_30_Days', TOP_SELLERS_PER_CATEGORY),
+            'top_rated': TopKPool(None, 'Customer_Rating', TOP_RATED_COUNT),
+            'first_row': TopKPool('Main_Category', 'Row_Order', 1, ascending=True, slack=0),
+            'price_min': TopKPool(None, 'Price_INR', 1, ascending=True, slack=0),
+            'price_max': TopKPool(None, 'Price_INR', 1, slack=0),
+            'units_min': TopKPool(None, 'Units_Sold_30_Days', 1, ascending=True, slack=0),
+            'units_max': TopKPool(None, 'Units_Sold_30_Days', 1, slack=0),
+        }
+        for pool in self.pools.values():
+            pool.build(df)
+
+        self.oos_bestsellers = df[oos_bestseller_mask(df)]
+        self.sketches = {col: QuantileSketch().add(df[col].to_numpy())
+                         for col in ['Price_INR', 'Units_Sold_30_Days']}
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path=DEFAULT_STATE_PATH):
+        """Write a full snapshot and start an empty delta log"""
+        self.generation += 1
+        self.logged_rows = 0
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+        # Records left in the log belong to the previous generation: drop them
+        with open(path + '.log', 'wb'):
+            pass
+
+    def log_delta(self, delta, path=DEFAULT_STATE_PATH):
+        """
+        Record a delta that was applied to this state in the log of the
+        snapshot at path, or write a new snapshot once the log is large
+        """
+        self.logged_rows += len(delta)
+        n_products = int(self.partial['Product_Count'].sum())
+        if self.logged_rows > SNAPSHOT_FRACTION * max(n_products, 1):
+            self.save(path)
+            return
+        with open(path + '.log', 'ab') as f:
+            pickle.dump((self.generation, delta), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path=DEFAULT_STATE_PATH):
+        """Read the snapshot and replay the deltas logged since"""
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if os.path.exists(path + '.log'):
+            with open(path + '.log', 'rb') as f:
+                while True:
+                    try:
+                        generation, delta = pickle.load(f)
+                    except EOFError:
+                        break
+                    if generation == state.generation:
+                        state.apply_delta(delta)
+                        state.logged_rows += len(delta)
+        return state
+
+    # ------------------------------------------------------------------
+    # Aggregate pieces
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _partial(rows):
+        partial = partial_aggregates(rows)
+        partial['Price_Band'] = partial['Price_Band'].fillna(NO_BAND)
+        return partial
+
+    @staticmethod
+    def _value_counts(rows, col):
+        return rows.groupby(GROUP_KEYS + [col], observed=True).size()
+
+    @staticmethod
+    def _apply_counts(counts, old_rows, new_rows, col):
+        counts = counts.add(IncrementalState._value_counts(new_rows, col), fill_value=0)
+        counts = counts.sub(IncrementalState._value_counts(old_rows, col), fill_value=0)
+        return counts[counts > 0].astype(np.int64)
+
+    def _apply_partial(self, old_rows, new_rows):
+        """Add new rows' sums/counts, subtract old ones, rebuild min/max from histograms"""
+        old = self._partial(old_rows)[GROUP_KEYS + SUM_COLUMNS]
+        old[SUM_COLUMNS] = -old[SUM_COLUMNS]
+        parts = [self.partial[GROUP_KEYS + SUM_COLUMNS],
+                 self._partial(new_rows)[GROUP_KEYS + SUM_COLUMNS], old]
+        sums = pd.concat(parts, ignore_index=True).groupby(GROUP_KEYS, sort=True).sum()
+        sums = sums[sums['Product_Count'] > 0]
+
+        self.rating_counts = self._apply_counts(self.rating_counts, old_rows, new_rows,
+                                                'Customer_Rating')
+        self.date_counts = self._apply_counts(self.date_counts, old_rows, new_rows, 'Date_Added')
+        ratings = self.rating_counts.reset_index().groupby(GROUP_KEYS)['Customer_Rating']
+        dates = self.date_counts.reset_index().groupby(GROUP_KEYS)['Date_Added']
+
+        partial = sums.assign(Rating_Min=ratings.min(), Rating_Max=ratings.max(),
+                              Date_Min=dates.min(), Date_Max=dates.max())
+        self.partial = partial.reset_index()[GROUP_KEYS + list(PARTIAL_COLUMNS)]
+
+    # ------------------------------------------------------------------
+    # Product store
+    # ------------------------------------------------------------------
+
+    def _live_base(self):
+        if not self.tombstones:
+            return self.base
+        return self.base[~self.base.index.isin(list(self.tombstones))]
+
+    def _lookup(self, ids):
+        """Current rows of the given Product_IDs (ValueError if unknown)"""
+        in_tail = [i for i in ids if i in self.tail.index]
+        in_base = [i for i in ids if i in self.base.index and i not in self.tombstones]
+        missing = set(ids) - set(in_tail) - set(in_base)
+        if missing:
+            raise ValueError(f"Unknown Product_ID(s): {sorted(missing)[:10]}")
+        return pd.concat([self.base.loc[in_base], self.tail.loc[in_tail]])
+
+    def _fetch_group(self, by):
+        def fetch(key):
+            rows = pd.concat([self._live_base(), self.tail])
+            return rows if by is None else rows[rows[by].astype(object) == key]
+        return fetch
+
+    def catalog(self):
+        """Current catalog in row order (standard columns)"""
+        rows = pd.concat([self._live_base(), self.tail]).sort_values('Row_Order')
+        rows = rows[self.columns].reset_index(drop=True)
+        rows['Price_Band'] = rows['Price_Band'].replace(NO_BAND, np.nan)
+        return rows
+
+    def _compact(self):
+        """Fold the insert tail and tombstones into the base table"""
+        self.base = pd.concat([self._live_base(), self.tail])
+        self.tail = self.base.iloc[:0].copy()
+        self.tombstones = set()
+
+    # ------------------------------------------------------------------
+    # Deltas
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _check_rows(rows):
+        """
+        ValueError for new product versions the state cannot hold. Runs
+        before anything is changed, so a rejected delta leaves the state as
+        it was.
+        """
+        for col, dtype in NUMERIC_COLUMNS.items():
+            values = rows[col].to_numpy(dtype=float)
+            bad = ~np.isfinite(values) | (values < 0)
+            if dtype == 'int64':
+                bad |= values != np.floor(values)
+            if bad.any():
+                kind = 'whole number' if dtype == 'int64' else 'number'
+                raise ValueError(f"{col} must be a non-negative {kind}: "
+                                 f"{rows.loc[bad, 'Product_ID'].tolist()[:10]}")
+        for col, known in (('Stock_Status', STOCK_STATUS), ('Performance_Tier', PERFORMANCE_TIERS)):
+            bad = ~rows[col].isin(known).to_numpy()
+            if bad.any():
+                raise ValueError(f"{col} must be one of {known}: "
+                                 f"{rows.loc[bad, 'Product_ID'].tolist()[:10]}")
+
+    def apply_delta(self, delta):
+        """
+        Apply a delta table (Op, Product_ID, product columns) and return the
+        number of inserted, updated and deleted products
+        """
+        ops = delta['Op'].str.strip().str.lower()
+        unknown = set(ops) - set(DELTA_OPS)
+        if unknown:
+            raise ValueError(f"Unknown delta Op(s): {sorted(unknown)}")
+        if delta['Product_ID'].duplicated().any():
+            raise ValueError("A delta may change each Product_ID only once")
+
+        inserts = delta[ops == 'insert'].drop(columns='Op')
+        updates = delta[ops == 'update'].drop(columns='Op').set_index('Product_ID')
+        deletes = delta.loc[ops == 'delete', 'Product_ID'].tolist()
+
+        existing = [i for i in inserts['Product_ID'] if i in self.tail.index or
+                    (i in self.base.index and i not in self.tombstones)]
+        if existing:
+            raise ValueError(f"Product_ID(s) already in catalog: {existing[:10]}")
+
+        # Old versions of every changed product
+        old_rows = self._lookup(updates.index.tolist() + deletes)
+
+        # New versions: non-empty update fields override the stored row
+        updated = old_rows.loc[updates.index].copy()
+        for col in updates.columns.intersection(self.columns):
+            values = updates[col].dropna()
+            if len(values):
+                updated.loc[values.index, col] = values.astype(updated[col].dtype)
+        required = [col for col in self.columns if col != 'Price_Band']
+        incomplete = inserts[inserts.reindex(columns=required).isna().any(axis=1)]
+        if len(incomplete):
+            raise ValueError(f"Inserted products need every column: "
+                             f"{incomplete['Product_ID'].tolist()[:10]}")
+        inserted = inserts.reindex(columns=self.columns).assign(
+            Row_Order=np.arange(self.next_row, self.next_row + len(inserts), dtype=np.int64))
+        inserted = inserted.set_index('Product_ID', drop=False)
+        new_rows = pd.concat([updated, inserted])
+        self._check_rows(new_rows)
+        for col, dtype in NUMERIC_COLUMNS.items():
+            new_rows[col] = new_rows[col].astype(dtype)
+        new_rows['Price_Band'] = add_price_band(new_rows)['Price_Band'].astype(object).fillna(NO_BAND)
+
+        # Product store first: pool refills read the live rows
+        updated, inserted = new_rows.iloc[:len(updated)], new_rows.iloc[len(updated):]
+        base_updates = updated[~updated.index.isin(self.tail.index)]
+        tail_updates = updated[updated.index.isin(self.tail.index)]
+        self.base.loc[base_updates.index, self.columns] = base_updates[self.columns]
+        self.tail.loc[tail_updates.index, self.columns] = tail_updates[self.columns]
+        self.tail = self.tail.drop(index=[i for i in deletes if i in self.tail.index])
+        self.tombstones.update(i for i in deletes if i in self.base.index)
+        self.tail = pd.concat([self.tail, inserted.loc[:, self.tail.columns]])
+        self.next_row += len(inserts)
+        if len(self.tail) + len(self.tombstones) > COMPACT_FRACTION * max(len(self.base), 1):
+            self._compact()
+
+        # Aggregates, pools, OOS set and sketches
+        self._apply_partial(old_rows, new_rows)
+        for name, pool in self.pools.items():
+            pool.update(old_rows, new_rows, self._fetch_group(pool.by))
+        oos = self.oos_bestsellers
+        oos = oos[~oos['Product_ID'].isin(old_rows['Product_ID'])]
+        self.oos_bestsellers = pd.concat([oos, new_rows[oos_bestseller_mask(new_rows)]]
+                                         ).sort_values('Row_Order')
+        for col, sketch in self.sketches.items():
+            sketch.remove(old_rows[col].to_numpy())
+            sketch.add(new_rows[col].to_numpy())
+
+        return {'inserted': len(inserts), 'updated': len(updates), 'deleted': len(deletes)}
+
+    # ------------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------------
+
+    def aggregates(self):
+        partial = self.partial.copy()
+        partial['Price_Band'] = partial['Price_Band'].replace(NO_BAND, np.nan)
+        return CatalogAggregates(partial)
+
+    def _describe(self, col, min_pool, max_pool):
+        stats = self.sketches[col].describe(col)
+        if len(self.pools[min_pool].rows):
+            stats['min'] = float(self.pools[min_pool].rows[col].iloc[0])
+            stats['max'] = float(self.pools[max_pool].rows[col].iloc[0])
+        return stats
+
+    def report_inputs(self):
+        """Report inputs from the stored state (percentiles are sketched)"""
+        first_rows = self.pools['first_row'].rows.sort_values('Row_Order')
+        category_order = first_rows['Main_Category'].astype(object).tolist()
+        top_sellers = self.pools['top_sellers'].top()
+        position = top_sellers['Main_Category'].astype(object).map(
+            {c: i for i, c in enumerate(category_order)})
+        top_sellers = top_sellers.assign(_Position=position).sort_values(
+            ['_Position', 'Rank'], kind='stable').drop(columns='_Position')
+
+        n = int(self.partial['Product_Count'].sum())
+        return {
+            'shape': (n, len(self.columns)),
+            'price_stats': self._describe('Price_INR', 'price_min', 'price_max'),
+            'units_stats': self._describe('Units_Sold_30_Days', 'units_min', 'units_max'),
+            'top_sellers': top_sellers[self.columns],
+            'oos_bestsellers': self.oos_bestsellers[self.columns],
+            'top_rated': self.pools['top_rated'].top()[self.columns],
+        }
+
+    def verify(self):
+        """
+        Recompute everything from the stored catalog and compare with the
+        incremental state. Returns a list of mismatch descriptions.
+        """
+        catalog = self.catalog()
+        full, inc = CatalogAggregates.from_frame(catalog), self.aggregates()
+        full_inputs, inc_inputs = report_inputs(catalog), self.report_inputs()
+        problems = []
+
+        for table in ['category_performance', 'price_distribution', 'stock_analysis',
+                      'rating_analysis']:
+            a, b = getattr(full, table)(), getattr(inc, table)()
+            same_shape = a.shape == b.shape and list(a.index) == list(b.index)
+            if not same_shape or not np.allclose(a.to_numpy(dtype=float), b.to_numpy(dtype=float),
+                                                 rtol=1e-9, atol=0.011, equal_nan=True):
+                problems.append(f"{table} differs")
+
+        for key, value in full.totals.items():
+            other = inc.totals[key]
+            if isinstance(value, float):
+                if not np.isclose(value, other, rtol=1e-9):
+                    problems.append(f"totals[{key}]: {value} != {other}")
+            elif value != other:
+                problems.append(f"totals[{key}]: {value} != {other}")
+
+        for key in ['top_sellers', 'oos_bestsellers', 'top_rated']:
+            a = full_inputs[key]['Product_ID'].tolist()
+            b = inc_inputs[key]['Product_ID'].tolist()
+            if a != b:
+                problems.append(f"{key}: {a[:5]}... != {b[:5]}...")
+
+        for key, col in [('price_stats', 'Price_INR'), ('units_stats', 'Units_Sold_30_Days')]:
+            a, b = full_inputs[key], inc_inputs[key]
+            exact = ['count', 'mean', 'std', 'min', 'max']
+            if not np.allclose(a[exact], b[exact], rtol=1e-6):
+                problems.append(f"{key} moments differ")
+            # A sketched percentile approximates an order statistic next to the
+            # interpolated pandas value, within the sketch's relative accuracy
+            q = [0.25, 0.50, 0.75]
+            accuracy = self.sketches[col].relative_accuracy
+            low = catalog[col].quantile(q, interpolation='lower').to_numpy() * (1 - accuracy)
+            high = catalog[col].quantile(q, interpolation='higher').to_numpy() * (1 + accuracy)
+            sketched = b[['25%', '50%', '75%']].to_numpy(dtype=float)
+            if not ((sketched >= low - 1e-9) & (sketched <= high + 1e-9)).all():
+                problems.append(f"{key} percentiles outside sketch accuracy")
+        return problems
+
+
+def read_delta(path):
+    """Read a delta CSV (Op, Product_ID, product columns); blanks mean 'unchanged'"""
+    delta = pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[''])
+    for col in NUMERIC_COLUMNS:
+        if col in delta.columns:
+            delta[col] = pd.to_numeric(delta[col])
+    if 'Op' not in delta.columns or 'Product_ID' not in delta.columns:
+        raise ValueError(f"{path}: delta files need Op and Product_ID columns")
+    return delta
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Incremental re-analysis from catalog deltas")
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH, help="aggregate state file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    init = commands.add_parser('init', help="build the state from a full catalog CSV")
+    init.add_argument('csv_path', nargs='?', default='product_analysis_data.csv')
+
+    apply = commands.add_parser('apply', help="apply delta file(s) and re-emit the report")
+    apply.add_argument('delta_paths', nargs='+')
+    apply.add_argument('--verify', action='store_true',
+                       help="check the result against a full recompute")
+    apply.add_argument('--quiet', action='store_true', help="do not print the report")
+
+    commands.add_parser('verify', help="check the state against a full recompute")
+
+    export = commands.add_parser('export', help="write the current catalog to CSV")
+    export.add_argument('csv_path')
+
+    args = parser.parse_args()
+
+    if args.command == 'init':
+        state = IncrementalState(pd.read_csv(args.csv_path))
+        state.save(args.state)
+        print(f"✓ State for {len(state.catalog())} products saved to: {args.state}")
+    elif args.command == 'export':
+        IncrementalState.load(args.state).catalog().to_csv(args.csv_path, index=False)
+        print(f"✓ Catalog saved to: {args.csv_path}")
+    else:
+        state = IncrementalState.load(args.state)
+        if args.command == 'apply':
+            for path in args.delta_paths:
+                try:
+                    delta = read_delta(path)
+                    counts = state.apply_delta(delta)
+                except ValueError as e:
+                    print(f"❌ {path}: {e}")
+                    sys.exit(1)
+                state.log_delta(delta, args.state)
+                print(f"✓ Applied {path}: {counts['inserted']} inserted, "
+                      f"{counts['updated']} updated, {counts['deleted']} deleted")
+            if not args.quiet:
+                print_report(state.aggregates(), state.report_inputs())
+        if args.command == 'verify' or args.verify:
+            problems = state.verify()
+            if problems:
+                print("\n❌ Verification FAILED:")
+                for problem in problems:
+                    print(f"  • {problem}")
+                sys.exit(1)
+            print("\n✅ Verification passed: incremental state matches a full recompute")
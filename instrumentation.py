@@ -0,0 +1,134 @@
+"""
+THE SHOP INDIA - SECTION INSTRUMENTATION
+========================================
+Records wall time, CPU time, peak traced memory and rows processed for
+each analysis section and chart render, and writes them as a JSON or CSV
+timing report.
+
+Sections are measured flat (one at a time, not nested). Peak memory is the
+tracemalloc peak above the traced memory at the start of the section.
+One section can additionally be run under cProfile; its stats are saved
+as <name>.prof plus a text summary sorted by cumulative time.
+
+Usage:
+    instrument = Instrumentation(profile='best_sellers')
+    with instrument.section('best_sellers', rows=len(df)):
+        ...
+    instrument.save('timings.json')         # or timings.csv
+"""
+
+import contextlib
+import cProfile
+import csv
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+
+RECORD_FIELDS = ['section', 'wall_s', 'cpu_s', 'peak_mib', 'rows', 'started_at']
+PROFILE_LINES = 30
+
+
+class Instrumentation:
+    """
+    Collects one timing record per measured section.
+
+    Attributes:
+        records      - list of dicts (RECORD_FIELDS, plus 'profile' paths)
+        trace_memory - measure peak allocations with tracemalloc
+        profile      - name of the section to run under cProfile (or None)
+        profile_dir  - where the cProfile output is written
+    """
+
+    def __init__(self, trace_memory=True, profile=None, profile_dir='.'):
+        self.records = []
+        self.trace_memory = trace_memory
+        self.profile = profile
+        self.profile_dir = profile_dir
+
+    @contextlib.contextmanager
+    def section(self, name, rows=None):
+        """Measure the enclosed block as section `name`"""
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base_memory = tracemalloc.get_traced_memory()[0]
+
+        profiler = cProfile.Profile() if name == self.profile else None
+        record = {'section': name, 'rows': rows,
+                  'started_at': datetime.now().isoformat(timespec='milliseconds')}
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+            record['wall_s'] = round(time.perf_counter() - wall, 6)
+            record['cpu_s'] = round(time.process_time() - cpu, 6)
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - base_memory
+                record['peak_mib'] = round(max(peak, 0) / 2**20, 3)
+                if started_tracing:
+                    tracemalloc.stop()
+            else:
+                record['peak_mib'] = None
+            if profiler:
+                record['profile'] = self._save_profile(name, profiler)
+            self.records.append(record)
+
+    def _save_profile(self, name, profiler):
+        """Write <name>.prof and <name>.prof.txt; returns the .prof path"""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f'{name}.prof')
+        profiler.dump_stats(path)
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(PROFILE_LINES)
+        with open(path + '.txt', 'w', encoding='utf-8') as f:
+            f.write(text.getvalue())
+        return path
+
+    def fresh(self):
+        """Empty Instrumentation with the same settings (for worker processes)"""
+        return Instrumentation(self.trace_memory, self.profile, self.profile_dir)
+
+    def extend(self, records):
+        """Add records measured elsewhere (e.g. in a render worker process)"""
+        self.records.extend(records)
+
+    def save(self, path):
+        """Write the timing report; .csv paths get CSV, anything else JSON"""
+        if path.endswith('.csv'):
+            fields = RECORD_FIELDS + (['profile'] if any('profile' in r for r in self.records)
+                                      else [])
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(self.records)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'sections': self.records}, f, indent=2)
+
+    def summary(self):
+        """Text table of the records (slowest first)"""
+        lines = [f"{'Section':<26}{'Wall (s)':>10}{'CPU (s)':>10}{'Peak (MiB)':>12}{'Rows':>12}",
+                 "-" * 70]
+        for r in sorted(self.records, key=lambda r: r['wall_s'], reverse=True):
+            peak = '-' if r['peak_mib'] is None else f"{r['peak_mib']:.1f}"
+            rows = '-' if r['rows'] is None else f"{r['rows']:,}"
+            lines.append(f"{r['section']:<26}{r['wall_s']:>10.3f}{r['cpu_s']:>10.3f}"
+                         f"{peak:>12}{rows:>12}")
+        return "\n".join(lines)
+
+
+def track(instrument, name, rows=None):
+    """instrument.section(name, rows), or a no-op when instrument is None"""
+    if instrument is None:
+        return contextlib.nullcontext()
+    return instrument.section(name, rows)
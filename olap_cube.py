@@ -0,0 +1,300 @@
+"""
+THE SHOP INDIA - OLAP ROLLUP CUBE
+=================================
+Materializes product counts and the sums of revenue, units sold, rating
+and reviews for a configurable set of dimension combinations (cuboids),
+and answers slice / dice / roll-up queries from those tables alone.
+
+    build   the finest cuboids are grouped from the product table; every
+            other cuboid is rolled up from an already built superset
+    query   group by any dimensions and filter on any values: the smallest
+            cuboid holding all of them is rolled up (means are sums over
+            counts, so they roll up exactly)
+
+The cube file (.npz) is columnar: one shared value dictionary per
+dimension, small integer codes per cuboid column, and int64 sums with
+revenue in paise and ratings x100, so every total is exact.
+
+Usage:
+    python olap_cube.py build product_analysis_data.csv
+    python olap_cube.py build --cuboid Sub_Category,Fabric,Color --cuboid Price_Band,Performance_Tier
+    python olap_cube.py query --by Price_Band,Performance_Tier
+    python olap_cube.py query --by Sub_Category,Fabric --where Main_Category=Women --where Color=Red,Blue
+    python olap_cube.py info
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from aggregations import price_bands
+
+DEFAULT_CUBE_PATH = 'catalog_cube.npz'
+
+DIMENSIONS = ['Main_Category', 'Sub_Category', 'Price_Band', 'Stock_Status',
+              'Performance_Tier', 'Color', 'Fabric']
+
+# Stored measure -> (product column, fixed-point scale)
+MEASURES = {
+    'Revenue': ('Revenue_30_Days', 100),
+    'Units': ('Units_Sold_30_Days', 1),
+    'Rating': ('Customer_Rating', 100),
+    'Reviews': ('Num_Reviews', 1),
+}
+
+DEFAULT_CUBOIDS = [
+    ('Main_Category', 'Sub_Category', 'Price_Band', 'Stock_Status', 'Performance_Tier'),
+    ('Main_Category', 'Sub_Category', 'Fabric', 'Color'),
+    ('Main_Category', 'Price_Band', 'Color'),
+    ('Main_Category', 'Price_Band', 'Fabric'),
+]
+
+
+def _group_codes(codes, sizes, values):
+    """
+    Sum the rows of `values` (int64, rows x measures) per distinct code
+    combination. Returns (one code array per dimension, summed values).
+    """
+    n = len(values)
+    if not codes:
+        return [], values.sum(axis=0, keepdims=True)
+    if np.prod([float(s) for s in sizes]) < 2**62:
+        key = np.zeros(n, dtype=np.int64)
+        for c, size in zip(codes, sizes):
+            key = key * size + c
+        unique, inverse = np.unique(key, return_inverse=True)
+        out_codes = []
+        for size in reversed(sizes):
+            out_codes.append(unique % size)
+            unique = unique // size
+        out_codes.reverse()
+    else:
+        unique, inverse = np.unique(np.column_stack(codes), axis=0, return_inverse=True)
+        out_codes = list(unique.T)
+
+    sums = np.zeros((len(out_codes[0]), values.shape[1]), dtype=np.int64)
+    np.add.at(sums, inverse.ravel(), values)
+    return out_codes, sums
+
+
+def _code_dtype(size):
+    return np.uint8 if size <= 2**8 else np.uint16 if size <= 2**16 else np.uint32
+
+
+class Cuboid:
+    """
+    One materialized group-by table.
+
+    Attributes:
+        dims   - dimension names
+        codes  - dict dim -> value codes (into the cube dictionaries)
+        counts - product count per row
+        sums   - int64 [row, measure] sums (MEASURES order, fixed point)
+    """
+
+    def __init__(self, dims, codes, counts, sums):
+        self.dims = tuple(dims)
+        self.codes = codes
+        self.counts = counts
+        self.sums = sums
+
+    def __len__(self):
+        return len(self.counts)
+
+
+class Cube:
+    """
+    Cuboids of a catalog plus the value dictionary of every dimension.
+
+    Attributes:
+        dictionaries - dict dim -> array of values (code = position)
+        cuboids      - list of Cuboid, finest first
+    """
+
+    def __init__(self, dictionaries, cuboids):
+        self.dictionaries = dictionaries
+        self.cuboids = cuboids
+
+    @classmethod
+    def build(cls, df, cuboids=DEFAULT_CUBOIDS):
+        """Materialize the given dimension combinations of a product table"""
+        if 'Price_Band' not in df.columns:
+            df = df.assign(Price_Band=price_bands(df['Price_INR']))
+        wanted = [tuple(dict.fromkeys(dims)) for dims in cuboids]
+        unknown = {d for dims in wanted for d in dims} - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown dimension(s): {', '.join(sorted(unknown))}")
+
+        dictionaries, row_codes = {}, {}
+        for dim in sorted({d for dims in wanted for d in dims}, key=DIMENSIONS.index):
+            codes, values = pd.factorize(df[dim].astype(object), sort=True, use_na_sentinel=False)
+            dictionaries[dim] = np.asarray(values.astype(str), dtype=str)
+            row_codes[dim] = codes
+        values = np.column_stack(
+            [np.ones(len(df), dtype=np.int64)] +
+            [np.rint(df[col].to_numpy(dtype=float) * scale).astype(np.int64)
+             for col, scale in MEASURES.values()])
+
+        built = []
+        # Widest first, so narrower cuboids roll up from a built superset
+        for dims in sorted(set(wanted), key=len, reverse=True):
+            source = min((c for c in built if set(dims) <= set(c.dims)), key=len, default=None)
+            if source is None:
+                codes = [row_codes[d] for d in dims]
+                rows = values
+            else:
+                codes = [source.codes[d] for d in dims]
+                rows = np.column_stack([source.counts, source.sums])
+            sizes = [len(dictionaries[d]) for d in dims]
+            out_codes, sums = _group_codes(codes, sizes, rows)
+            built.append(Cuboid(dims, {d: c.astype(_code_dtype(s))
+                                       for d, c, s in zip(dims, out_codes, sizes)},
+                                sums[:, 0], sums[:, 1:]))
+        return cls(dictionaries, built)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path=DEFAULT_CUBE_PATH):
+        arrays = {f'dict/{dim}': values for dim, values in self.dictionaries.items()}
+        for i, cuboid in enumerate(self.cuboids):
+            arrays[f'{i}/dims'] = np.array(cuboid.dims)
+            arrays[f'{i}/counts'] = cuboid.counts
+            arrays[f'{i}/sums'] = cuboid.sums
+            for dim, codes in cuboid.codes.items():
+                arrays[f'{i}/{dim}'] = codes
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path=DEFAULT_CUBE_PATH):
+        with np.load(path) as data:
+            dictionaries = {key[5:]: data[key] for key in data.files if key.startswith('dict/')}
+            cuboids = []
+            i = 0
+            while f'{i}/dims' in data.files:
+                dims = data[f'{i}/dims'].tolist()
+                cuboids.append(Cuboid(dims, {d: data[f'{i}/{d}'] for d in dims},
+                                      data[f'{i}/counts'], data[f'{i}/sums']))
+                i += 1
+        return cls(dictionaries, cuboids)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def cuboid_for(self, dims):
+        """Smallest cuboid holding every dimension in dims"""
+        candidates = [c for c in self.cuboids if set(dims) <= set(c.dims)]
+        if not candidates:
+            raise ValueError(f"No materialized cuboid covers {', '.join(dims)}; "
+                             f"rebuild with --cuboid {','.join(dims)}")
+        return min(candidates, key=len)
+
+    def _value_codes(self, dim, values):
+        """Codes of the given values of a dimension"""
+        if dim not in self.dictionaries:
+            raise ValueError(f"Unknown dimension {dim!r}")
+        positions = {value: code for code, value in enumerate(self.dictionaries[dim])}
+        values = [values] if isinstance(values, str) else list(values)
+        missing = [v for v in values if v not in positions]
+        if missing:
+            raise ValueError(f"Unknown {dim} value(s): {', '.join(missing)}")
+        return np.array([positions[v] for v in values], dtype=np.int64)
+
+    def query(self, by=(), where=None):
+        """
+        Roll up to the `by` dimensions, keeping only rows whose `where`
+        dimensions hold the given value (slice) or one of the given values
+        (dice). Returns one row per group: Product_Count, then <measure>_Sum
+        and <measure>_Mean for every measure.
+        """
+        by = list(by)
+        where = where or {}
+        cuboid = self.cuboid_for(by + [d for d in where if d not in by])
+
+        keep = np.ones(len(cuboid), dtype=bool)
+        for dim, values in where.items():
+            keep &= np.isin(cuboid.codes[dim], self._value_codes(dim, values))
+        rows = np.column_stack([cuboid.counts[keep], cuboid.sums[keep]])
+        sizes = [len(self.dictionaries[d]) for d in by]
+        codes, sums = _group_codes([cuboid.codes[d][keep].astype(np.int64) for d in by],
+                                   sizes, rows)
+
+        counts = sums[:, 0]
+        table = pd.DataFrame({d: self.dictionaries[d][c] for d, c in zip(by, codes)})
+        table['Product_Count'] = counts
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for i, (name, (_, scale)) in enumerate(MEASURES.items(), start=1):
+                total = sums[:, i] / scale if scale != 1 else sums[:, i]
+                table[f'{name}_Sum'] = total
+                table[f'{name}_Mean'] = total / counts
+        if by:
+            table = table[table['Product_Count'] > 0].set_index(by)
+        return table
+
+    def summary(self):
+        """Cuboid dimensions and row counts"""
+        return pd.DataFrame({'Dimensions': [' x '.join(c.dims) for c in self.cuboids],
+                             'Rows': [len(c) for c in self.cuboids]})
+
+
+def _parse_where(items):
+    """['Main_Category=Women', 'Color=Red,Blue'] -> {dim: [values]}"""
+    where = {}
+    for item in items or []:
+        dim, sep, values = item.partition('=')
+        if not sep:
+            raise ValueError(f"--where expects DIM=VALUE[,VALUE...], got {item!r}")
+        where.setdefault(dim.strip(), []).extend(v.strip() for v in values.split(','))
+    return where
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="OLAP rollup cube over catalog dimensions")
+    parser.add_argument('--cube-file', default=DEFAULT_CUBE_PATH, help="cube file (.npz)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="materialize the cube from a catalog CSV")
+    build.add_argument('csv_path', nargs='?', default='product_analysis_data.csv')
+    build.add_argument('--cuboid', action='append', metavar='DIM[,DIM...]',
+                       help=f"dimension combination to materialize (repeatable; "
+                            f"dimensions: {', '.join(DIMENSIONS)})")
+
+    query = commands.add_parser('query', help="slice, dice and roll up the cube")
+    query.add_argument('--by', default='', help="comma-separated group-by dimensions")
+    query.add_argument('--where', action='append', metavar='DIM=VALUE[,VALUE...]',
+                       help="keep only these values of a dimension (repeatable)")
+    query.add_argument('--sort', help="column to sort by (descending)")
+
+    commands.add_parser('info', help="list the materialized cuboids")
+    args = parser.parse_args()
+    pd.set_option('display.width', 200)
+    pd.set_option('display.max_rows', 500)
+    pd.set_option('display.float_format', '{:,.2f}'.format)
+
+    if args.command == 'build':
+        cuboids = ([tuple(d.strip() for d in spec.split(',') if d.strip()) for spec in args.cuboid]
+                   if args.cuboid else DEFAULT_CUBOIDS)
+        columns = set(DIMENSIONS) | {col for col, _ in MEASURES.values()} | {'Price_INR'}
+        df = pd.read_csv(args.csv_path, usecols=lambda col: col in columns)
+        cube = Cube.build(df, cuboids)
+        cube.save(args.cube_file)
+        print(f"✓ {len(cube.cuboids)} cuboids from {len(df):,} products saved to: {args.cube_file}")
+        print(cube.summary().to_string(index=False))
+    else:
+        cube = Cube.load(args.cube_file)
+        if args.command == 'info':
+            print(cube.summary().to_string(index=False))
+        else:
+            by = [d.strip() for d in args.by.split(',') if d.strip()]
+            try:
+                table = cube.query(by, _parse_where(args.where))
+            except ValueError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            if args.sort:
+                table = table.sort_values(args.sort, ascending=False)
+            print(table.to_string())
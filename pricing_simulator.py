@@ -0,0 +1,344 @@
+"""
+THE SHOP INDIA - PRICING WHAT-IF SIMULATOR
+==========================================
+Monte Carlo evaluation of price changes per category and/or price band.
+
+A product whose price changes by a factor f = 1 + adjustment sells
+units x f^e (constant price elasticity e), so its revenue becomes
+Revenue_30_Days x f^(1 + e). Elasticity is uncertain: every scenario draws
+one elasticity per category from that category's distribution, plus
+optional per-product noise.
+
+Scenarios x products are evaluated as batched NumPy arrays, one block of
+products at a time (about BLOCK_ELEMENTS values per block), so memory stays
+bounded for thousands of scenarios on a 1M-product catalog. Only products
+whose price changes are simulated; the rest add their current revenue.
+Blocks are spread over a process pool for large runs, and each block draws
+from its own seeded stream, so results do not depend on the worker count.
+
+Output: the revenue distribution over scenarios (total, per category and
+per price band) and the product mix over the price bands (bins 0/1K/2K/
+3K/5K/50K) after re-banding the new prices.
+
+Usage:
+    python pricing_simulator.py --adjust Women=+5% --adjust luxury=-10%
+    python pricing_simulator.py --adjust all=-5% --elasticity normal:-1.4,0.3 \\
+        --elasticity Kids=uniform:-2.5,-1.5 --scenarios 5000 --output scenarios.csv
+    python pricing_simulator.py --products 1M --adjust all=+3% --scenarios 1000
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from aggregations import BAND_ALIASES, NO_BAND, PRICE_BAND_BINS, PRICE_BAND_LABELS, parse_size
+
+DEFAULT_SCENARIOS = 1000
+DEFAULT_ELASTICITY = 'normal:-1.2,0.3'
+DEFAULT_PRODUCT_NOISE = 0.1
+BLOCK_ELEMENTS = 4_000_000          # scenario x product values per block
+PARALLEL_MIN_ELEMENTS = 50_000_000  # below this a run stays in-process
+BAND_NAMES = PRICE_BAND_LABELS + [NO_BAND]
+
+# name -> (parameter names, sampler(rng, params, size))
+ELASTICITY_DISTRIBUTIONS = {
+    'normal': (('mean', 'sd'), lambda rng, p, size: rng.normal(p[0], p[1], size)),
+    'uniform': (('low', 'high'), lambda rng, p, size: rng.uniform(p[0], p[1], size)),
+    'triangular': (('low', 'mode', 'high'),
+                   lambda rng, p, size: rng.triangular(p[0], p[1], p[2], size)),
+    'fixed': (('value',), lambda rng, p, size: np.full(size, p[0])),
+}
+
+
+def parse_distribution(spec):
+    """'normal:-1.2,0.3' -> ('normal', (-1.2, 0.3))"""
+    name, _, params = spec.partition(':')
+    name = name.strip().lower()
+    if name not in ELASTICITY_DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {name!r}; choose from "
+                         f"{', '.join(ELASTICITY_DISTRIBUTIONS)}")
+    values = tuple(float(v) for v in params.split(',') if v.strip())
+    expected = ELASTICITY_DISTRIBUTIONS[name][0]
+    if len(values) != len(expected):
+        raise ValueError(f"{name} takes {len(expected)} parameter(s): {', '.join(expected)}")
+    return name, values
+
+
+def parse_adjustment(spec):
+    """'Women=+5%' -> ('Women', 0.05); 'luxury=-0.1' -> ('luxury', -0.1)"""
+    key, sep, value = spec.partition('=')
+    if not sep:
+        raise ValueError(f"Adjustments look like KEY=+5%, got {spec!r}")
+    value = value.strip()
+    change = float(value[:-1]) / 100 if value.endswith('%') else float(value)
+    if change <= -1:
+        raise ValueError(f"Price change {value} would make prices non-positive")
+    return key.strip(), change
+
+
+def band_codes(prices):
+    """Position of every price in BAND_NAMES (pd.cut bins; outside -> NO_BAND)"""
+    codes = np.searchsorted(PRICE_BAND_BINS, prices, side='left') - 1
+    outside = (codes < 0) | (codes >= len(PRICE_BAND_LABELS))
+    return np.where(outside, len(PRICE_BAND_LABELS), codes)
+
+
+class PricingScenario:
+    """
+    Price adjustments and elasticity assumptions for a catalog.
+
+    Attributes:
+        adjustments  - {category, band alias/label or 'all': fractional price change};
+                       a product's changes multiply
+        elasticity   - default distribution (name, params) of category elasticities
+        overrides    - {category: (name, params)}
+        product_noise - sd of the per-product elasticity noise (0 = none)
+    """
+
+    def __init__(self, adjustments, elasticity=DEFAULT_ELASTICITY, overrides=None,
+                 product_noise=DEFAULT_PRODUCT_NOISE):
+        self.adjustments = dict(adjustments)
+        self.elasticity = (parse_distribution(elasticity) if isinstance(elasticity, str)
+                           else elasticity)
+        self.overrides = {cat: parse_distribution(d) if isinstance(d, str) else d
+                          for cat, d in (overrides or {}).items()}
+        self.product_noise = product_noise
+
+    def price_factors(self, df, categories):
+        """1 + price change of every product"""
+        factors = np.ones(len(df))
+        category = df['Main_Category'].astype(str).to_numpy()
+        band = np.asarray(BAND_NAMES, dtype=object)[band_codes(df['Price_INR'].to_numpy(dtype=float))]
+        for key, change in self.adjustments.items():
+            if key.lower() == 'all':
+                mask = np.ones(len(df), dtype=bool)
+            elif key in categories:
+                mask = category == key
+            elif key in BAND_NAMES or key.lower() in BAND_ALIASES:
+                mask = band == BAND_ALIASES.get(key.lower(), key)
+            else:
+                raise ValueError(f"Unknown adjustment key {key!r}: use a category "
+                                 f"({', '.join(categories)}), a band "
+                                 f"({', '.join(BAND_ALIASES)}) or 'all'")
+            factors[mask] *= 1 + change
+        return factors
+
+    def draw_elasticities(self, categories, n_scenarios, rng):
+        """[scenario, category] elasticities"""
+        unknown = set(self.overrides) - set(categories)
+        if unknown:
+            raise ValueError(f"Unknown elasticity override(s): {', '.join(sorted(unknown))}")
+        columns = []
+        for cat in categories:
+            name, params = self.overrides.get(cat, self.elasticity)
+            columns.append(ELASTICITY_DISTRIBUTIONS[name][1](rng, params, n_scenarios))
+        return np.column_stack(columns)
+
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+def simulate_block(block, seed, elasticities, product_noise, n_groups):
+    """
+    Scenario revenue of one block of adjusted products, summed per group.
+
+    block is (revenue, log price factor, category code, group code) arrays;
+    returns float64 [scenario, group] revenue sums.
+    """
+    revenue, log_factor, category, group = block
+    rng = np.random.default_rng(seed)
+    exponent = elasticities[:, category].astype(np.float32)
+    if product_noise:
+        exponent += rng.standard_normal(exponent.shape, dtype=np.float32) * np.float32(product_noise)
+    exponent += np.float32(1)
+    exponent *= log_factor.astype(np.float32)
+    np.exp(exponent, out=exponent)
+    exponent *= revenue.astype(np.float32)      # scenario x product revenue
+
+    onehot = np.zeros((len(group), n_groups), dtype=np.float32)
+    onehot[np.arange(len(group)), group] = 1
+    return (exponent @ onehot).astype(np.float64)
+
+
+def run_simulation(df, scenario, n_scenarios=DEFAULT_SCENARIOS, seed=42, workers=None):
+    """
+    Simulate n_scenarios elasticity draws for every product.
+
+    Returns a dict with:
+        baseline       - current revenue per category and per band (Series)
+        scenarios      - DataFrame [scenario, Total + categories]
+        band_revenue   - DataFrame [scenario, BAND_NAMES] (bands of the new prices)
+        mix            - products per band before and after the price change
+        elasticities   - the drawn [scenario, category] elasticities
+    """
+    categories = sorted(df['Main_Category'].astype(str).unique())
+    cat_codes = pd.Categorical(df['Main_Category'].astype(str), categories=categories).codes
+    prices = df['Price_INR'].to_numpy(dtype=float)
+    revenue = df['Revenue_30_Days'].to_numpy(dtype=float)
+
+    factors = scenario.price_factors(df, categories)
+    old_band = band_codes(prices)
+    new_band = band_codes(prices * factors)
+    n_cat, n_band = len(categories), len(BAND_NAMES)
+    # One group per (category, new band) pair; totals per category and band come from it
+    group = cat_codes.astype(np.int64) * n_band + new_band
+
+    seeds = np.random.SeedSequence(seed)
+    draw_seed, block_seed = seeds.spawn(2)
+    elasticities = scenario.draw_elasticities(categories, n_scenarios,
+                                              np.random.default_rng(draw_seed))
+
+    # Products whose price does not change keep their revenue in every scenario
+    unchanged = factors == 1
+    changed = np.flatnonzero(~unchanged)
+    fixed = np.bincount(group[unchanged], weights=revenue[unchanged], minlength=n_cat * n_band)
+    sums = np.tile(fixed.astype(np.float64), (n_scenarios, 1))
+
+    block_size = max(1, BLOCK_ELEMENTS // n_scenarios)
+    starts = range(0, len(changed), block_size)
+    blocks = [(revenue[changed[s:s + block_size]], np.log(factors[changed[s:s + block_size]]),
+               cat_codes[changed[s:s + block_size]], group[changed[s:s + block_size]])
+              for s in starts]
+    block_seeds = block_seed.spawn(len(blocks))
+
+    elements = len(changed) * n_scenarios
+    if workers is None:
+        workers = (os.cpu_count() or 1) if elements >= PARALLEL_MIN_ELEMENTS else 1
+    args = [(block, s, elasticities, scenario.product_noise, n_cat * n_band)
+            for block, s in zip(blocks, block_seeds)]
+    if workers <= 1 or len(blocks) <= 1:
+        results = [simulate_block(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(simulate_block, *zip(*args)))
+    for result in results:
+        sums += result
+
+    sums = sums.reshape(n_scenarios, n_cat, n_band)
+    scenarios = pd.DataFrame(sums.sum(axis=2), columns=categories)
+    scenarios.insert(0, 'Total', scenarios.sum(axis=1))
+    band_revenue = pd.DataFrame(sums.sum(axis=1), columns=BAND_NAMES)
+
+    baseline_groups = np.bincount(cat_codes.astype(np.int64) * n_band + old_band,
+                                  weights=revenue, minlength=n_cat * n_band).reshape(n_cat, n_band)
+    baseline = pd.concat([
+        pd.Series({'Total': revenue.sum()}),
+        pd.Series(baseline_groups.sum(axis=1), index=categories),
+        pd.Series(baseline_groups.sum(axis=0), index=BAND_NAMES),
+    ])
+    mix = pd.DataFrame({
+        'Products_Before': np.bincount(old_band, minlength=n_band),
+        'Products_After': np.bincount(new_band, minlength=n_band),
+    }, index=pd.Index(BAND_NAMES, name='Price_Band'))
+    return {
+        'baseline': baseline,
+        'scenarios': scenarios,
+        'band_revenue': band_revenue,
+        'mix': mix,
+        'elasticities': pd.DataFrame(elasticities, columns=categories),
+        'changed_products': len(changed),
+    }
+
+
+def distribution_table(revenue, baseline):
+    """Mean / percentiles of scenario revenue per column against the baseline"""
+    table = pd.DataFrame({
+        'Baseline': baseline.reindex(revenue.columns),
+        'Mean': revenue.mean(),
+        'P5': revenue.quantile(0.05),
+        'P50': revenue.median(),
+        'P95': revenue.quantile(0.95),
+    })
+    table['Mean_Change_%'] = ((table['Mean'] / table['Baseline'] - 1) * 100).round(2)
+    table['P(Gain)_%'] = ((revenue > baseline.reindex(revenue.columns)).mean() * 100).round(1)
+    return table
+
+
+def print_simulation(result, seconds=None):
+    pd.set_option('display.width', 200)
+    pd.set_option('display.float_format', '{:,.2f}'.format)
+    n = len(result['scenarios'])
+    print("=" * 80)
+    print("THE SHOP INDIA - PRICING WHAT-IF SIMULATION")
+    print("=" * 80 + "\n")
+    timing = '' if seconds is None else f" in {seconds:.2f}s"
+    print(f"{n:,} scenarios x {result['changed_products']:,} repriced products{timing}\n")
+
+    print("Revenue (30 days) by Category:")
+    print(distribution_table(result['scenarios'], result['baseline']).to_string())
+    print()
+
+    print("Revenue (30 days) by Price Band (after re-banding):")
+    bands = result['band_revenue']
+    bands = bands.loc[:, (bands != 0).any() | (result['baseline'][BAND_NAMES] != 0)]
+    print(distribution_table(bands, result['baseline']).to_string())
+    print()
+
+    print("Product Mix by Price Band:")
+    mix = result['mix']
+    mix = mix[(mix != 0).any(axis=1)]
+    print(mix.to_string())
+
+    total = result['scenarios']['Total']
+    baseline = result['baseline']['Total']
+    print(f"\n📈 Expected revenue change: {(total.mean() / baseline - 1) * 100:+.2f}% "
+          f"(90% of scenarios between {(total.quantile(0.05) / baseline - 1) * 100:+.2f}% "
+          f"and {(total.quantile(0.95) / baseline - 1) * 100:+.2f}%)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Monte Carlo pricing what-if simulation")
+    parser.add_argument('csv_path', nargs='?', default='product_analysis_data.csv')
+    parser.add_argument('--products', help="simulate a generated catalog of this size instead "
+                                           "(e.g. 1M)")
+    parser.add_argument('--adjust', action='append', default=[], metavar='KEY=CHANGE',
+                        help="price change for a category, a band (budget, economy, "
+                             "mid-range, premium, luxury) or 'all', e.g. Women=+5%% (repeatable)")
+    parser.add_argument('--elasticity', action='append', default=[], metavar='[CATEGORY=]DIST',
+                        help=f"elasticity distribution, e.g. {DEFAULT_ELASTICITY} or "
+                             f"Kids=uniform:-2,-1 (distributions: "
+                             f"{', '.join(ELASTICITY_DISTRIBUTIONS)})")
+    parser.add_argument('--product-noise', type=float, default=DEFAULT_PRODUCT_NOISE,
+                        help="sd of per-product elasticity noise")
+    parser.add_argument('--scenarios', type=int, default=DEFAULT_SCENARIOS)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes (default: one per CPU for large runs)")
+    parser.add_argument('--output', help="write per-scenario revenues to this CSV")
+    args = parser.parse_args()
+
+    if not args.adjust:
+        parser.error("give at least one --adjust KEY=CHANGE")
+
+    if args.products:
+        from shop_india_analysis import generate_shop_india_data
+        df = generate_shop_india_data(parse_size(args.products), batched=True, seed=args.seed)
+    else:
+        df = pd.read_csv(args.csv_path, usecols=['Main_Category', 'Price_INR', 'Revenue_30_Days'])
+
+    default, overrides = DEFAULT_ELASTICITY, {}
+    for spec in args.elasticity:
+        if '=' in spec:
+            cat, _, dist = spec.partition('=')
+            overrides[cat.strip()] = dist
+        else:
+            default = spec
+    try:
+        scenario = PricingScenario(dict(parse_adjustment(a) for a in args.adjust), default,
+                                   overrides, args.product_noise)
+        start = time.perf_counter()
+        result = run_simulation(df, scenario, args.scenarios, args.seed, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    print_simulation(result, time.perf_counter() - start)
+
+    if args.output:
+        table = result['scenarios'].join(result['band_revenue']).join(
+            result['elasticities'].add_prefix('Elasticity_'))
+        table.to_csv(args.output, index_label='Scenario')
+        print(f"\n✓ Scenario revenues saved to: {args.output}")
@@ -0,0 +1,299 @@
+"""
+THE SHOP INDIA - PRODUCT INDEX
+==============================
+In-memory indexes over the product table for faceted filtering and
+product name search, so a multi-facet query touches only the matching
+rows instead of masking every column of the catalog.
+
+    postings   Main_Category, Sub_Category, Color, Fabric, Stock_Status,
+               Performance_Tier, Price_Band: value -> sorted row positions
+    sorted     Price_INR, Customer_Rating: values in sorted order plus their
+               row positions, so a range is two binary searches
+    tokens     lower-case words of Product_Name -> sorted row positions
+
+A query is a set of terms (one per facet, range and name word). The
+matching row count of every term is known from the indexes alone, so the
+smallest term is materialized first and the others only narrow it: facets
+and words by binary-search intersection with their postings, ranges by a
+lookup of the remaining rows' values. Results are row positions in
+catalog order.
+
+Usage:
+    python product_index.py --where Fabric='Cotton Voile' --where Color=Indigo \\
+        --where Stock_Status='In Stock' --price 1K-2K
+    python product_index.py --search 'table run*' --rating 4.5- --counts
+"""
+
+import argparse
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from aggregations import BAND_ALIASES, price_bands
+
+FACET_COLUMNS = ['Main_Category', 'Sub_Category', 'Color', 'Fabric', 'Stock_Status',
+                 'Performance_Tier', 'Price_Band']
+RANGE_COLUMNS = ['Price_INR', 'Customer_Rating']
+TEXT_COLUMN = 'Product_Name'
+
+# Short facet names accepted next to the column names
+FACET_ALIASES = {
+    'category': 'Main_Category', 'sub_category': 'Sub_Category', 'color': 'Color',
+    'fabric': 'Fabric', 'stock': 'Stock_Status', 'tier': 'Performance_Tier',
+    'band': 'Price_Band',
+}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+_AMOUNT_PATTERN = re.compile(r'^(\d+(?:\.\d*)?|\.\d+)([kml]?)$')
+_AMOUNT_SCALE = {'': 1, 'k': 1_000, 'l': 100_000, 'm': 1_000_000}
+
+
+def tokenize(text):
+    """Lower-case words of a product name or search string"""
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def parse_amount(text):
+    """'1500', '₹1,500', '2K', '1.5L' -> float"""
+    cleaned = text.strip().lower().replace('₹', '').replace(',', '').replace(' ', '')
+    match = _AMOUNT_PATTERN.match(cleaned)
+    if not match:
+        raise ValueError(f"Not an amount: {text!r}")
+    return float(match.group(1)) * _AMOUNT_SCALE[match.group(2)]
+
+
+def parse_range(text):
+    """
+    'LOW-HIGH' (inclusive; either end may be left out) -> (low, high).
+    '1000-2000', '4.5-', '-3K', '₹1–2K' (a bare low end smaller than the
+    high end's number takes its unit: 1K-2K)
+    """
+    low, sep, high = text.replace('–', '-').partition('-')
+    if not sep:
+        value = parse_amount(low)
+        return value, value
+    low, high = low.strip(), high.strip()
+    if low and high and re.search(r'\d$', low) and re.search(r'\d[kml]$', high.lower()):
+        if parse_amount(low) <= parse_amount(high[:-1]):
+            low += high[-1]
+    return (parse_amount(low) if low else -np.inf, parse_amount(high) if high else np.inf)
+
+
+def _split_rows(codes, n_groups):
+    """Sorted row positions of every code (one int32 array per code)"""
+    order = np.argsort(codes, kind='stable').astype(np.int32)
+    bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+    return [order[bounds[i]:bounds[i + 1]] for i in range(n_groups)]
+
+
+def _intersect(rows, postings):
+    """Sorted rows that also appear in any of the sorted postings"""
+    keep = np.zeros(len(rows), dtype=bool)
+    for posting in postings:
+        if len(posting):
+            pos = np.minimum(np.searchsorted(posting, rows), len(posting) - 1)
+            keep |= posting[pos] == rows
+    return rows[keep]
+
+
+class ProductIndex:
+    """
+    Indexes of one product table (see module docstring).
+
+    Attributes:
+        df        - the product table
+        values    - dict facet column -> value names (code = position)
+        codes     - dict facet column -> value code of every row (-1 if missing)
+        postings  - dict facet column -> sorted row positions per code
+        sorted    - dict range column -> (sorted values, their row positions)
+        tokens    - dict name word -> sorted row positions
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.values, self.codes, self.postings = {}, {}, {}
+        for col in FACET_COLUMNS:
+            column = df[col] if col in df.columns else price_bands(df['Price_INR'])
+            codes, values = pd.factorize(column.astype(object), sort=True)
+            self.values[col] = [str(v) for v in values]
+            self.codes[col] = codes
+            self.postings[col] = _split_rows(codes, len(values))
+
+        self.sorted = {}
+        for col in RANGE_COLUMNS:
+            values = df[col].to_numpy(dtype=float)
+            order = np.argsort(values, kind='stable').astype(np.int32)
+            self.sorted[col] = (values[order], order)
+
+        # Names repeat across the catalog: tokenize each distinct name once
+        name_codes, names = pd.factorize(df[TEXT_COLUMN].astype(object))
+        name_rows = _split_rows(name_codes, len(names))
+        by_token = {}
+        for code, name in enumerate(names):
+            for token in set(tokenize(name)):
+                by_token.setdefault(token, []).append(name_rows[code])
+        self.tokens = {token: np.sort(np.concatenate(parts)) for token, parts in by_token.items()}
+
+    def __len__(self):
+        return len(self.df)
+
+    # ------------------------------------------------------------------
+    # Terms
+    # ------------------------------------------------------------------
+
+    def facet_column(self, facet):
+        """Column of a facet name or alias"""
+        col = FACET_ALIASES.get(facet.lower(), facet)
+        if col not in self.postings:
+            raise ValueError(f"Unknown facet {facet!r}; choose from "
+                             f"{', '.join(FACET_COLUMNS)} or {', '.join(FACET_ALIASES)}")
+        return col
+
+    def facet_postings(self, col, values):
+        """Postings of the given values of a facet column (case-insensitive)"""
+        positions = {value.lower(): code for code, value in enumerate(self.values[col])}
+        if col == 'Price_Band':
+            positions.update({alias: positions[label.lower()]
+                              for alias, label in BAND_ALIASES.items()
+                              if label.lower() in positions})
+        values = [values] if isinstance(values, str) else list(values)
+        missing = [v for v in values if v.strip().lower() not in positions]
+        if missing:
+            raise ValueError(f"Unknown {col} value(s): {', '.join(missing)}")
+        codes = dict.fromkeys(positions[v.strip().lower()] for v in values)
+        return [self.postings[col][code] for code in codes]
+
+    def token_postings(self, token):
+        """Postings of a name word; 'word*' matches every word with that prefix"""
+        if token.endswith('*'):
+            prefix = token[:-1]
+            return [rows for word, rows in self.tokens.items() if word.startswith(prefix)]
+        rows = self.tokens.get(token)
+        return [] if rows is None else [rows]
+
+    def range_bounds(self, col, low=-np.inf, high=np.inf):
+        """[start, stop) of a closed value range in the sorted index of col"""
+        values = self.sorted[col][0]
+        return (np.searchsorted(values, low, side='left'),
+                np.searchsorted(values, high, side='right'))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query(self, facets=None, price=None, rating=None, text=None):
+        """
+        Row positions (catalog order) matching every term:
+            facets  {facet: value or [values]} (values of one facet are OR-ed)
+            price   (low, high) on Price_INR, inclusive
+            rating  (low, high) on Customer_Rating, inclusive
+            text    words that must all appear in Product_Name ('word*' = prefix)
+        """
+        terms = []      # (matching rows, kind, payload)
+        for facet, values in (facets or {}).items():
+            postings = self.facet_postings(self.facet_column(facet), values)
+            terms.append((sum(len(p) for p in postings), 'postings', postings))
+        for token in (text.split() if isinstance(text, str) else text or []):
+            words = tokenize(token.rstrip('*'))
+            for i, word in enumerate(words):
+                prefix = token.endswith('*') and i == len(words) - 1
+                postings = self.token_postings(word + '*' if prefix else word)
+                terms.append((sum(len(p) for p in postings), 'postings', postings))
+        for col, bounds in (('Price_INR', price), ('Customer_Rating', rating)):
+            if bounds is not None:
+                start, stop = self.range_bounds(col, *bounds)
+                terms.append((max(stop - start, 0), 'range', (col, start, stop, bounds)))
+
+        if not terms:
+            return np.arange(len(self.df))
+        terms.sort(key=lambda term: term[0])
+        size, kind, payload = terms[0]
+        if kind == 'postings':
+            rows = (payload[0].copy() if len(payload) == 1 else
+                    np.unique(np.concatenate(payload or [np.empty(0, dtype=np.int32)])))
+        else:
+            col, start, stop, _ = payload
+            rows = np.sort(self.sorted[col][1][start:stop])
+
+        for size, kind, payload in terms[1:]:
+            if len(rows) == 0:
+                break
+            if kind == 'postings':
+                rows = _intersect(rows, payload)
+            else:
+                col, _, _, (low, high) = payload
+                values = self.df[col].to_numpy()[rows]
+                rows = rows[(values >= low) & (values <= high)]
+        return rows
+
+    def select(self, rows, columns=None, limit=None):
+        """Product rows at the given positions (the first `limit` of them)"""
+        if limit is not None and limit < 0:
+            raise ValueError(f"limit must not be negative, got {limit}")
+        table = self.df.iloc[rows[:limit]]
+        return table if columns is None else table[columns]
+
+    def facet_counts(self, rows):
+        """{facet column: {value: matching products}} of a result, largest first"""
+        counts = {}
+        for col in FACET_COLUMNS:
+            codes = self.codes[col][rows]
+            n = np.bincount(codes[codes >= 0], minlength=len(self.values[col]))
+            order = np.argsort(-n, kind='stable')
+            counts[col] = {self.values[col][i]: int(n[i]) for i in order if n[i]}
+        return counts
+
+
+def parse_facets(items):
+    """['Color=Indigo,Red', "Fabric=Cotton Voile"] -> {facet: [values]}"""
+    facets = {}
+    for item in items or []:
+        facet, sep, values = item.partition('=')
+        if not sep:
+            raise ValueError(f"Facets look like FACET=VALUE[,VALUE...], got {item!r}")
+        facets.setdefault(facet.strip(), []).extend(
+            v.strip().strip('\'"') for v in values.split(','))
+    return facets
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Faceted product filtering and name search")
+    parser.add_argument('csv_path', nargs='?', default='product_analysis_data.csv')
+    parser.add_argument('--where', action='append', metavar='FACET=VALUE[,VALUE...]',
+                        help=f"facet filter (repeatable; facets: {', '.join(FACET_COLUMNS)} "
+                             f"or {', '.join(FACET_ALIASES)})")
+    parser.add_argument('--price', help="price range, e.g. 1000-2000, 1K-2K, 3K-")
+    parser.add_argument('--rating', help="rating range, e.g. 4.5- or 4-4.5")
+    parser.add_argument('--search', help="words in the product name ('word*' = prefix)")
+    parser.add_argument('--limit', type=int, default=20, help="products shown")
+    parser.add_argument('--counts', action='store_true', help="show facet counts of the result")
+    args = parser.parse_args()
+    if args.limit < 0:
+        parser.error("--limit must not be negative")
+    pd.set_option('display.width', 200)
+
+    from data_loader import load_products
+    start = time.perf_counter()
+    index = ProductIndex(load_products(args.csv_path))
+    built = time.perf_counter() - start
+    try:
+        start = time.perf_counter()
+        rows = index.query(parse_facets(args.where),
+                           parse_range(args.price) if args.price else None,
+                           parse_range(args.rating) if args.rating else None,
+                           args.search)
+        seconds = time.perf_counter() - start
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"✓ Indexed {len(index):,} products in {built:.2f}s")
+    print(f"✓ {len(rows):,} matching products in {seconds * 1000:.2f} ms\n")
+    print(index.select(rows, ['Product_ID', 'Product_Name', 'Main_Category', 'Fabric', 'Price_INR',
+                              'Stock_Status', 'Customer_Rating'], args.limit).to_string(index=False))
+    if args.counts:
+        for col, counts in index.facet_counts(rows).items():
+            print(f"\n{col}: " + ', '.join(f"{v} ({n:,})" for v, n in counts.items()))
@@ -0,0 +1,501 @@
+"""
+THE SHOP INDIA - LOCAL QUERY SERVICE
+====================================
+Long-running asyncio HTTP service (TCP or Unix socket) that loads the
+catalog once and answers the report sections as parameterized queries.
+
+At load time the catalog is indexed once:
+- category and price band codes of every row
+- rows ordered by units sold and by rating (largest first, ties in row
+  order like nlargest) and the out-of-stock bestsellers, split per
+  category, so a leaderboard is a slice (filtered by band if asked)
+- the aggregate tables of the whole catalog, of every category and of
+  every price band it holds (category x band combinations on first use;
+  a filter that selects no products is answered with 404)
+- a ProductIndex (product_index.py) for faceted search: postings per
+  facet value, sorted price / rating indexes and product name words
+
+Answers are cached as encoded JSON in a bounded LRU cache, which is
+cleared whenever the catalog is reloaded.
+
+Queries (GET /<query>?<params>, params optional):
+    summary               category, band
+    category_performance  band
+    top_category          metric (column of category_performance), band
+    best_sellers          category, band, k
+    price_distribution    category
+    stock_analysis        band
+    oos_bestsellers       category, band, limit
+    rating_analysis       band
+    top_rated             category, band, k
+    search                category, sub_category, color, fabric, stock, tier,
+                          band, price, rating, q, limit
+
+band is a Price_Band label or its first word (budget, economy, mid-range,
+premium, luxury). search takes comma-separated values per facet (OR),
+price / rating ranges such as 1K-2K or 4.5- and name words in q ('word*'
+matches a prefix); it answers the match count, the first `limit` products
+and the facet counts of all matches. GET / lists the queries, GET /stats shows the cache,
+POST /reload reloads the CSV.
+
+Usage:
+    python query_service.py product_analysis_data.csv --port 8765
+    curl 'http://127.0.0.1:8765/oos_bestsellers?category=Living'
+    curl 'http://127.0.0.1:8765/price_distribution?category=Women'
+    curl 'http://127.0.0.1:8765/search?fabric=Cotton%20Voile&color=Indigo&stock=In%20Stock&price=1K-2K'
+    python query_service.py --unix /tmp/shop_india.sock
+    curl --unix-socket /tmp/shop_india.sock 'http://localhost/top_category'
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from aggregations import BAND_ALIASES, PRICE_BAND_LABELS, CatalogAggregates, price_bands
+from data_loader import DEFAULT_CSV_PATH, load_products
+from product_index import FACET_ALIASES, ProductIndex, parse_range
+from report import TOP_RATED_COUNT, TOP_SELLERS_PER_CATEGORY, lost_revenue, oos_bestseller_mask
+from report_render import LIST_COLUMNS
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 1024
+MAX_REQUEST_BYTES = 64 * 1024
+SEARCH_LIMIT = 50
+SEARCH_COLUMNS = ['Product_ID', 'Product_Name', 'Main_Category', 'Sub_Category', 'Color',
+                  'Fabric', 'Price_INR', 'Stock_Status', 'Customer_Rating', 'Units_Sold_30_Days']
+
+
+class QueryError(ValueError):
+    """Bad query name or parameter (answered with HTTP 400)"""
+
+
+class NoProductsError(QueryError):
+    """Valid filters that select no products (answered with HTTP 404)"""
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Cached value or None (marks the entry as recently used)"""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {'size': len(self.entries), 'maxsize': self.maxsize,
+                'hits': self.hits, 'misses': self.misses}
+
+
+# ============================================================================
+# CATALOG INDEX
+# ============================================================================
+
+def _descending_order(values):
+    """Row positions by value, largest first, ties in row order"""
+    return np.argsort(-np.asarray(values, dtype=float), kind='stable')
+
+
+def _split_by_code(order, codes, n_groups):
+    """order split into one array per group code (each keeps its order)"""
+    grouped = order[np.argsort(codes[order], kind='stable')]
+    bounds = np.searchsorted(codes[grouped], np.arange(n_groups + 1))
+    return [grouped[bounds[i]:bounds[i + 1]] for i in range(n_groups)]
+
+
+class CatalogIndex:
+    """
+    A loaded catalog and its indexes.
+
+    Attributes:
+        df             - the product table (with Price_Band)
+        categories     - category names, in order of first appearance
+        cat_codes      - category position of every row
+        band_codes     - price band position of every row (-1 if unbanded)
+        by_units       - per category: rows by units sold, largest first
+        by_rating      - per category: rows by rating, highest first
+        rating_order   - all rows by rating, highest first
+        oos_all        - out-of-stock bestseller rows (row order)
+        oos_rows       - the same, per category
+        products       - ProductIndex for faceted search
+    """
+
+    def __init__(self, df):
+        if 'Price_Band' not in df.columns:
+            df = df.assign(Price_Band=price_bands(df['Price_INR']))
+        self.df = df
+        self.loaded_at = time.time()
+
+        cat_codes, categories = pd.factorize(df['Main_Category'].astype(str))
+        self.categories = list(categories)
+        self.cat_codes = cat_codes
+        bands = pd.Categorical(df['Price_Band'].astype(object), categories=PRICE_BAND_LABELS)
+        self.band_codes = np.asarray(bands.codes, dtype=np.int64)
+
+        n_cat = len(self.categories)
+        self.by_units = _split_by_code(_descending_order(df['Units_Sold_30_Days']), cat_codes, n_cat)
+        self.rating_order = _descending_order(df['Customer_Rating'])
+        self.by_rating = _split_by_code(self.rating_order, cat_codes, n_cat)
+        self.oos_all = np.flatnonzero(oos_bestseller_mask(df).to_numpy())
+        self.oos_rows = _split_by_code(self.oos_all, cat_codes, n_cat)
+        self.products = ProductIndex(df)
+
+        agg = CatalogAggregates.from_frame(df)
+        self._aggregates = {(None, None): agg}
+        for category in self.categories:
+            self.aggregates(category=category)
+        # Only bands the catalog has; an empty band answers 404 at query time
+        for band in PRICE_BAND_LABELS:
+            if (agg.partial['Price_Band'] == band).any():
+                self.aggregates(band=band)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def category_code(self, category):
+        try:
+            return self.categories.index(category)
+        except ValueError:
+            raise QueryError(f"Unknown category {category!r}; choose from "
+                             f"{', '.join(self.categories)}") from None
+
+    @staticmethod
+    def band_label(band):
+        if band in PRICE_BAND_LABELS:
+            return band
+        label = BAND_ALIASES.get(band.lower())
+        if label is None:
+            raise QueryError(f"Unknown price band {band!r}; choose from "
+                             f"{', '.join(BAND_ALIASES)}")
+        return label
+
+    def _in_band(self, positions, band):
+        """positions restricted to one price band (order kept)"""
+        if band is None:
+            return positions
+        code = PRICE_BAND_LABELS.index(band)
+        return positions[self.band_codes[positions] == code]
+
+    def aggregates(self, category=None, band=None):
+        """CatalogAggregates of a category and/or price band (memoized)"""
+        key = (category, band)
+        if key not in self._aggregates:
+            if category is not None:
+                self.category_code(category)
+            partial = self._aggregates[(None, None)].partial
+            mask = np.ones(len(partial), dtype=bool)
+            if category is not None:
+                mask &= (partial['Main_Category'] == category).to_numpy()
+            if band is not None:
+                mask &= (partial['Price_Band'] == band).to_numpy()
+            if not mask.any():
+                raise NoProductsError(f"No products in {category or 'any category'} / "
+                                      f"{band or 'any price band'}")
+            self._aggregates[key] = CatalogAggregates(partial[mask])
+        return self._aggregates[key]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def summary(self, category=None, band=None):
+        return self.aggregates(category, band).totals
+
+    def category_performance(self, band=None):
+        return self.aggregates(band=band).category_performance().reset_index()
+
+    def top_category(self, metric='Total_Revenue', band=None):
+        table = self.aggregates(band=band).category_performance()
+        if metric not in table.columns:
+            raise QueryError(f"Unknown metric {metric!r}; choose from {', '.join(table.columns)}")
+        name = table[metric].idxmax()
+        return {'Main_Category': name, 'metric': metric, 'value': table.loc[name, metric]}
+
+    def best_sellers(self, category=None, band=None, k=TOP_SELLERS_PER_CATEGORY):
+        """Top k by units sold per category (one category if given)"""
+        codes = range(len(self.categories)) if category is None else [self.category_code(category)]
+        picks = [self._in_band(self.by_units[c], band)[:k] for c in codes]
+        rows = self.df.iloc[np.concatenate(picks)]
+        rows = rows.assign(Rank=np.concatenate([np.arange(1, len(p) + 1) for p in picks]))
+        return rows[LIST_COLUMNS['best_sellers']]
+
+    def price_distribution(self, category=None):
+        return self.aggregates(category=category).price_distribution().reset_index()
+
+    def stock_analysis(self, band=None):
+        return self.aggregates(band=band).stock_analysis().reset_index()
+
+    def oos_bestsellers(self, category=None, band=None, limit=None):
+        """Out-of-stock bestsellers in catalog order, with the lost revenue estimate"""
+        positions = (self.oos_all if category is None
+                     else self.oos_rows[self.category_code(category)])
+        positions = self._in_band(positions, band)[:limit]
+        rows = self.df.iloc[positions]
+        rows = rows.assign(Estimated_Lost_Revenue=lost_revenue(rows))
+        return rows[LIST_COLUMNS['oos_bestsellers']]
+
+    def rating_analysis(self, band=None):
+        return self.aggregates(band=band).rating_analysis().reset_index()
+
+    def top_rated(self, category=None, band=None, k=TOP_RATED_COUNT):
+        order = (self.rating_order if category is None
+                 else self.by_rating[self.category_code(category)])
+        return self.df.iloc[self._in_band(order, band)[:k]][LIST_COLUMNS['top_rated']]
+
+    def search(self, price=None, rating=None, q=None, limit=SEARCH_LIMIT, **facets):
+        """Products matching every facet, range and name word (see module docstring)"""
+        try:
+            rows = self.products.query(
+                {facet: values.split(',') for facet, values in facets.items()},
+                parse_range(price) if price else None,
+                parse_range(rating) if rating else None, q)
+        except ValueError as e:
+            raise QueryError(str(e)) from None
+        return {
+            'count': len(rows),
+            'products': self.products.select(rows, SEARCH_COLUMNS, limit).to_dict('records'),
+            'facets': self.products.facet_counts(rows),
+        }
+
+
+# Query name -> accepted parameters (and their types)
+QUERIES = {
+    'summary': {'category': str, 'band': str},
+    'category_performance': {'band': str},
+    'top_category': {'metric': str, 'band': str},
+    'best_sellers': {'category': str, 'band': str, 'k': int},
+    'price_distribution': {'category': str},
+    'stock_analysis': {'band': str},
+    'oos_bestsellers': {'category': str, 'band': str, 'limit': int},
+    'rating_analysis': {'band': str},
+    'top_rated': {'category': str, 'band': str, 'k': int},
+    'search': {**{facet: str for facet in FACET_ALIASES},
+               'price': str, 'rating': str, 'q': str, 'limit': int},
+}
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_result(result):
+    """Query result (DataFrame or dict) as UTF-8 JSON"""
+    if isinstance(result, pd.DataFrame):
+        text = result.to_json(orient='records', double_precision=6, force_ascii=False)
+    else:
+        text = json.dumps(result, default=_json_default, ensure_ascii=False)
+    return text.encode('utf-8')
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+class QueryService:
+    """The current CatalogIndex of a CSV plus the result cache"""
+
+    def __init__(self, csv_path=DEFAULT_CSV_PATH, cache_size=DEFAULT_CACHE_SIZE):
+        self.csv_path = csv_path
+        self.cache = LRUCache(cache_size)
+        self.index = None
+        self.load_seconds = None
+
+    def build(self):
+        """A new CatalogIndex of the CSV and its build time (safe off the event loop)"""
+        start = time.perf_counter()
+        index = CatalogIndex(load_products(self.csv_path))
+        return index, time.perf_counter() - start
+
+    def install(self, index, seconds):
+        """Serve a built index and drop every cached answer (on the event loop)"""
+        self.index = index
+        self.cache.clear()
+        self.load_seconds = seconds
+
+    def load(self):
+        """(Re)load the CSV, rebuild the indexes and drop every cached answer"""
+        index, seconds = self.build()
+        self.install(index, seconds)
+        return index
+
+    def query(self, name, params):
+        """
+        JSON answer of a query; params maps parameter names to strings.
+        Raises QueryError for unknown queries or bad parameters.
+        """
+        spec = QUERIES.get(name)
+        if spec is None:
+            raise QueryError(f"Unknown query {name!r}; choose from {', '.join(QUERIES)}")
+        unknown = set(params) - set(spec)
+        if unknown:
+            raise QueryError(f"Unknown parameter(s) for {name}: {', '.join(sorted(unknown))}")
+
+        key = (name, tuple(sorted(params.items())))
+        body = self.cache.get(key)
+        if body is None:
+            kwargs = {}
+            for param, value in params.items():
+                try:
+                    kwargs[param] = spec[param](value)
+                except ValueError:
+                    raise QueryError(f"{param} must be an integer, not {value!r}") from None
+                if spec[param] is int and kwargs[param] < 0:      # k / limit slice the lists
+                    raise QueryError(f"{param} must not be negative, got {kwargs[param]}")
+            if 'band' in kwargs and name != 'search':     # search takes several bands
+                kwargs['band'] = CatalogIndex.band_label(kwargs['band'])
+            body = encode_result(getattr(self.index, name)(**kwargs))
+            self.cache.put(key, body)
+        return body
+
+    def stats(self):
+        return {'csv_path': self.csv_path, 'products': len(self.index.df),
+                'load_seconds': round(self.load_seconds, 3), 'cache': self.cache.stats()}
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               500: 'Internal Server Error'}
+
+
+def _response(status, body, keep_alive=True):
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('ascii') + body
+
+
+def _error(message):
+    return json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+
+
+async def _dispatch(service, method, target):
+    """(status, body) of one request"""
+    url = urlsplit(target)
+    name = url.path.strip('/')
+    if name == 'reload':
+        if method != 'POST':
+            return 405, _error("Use POST /reload")
+        # Build the new index off the event loop; queries keep the old one meanwhile.
+        # Swapping it in and clearing the cache happen back on the loop, so no
+        # answer from the old catalog can be cached after the clear.
+        index, seconds = await asyncio.get_running_loop().run_in_executor(None, service.build)
+        service.install(index, seconds)
+        return 200, encode_result(service.stats())
+    if method != 'GET':
+        return 405, _error(f"{method} not allowed")
+    if name == '':
+        return 200, encode_result({'queries': {q: list(p) for q, p in QUERIES.items()}})
+    if name == 'stats':
+        return 200, encode_result(service.stats())
+    if name not in QUERIES:
+        return 404, _error(f"Unknown query {name!r}; choose from {', '.join(QUERIES)}")
+
+    params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    try:
+        return 200, service.query(name, params)
+    except NoProductsError as e:
+        return 404, _error(str(e))
+    except QueryError as e:
+        return 400, _error(str(e))
+
+
+async def handle_connection(service, reader, writer):
+    """Serve HTTP/1.1 requests on one connection until it closes"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            lines = head.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = lines[0].split(' ', 2)
+            except ValueError:
+                writer.write(_response(400, _error("Malformed request line"), keep_alive=False))
+                break
+            headers = {k.strip().lower(): v.strip()
+                       for k, _, v in (line.partition(':') for line in lines[1:] if line)}
+            length = int(headers.get('content-length') or 0)
+            if length:
+                await reader.readexactly(length)        # request bodies are not used
+
+            try:
+                status, body = await _dispatch(service, method, target)
+            except Exception as e:      # keep serving after a failed query
+                status, body = 500, _error(f"{type(e).__name__}: {e}")
+            keep_alive = (headers.get('connection', '').lower() != 'close' and
+                          version != 'HTTP/1.0')
+            writer.write(_response(status, body, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+    """Run the service until cancelled"""
+    def handler(reader, writer):
+        return handle_connection(service, reader, writer)
+
+    if unix_path:
+        server = await asyncio.start_unix_server(handler, path=unix_path, limit=MAX_REQUEST_BYTES)
+        address = unix_path
+    else:
+        server = await asyncio.start_server(handler, host, port, limit=MAX_REQUEST_BYTES)
+        address = f"http://{host}:{port}"
+    print(f"✓ Serving {len(service.index.df):,} products from {service.csv_path} "
+          f"(loaded in {service.load_seconds:.2f}s) on {address}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve catalog queries from memory")
+    parser.add_argument('csv_path', nargs='?', default=DEFAULT_CSV_PATH)
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', metavar='PATH', help="listen on a Unix socket instead of TCP")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help="cached answers kept (least recently used are evicted)")
+    args = parser.parse_args()
+
+    service = QueryService(args.csv_path, args.cache_size)
+    service.load()
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print("\n✓ Query service stopped")
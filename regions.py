@@ -0,0 +1,324 @@
+"""
+THE SHOP INDIA - MULTI-REGION COMPARISON
+========================================
+Compares regional catalogs (e.g. India vs USA vs Japan) side by side.
+
+Every catalog carries a region tag and a currency: its price column is
+Price_<CURRENCY> (Price_INR, Price_USD, Price_JPY, ...), or Price next to
+a Currency column, and Revenue_30_Days is in the same currency. Prices and revenue are
+normalized to INR through the static FX_TO_INR table, so the report's
+price bands mean the same thing in every region.
+
+The category, price band and stock rollups of all regions come from one
+grouped pass on Region x Currency x Main_Category x Price_Band x
+Stock_Status (the partial aggregate table of aggregations.py with leading
+Region and Currency keys). Catalogs in separate files are grouped on a
+process pool, one file per worker, and their partial tables concatenated.
+
+Usage:
+    python regions.py generate USA,Japan --products 1.5K
+    python regions.py compare India=product_analysis_data.csv USA=catalog_usa.csv \\
+        Japan=catalog_japan.csv
+    python regions.py compare all_regions.csv      # one file with Region (+ Currency) columns
+"""
+
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from aggregations import (GROUP_KEYS, PRICE_BAND_LABELS, CatalogAggregates, parse_size,
+                          partial_aggregates)
+from data_loader import read_products_csv
+
+REPORTING_CURRENCY = 'INR'
+REGION_KEYS = ['Region', 'Currency'] + GROUP_KEYS
+
+# Static FX table: INR per unit of each currency
+FX_TO_INR = {
+    'INR': 1.0,
+    'USD': 83.0,
+    'EUR': 90.0,
+    'GBP': 105.0,
+    'JPY': 0.56,
+    'AED': 22.6,
+    'SGD': 62.0,
+    'AUD': 55.0,
+}
+
+# Home currency of the regions we sell in
+REGION_CURRENCIES = {
+    'India': 'INR',
+    'USA': 'USD',
+    'Japan': 'JPY',
+    'UK': 'GBP',
+    'Germany': 'EUR',
+    'UAE': 'AED',
+    'Singapore': 'SGD',
+    'Australia': 'AUD',
+}
+
+# Relative price level of generated regional catalogs (generate command)
+REGION_PRICE_LEVELS = {'India': 1.0, 'USA': 1.6, 'Japan': 1.3, 'UK': 1.5, 'Germany': 1.4,
+                       'UAE': 1.2, 'Singapore': 1.3, 'Australia': 1.5}
+
+_PRICE_COLUMN = re.compile(r'^Price_([A-Z]{3})$')
+
+
+def price_column(columns):
+    """(price column, currency) of a catalog: its Price_<CURRENCY> column, or (Price, None)"""
+    found = [(col, m.group(1)) for col in columns for m in [_PRICE_COLUMN.match(col)] if m]
+    if not found and 'Price' in columns:
+        return 'Price', None
+    if len(found) != 1:
+        raise ValueError(f"Expected one Price_<CURRENCY> column, found "
+                         f"{', '.join(col for col, _ in found) or 'none'}")
+    return found[0]
+
+
+def fx_rate(currency):
+    """INR per unit of currency"""
+    try:
+        return FX_TO_INR[currency]
+    except KeyError:
+        raise ValueError(f"No FX rate for {currency}; known: {', '.join(FX_TO_INR)}") from None
+
+
+def normalize(df, region=None, currency=None):
+    """
+    Catalog with Region and Currency columns and Price_INR / Revenue_30_Days
+    in INR. The region comes from `region` or a Region column; the currency
+    from `currency`, a Currency column or the price column name, in that
+    order.
+    """
+    col, column_currency = price_column(df.columns)
+    if region is not None:
+        df = df.assign(Region=region)
+    elif 'Region' not in df.columns:
+        raise ValueError("Catalog has no Region column; tag it as REGION=PATH")
+    if currency is not None:
+        df = df.assign(Currency=currency)
+    elif 'Currency' not in df.columns:
+        if column_currency is None:
+            raise ValueError("Catalog has a Price column but no Currency; tag it as PATH:CURRENCY")
+        df = df.assign(Currency=column_currency)
+
+    currencies = df['Currency'].astype(str)
+    rates = currencies.map({c: fx_rate(c) for c in currencies.unique()}).to_numpy(dtype=float)
+    return df.drop(columns=[col]).assign(
+        Region=df['Region'].astype(str),
+        Currency=currencies,
+        Price_INR=df[col].to_numpy(dtype=float) * rates,
+        Revenue_30_Days=df['Revenue_30_Days'].to_numpy(dtype=float) * rates,
+    )
+
+
+def region_partial(df):
+    """Partial aggregate table of normalized catalogs, grouped once by REGION_KEYS"""
+    return partial_aggregates(df, REGION_KEYS)
+
+
+def map_region_file(path, region=None, currency=None):
+    """Read, normalize and aggregate one catalog file (runs on a worker)"""
+    return region_partial(normalize(read_products_csv(path), region, currency))
+
+
+def parse_region_spec(spec):
+    """'USA=catalog_usa.csv:USD' -> (path, 'USA', 'USD'); 'all.csv' -> ('all.csv', None, None)"""
+    region, sep, rest = spec.partition('=')
+    if not sep:
+        region, rest = None, spec
+    path, currency = rest, None
+    match = re.match(r'^(.*):([A-Z]{3})$', rest)
+    if match:
+        path, currency = match.groups()
+    return path, region and region.strip(), currency
+
+
+# ============================================================================
+# COMPARISON
+# ============================================================================
+
+class RegionComparison:
+    """
+    Per-region CatalogAggregates from one partial table keyed by REGION_KEYS,
+    plus side-by-side tables (regions as columns, values in INR).
+
+    Attributes:
+        partial    - the REGION_KEYS partial aggregate table
+        regions    - region names, in input order
+        currencies - dict region -> source currencies
+        by_region  - dict region -> CatalogAggregates
+    """
+
+    def __init__(self, partial, regions=None):
+        self.partial = partial
+        self.regions = list(regions or dict.fromkeys(partial['Region']))
+        self.currencies, self.by_region = {}, {}
+        for region in self.regions:
+            rows = partial[partial['Region'] == region]
+            self.currencies[region] = list(dict.fromkeys(rows['Currency']))
+            self.by_region[region] = CatalogAggregates(
+                rows.drop(columns=['Region', 'Currency']).reset_index(drop=True))
+
+    @classmethod
+    def from_frame(cls, df):
+        """Compare the regions of one normalized catalog"""
+        return cls(region_partial(df))
+
+    @classmethod
+    def from_files(cls, specs, workers=None):
+        """
+        Compare catalog files; specs are (path, region, currency) tuples
+        (region / currency None to read them from the file). Files are
+        aggregated on `workers` processes (default: one per file, up to
+        one per CPU).
+        """
+        paths, regions, currencies = zip(*specs)
+        workers = min(len(paths), os.cpu_count() or 1) if workers is None else workers
+        if workers <= 1:
+            partials = [map_region_file(*spec) for spec in specs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                partials = list(pool.map(map_region_file, paths, regions, currencies))
+        return cls(pd.concat(partials, ignore_index=True))
+
+    @staticmethod
+    def _side_by_side(tables):
+        """{metric: DataFrame rows x regions} -> one table, columns (metric, region)"""
+        return pd.concat(tables, axis=1, names=['Metric', 'Region'])
+
+    def overview(self):
+        """Catalog-wide metrics per region"""
+        rows = {}
+        for region, agg in self.by_region.items():
+            t = agg.totals
+            oos = agg.stock_counts.get('Out of Stock', 0)
+            rows[region] = {
+                'Products': t['products'],
+                'Revenue_INR': t['revenue'],
+                'Units_Sold': t['units'],
+                'Avg_Price_INR': t['avg_price'],
+                'Avg_Order_Value_INR': t['avg_order_value'],
+                'Avg_Rating': t['avg_rating'],
+                'Out_of_Stock_%': oos / t['products'] * 100 if t['products'] else np.nan,
+                'OOS_Bestsellers': t['oos_bestsellers'],
+                'High_Rated_Slow': t['high_rated_slow'],
+            }
+        return pd.DataFrame(rows)
+
+    def category_comparison(self):
+        """Per category and region: revenue share, units, average price and rating"""
+        tables = {}
+        for metric, values in [
+            ('Revenue_Share_%', lambda c: c['Total_Revenue'] / c['Total_Revenue'].sum() * 100),
+            ('Units_Sold', lambda c: c['Total_Units_Sold']),
+            ('Avg_Price_INR', lambda c: c['Avg_Price']),
+            ('Avg_Rating', lambda c: c['Avg_Rating']),
+        ]:
+            tables[metric] = pd.DataFrame({region: values(agg.category)
+                                           for region, agg in self.by_region.items()})
+        return self._side_by_side(tables).round(2)
+
+    def price_band_comparison(self):
+        """Per price band (INR) and region: share of products and of revenue"""
+        products, revenue = {}, {}
+        for region, agg in self.by_region.items():
+            band = agg.price_band
+            products[region] = band['Product_Count'] / band['Product_Count'].sum() * 100
+            revenue[region] = band['Revenue'] / band['Revenue'].sum() * 100
+        table = self._side_by_side({'Products_%': pd.DataFrame(products),
+                                    'Revenue_%': pd.DataFrame(revenue)})
+        return table.reindex(PRICE_BAND_LABELS).round(2)
+
+    def stock_comparison(self):
+        """Out-of-stock share per category and region"""
+        return pd.DataFrame({region: agg.stock_analysis()['Out_of_Stock_%']
+                             for region, agg in self.by_region.items()})
+
+
+# Overview rows printed without decimals
+COUNT_METRICS = {'Products', 'Units_Sold', 'OOS_Bestsellers', 'High_Rated_Slow'}
+
+
+def print_comparison(comparison):
+    pd.set_option('display.width', 250)
+    pd.set_option('display.max_columns', 50)
+    print("=" * 80)
+    print(f"THE SHOP INDIA - REGIONAL COMPARISON ({' vs '.join(comparison.regions)})")
+    print("=" * 80)
+    currencies = dict.fromkeys(c for cs in comparison.currencies.values() for c in cs)
+    rates = [f"1 {c} = ₹{FX_TO_INR[c]:g}" for c in currencies if c != REPORTING_CURRENCY]
+    print(f"\nAmounts in {REPORTING_CURRENCY}" +
+          (f" at static rates: {', '.join(rates)}" if rates else ""))
+
+    overview = comparison.overview()
+    overview = overview.apply(lambda row: row.map(
+        ('{:,.0f}' if row.name in COUNT_METRICS else '{:,.2f}').format), axis=1)
+    print("\n1. OVERVIEW")
+    print("-" * 80)
+    print(overview.to_string())
+
+    for title, table in [('2. CATEGORIES', comparison.category_comparison()),
+                         ('3. PRICE BANDS (INR)', comparison.price_band_comparison()),
+                         ('4. OUT OF STOCK %', comparison.stock_comparison().round(2))]:
+        print(f"\n{title}")
+        print("-" * 80)
+        print(table.to_string(float_format='{:,.2f}'.format, na_rep='-'))
+
+
+# ============================================================================
+# REGIONAL TEST CATALOGS
+# ============================================================================
+
+def generate_regional_catalog(region, n_products=None, seed=42):
+    """A generated catalog priced in the region's currency at its price level"""
+    from shop_india_analysis import generate_shop_india_data
+
+    currency = REGION_CURRENCIES.get(region)
+    if currency is None:
+        raise ValueError(f"Unknown region {region!r}; choose from {', '.join(REGION_CURRENCIES)}")
+    df = generate_shop_india_data(n_products, batched=True, seed=seed)
+    decimals = 0 if currency == 'JPY' else 2
+    local = (df['Price_INR'] * REGION_PRICE_LEVELS[region] / fx_rate(currency)).round(decimals)
+    df = df.assign(Revenue_30_Days=(local * df['Units_Sold_30_Days']).round(decimals))
+    # Replace the source column first: for INR regions the new column is Price_INR too
+    position = df.columns.get_loc('Price_INR')
+    df = df.drop(columns='Price_INR')
+    df.insert(position, f'Price_{currency}', local)
+    return df
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare regional catalogs side by side")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help="write generated regional test catalogs")
+    generate.add_argument('regions', help="comma-separated regions, e.g. USA,Japan")
+    generate.add_argument('--products', help="catalog size (e.g. 1.5K, 1M; default 1,520)")
+    generate.add_argument('--output-dir', default='.')
+
+    compare = commands.add_parser('compare', help="compare regional catalogs")
+    compare.add_argument('catalogs', nargs='+', metavar='[REGION=]PATH[:CURRENCY]',
+                         help="catalog files; untagged files need a Region column")
+    compare.add_argument('--workers', type=int, default=None,
+                         help="processes (default: one per file, up to one per CPU)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'generate':
+            n = parse_size(args.products) if args.products else None
+            for i, region in enumerate(r.strip() for r in args.regions.split(',')):
+                path = os.path.join(args.output_dir, f'catalog_{region.lower()}.csv')
+                generate_regional_catalog(region, n, seed=42 + i + 1).to_csv(path, index=False)
+                print(f"✓ {region} catalog ({REGION_CURRENCIES[region]}) saved to: {path}")
+        else:
+            print_comparison(RegionComparison.from_files(
+                [parse_region_spec(spec) for spec in args.catalogs], args.workers))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
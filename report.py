@@ -0,0 +1,338 @@
+"""
+THE SHOP INDIA - ANALYSIS REPORT
+================================
+Prints the analysis report sections.
+
+The sections read their tables from a CatalogAggregates object and their
+product lists (best sellers, out-of-stock bestsellers, top rated) from
+small pre-selected frames, so the same report can be printed from a full
+catalog or from stored incremental state.
+"""
+
+import numpy as np
+import pandas as pd
+
+from aggregations import top_k_per_group
+from instrumentation import track
+
+TOP_SELLERS_PER_CATEGORY = 3
+TOP_RATED_COUNT = 10
+OOS_BESTSELLERS_SHOWN = 5
+
+
+def oos_bestseller_mask(df):
+    """Out-of-stock bestsellers (CRITICAL)"""
+    return (df['Stock_Status'] == 'Out of Stock') & (df['Performance_Tier'] == 'Bestseller')
+
+
+def report_inputs(df, top_sellers=TOP_SELLERS_PER_CATEGORY, top_rated=TOP_RATED_COUNT):
+    """
+    Row-level inputs of the report for a full product table: dataset shape,
+    describe() statistics and the product lists printed by sections 3, 5, 6.
+    top_sellers (per category) and top_rated set the leaderboard sizes.
+    """
+    return {
+        'shape': df.shape,
+        'price_stats': df['Price_INR'].describe(),
+        'units_stats': df['Units_Sold_30_Days'].describe(),
+        'top_sellers': top_k_per_group(df, 'Main_Category', 'Units_Sold_30_Days',
+                                       k=top_sellers),
+        'oos_bestsellers': df[oos_bestseller_mask(df)],
+        'top_rated': df.nlargest(top_rated, 'Customer_Rating'),
+    }
+
+
+# ============================================================================
+# BULK TEXT FORMATTING
+# ============================================================================
+# Product lists are formatted whole columns at a time (object-array string
+# concatenation) instead of one print() per field per row.
+
+def text_column(values):
+    """Column as an object array of str (same text as str(value) per row)"""
+    return np.asarray(pd.Series(values).astype(str), dtype=object)
+
+
+def format_thousands(values):
+    """f'{v:,.0f}' for every value of a numeric column"""
+    values = np.rint(np.asarray(values, dtype=float))
+    nan = np.isnan(values)
+    rest = np.abs(np.where(nan, 0, values)).astype(np.int64)
+
+    text = None
+    active = np.ones(len(rest), dtype=bool)
+    while active.any():
+        group = (rest % 1000).astype(str)
+        rest = rest // 1000
+        group = np.where(rest > 0, np.char.zfill(group, 3), group).astype(object)
+        text = group if text is None else np.where(active, group + ',' + text, text)
+        active = rest > 0
+    if text is None:
+        return np.array([], dtype=object)
+    text = np.where(np.signbit(values), '-' + text, text)
+    return np.where(nan, 'nan', text).astype(object)
+
+
+def format_best_sellers(top_sellers):
+    """Section 3 product blocks, grouped by category in order of appearance"""
+    if len(top_sellers) == 0:
+        return ''
+    categories = top_sellers['Main_Category'].astype(str)
+    codes, _ = pd.factorize(categories)
+    rows = top_sellers.iloc[np.argsort(codes, kind='stable')]
+    categories = text_column(rows['Main_Category'])
+    first = np.r_[True, categories[1:] != categories[:-1]]
+
+    k = int(rows['Rank'].max()) if 'Rank' in rows.columns else TOP_SELLERS_PER_CATEGORY
+    rule = '-' * 80
+    header = np.where(first, '\n📈 ' + text_column(rows['Main_Category'].astype(str).str.upper()) +
+                      f' - Top {k} Best Sellers:\n{rule}\n', '').astype(object)
+    blocks = (header + '\n' + text_column(rows['Product_ID']) + ': ' +
+              text_column(rows['Product_Name']) +
+              '\n  • Sub-Category: ' + text_column(rows['Sub_Category']) +
+              '\n  • Price: ₹' + format_thousands(rows['Price_INR']) +
+              '\n  • Units Sold (30 days): ' + text_column(rows['Units_Sold_30_Days']) +
+              '\n  • Revenue (30 days): ₹' + format_thousands(rows['Revenue_30_Days']) +
+              '\n  • Rating: ' + text_column(rows['Customer_Rating']) + '/5.0 (' +
+              text_column(rows['Num_Reviews']) + ' reviews)' +
+              '\n  • Stock: ' + text_column(rows['Stock_Status']) + '\n')
+    return ''.join(blocks)
+
+
+def lost_revenue(rows):
+    """Estimated monthly revenue lost while out of stock (price x units)"""
+    return rows['Price_INR'].to_numpy(dtype=float) * rows['Units_Sold_30_Days'].to_numpy(dtype=float)
+
+
+def format_oos_bestsellers(rows):
+    """Section 5 list of out-of-stock bestsellers"""
+    if len(rows) == 0:
+        return ''
+    blocks = ('\n• ' + text_column(rows['Product_ID']) + ': ' + text_column(rows['Product_Name']) +
+              '\n  Category: ' + text_column(rows['Main_Category']) + ' > ' +
+              text_column(rows['Sub_Category']) +
+              '\n  Estimated Lost Revenue (if in stock): ₹' +
+              format_thousands(lost_revenue(rows)) + '/month\n')
+    return ''.join(blocks)
+
+
+def format_top_rated(rows):
+    """Section 6 list of the highest rated products"""
+    if len(rows) == 0:
+        return ''
+    blocks = ('• ' + text_column(rows['Product_Name']) + ' (' + text_column(rows['Main_Category']) +
+              ')\n  Rating: ' + text_column(rows['Customer_Rating']) + '/5.0 (' +
+              text_column(rows['Num_Reviews']) + ' reviews) | Price: ₹' +
+              format_thousands(rows['Price_INR']) + '\n')
+    return ''.join(blocks)
+
+
+# ============================================================================
+# EXPLORATORY DATA ANALYSIS
+# ============================================================================
+
+def print_dataset_overview(agg, inputs):
+    print("\n" + "=" * 80)
+    print("SECTION 1: DATASET OVERVIEW")
+    print("=" * 80 + "\n")
+
+    print("Dataset Shape:", inputs['shape'])
+    print(f"Total Products: {agg.totals['products']}")
+    print(f"Categories: {agg.totals['categories']}")
+    print(f"Date Range: {agg.totals['date_min']} to {agg.totals['date_max']}")
+    print()
+
+    print("Price Statistics (INR):")
+    print(inputs['price_stats'])
+    print()
+
+    print("Sales Performance (Last 30 Days):")
+    print(inputs['units_stats'])
+    print()
+
+
+# ============================================================================
+# ANALYSIS 1: CATEGORY PERFORMANCE
+# ============================================================================
+
+def print_category_performance(agg):
+    print("\n" + "=" * 80)
+    print("SECTION 2: CATEGORY PERFORMANCE ANALYSIS")
+    print("=" * 80 + "\n")
+
+    category_analysis = agg.category_performance()
+
+    print("Category Performance (Last 30 Days):")
+    print(category_analysis.to_string())
+    print()
+
+    # Calculate category insights
+    total_revenue = category_analysis['Total_Revenue'].sum()
+    category_analysis['Revenue_Share_%'] = (category_analysis['Total_Revenue'] / total_revenue * 100).round(2)
+
+    print("\nKey Insights:")
+    print(f"• Top Revenue Category: {category_analysis.index[0]} "
+          f"(₹{category_analysis['Total_Revenue'].iloc[0]:,.0f} - "
+          f"{category_analysis['Revenue_Share_%'].iloc[0]:.1f}% of total)")
+    print(f"• Highest Rated Category: {category_analysis['Avg_Rating'].idxmax()} "
+          f"({category_analysis['Avg_Rating'].max():.2f}/5.0)")
+    print(f"• Premium Category (Highest Avg Price): {category_analysis['Avg_Price'].idxmax()} "
+          f"(₹{category_analysis['Avg_Price'].max():,.0f})")
+
+
+# ============================================================================
+# ANALYSIS 2: BEST SELLING PRODUCTS
+# ============================================================================
+
+def print_best_sellers(top_sellers):
+    print("\n" + "=" * 80)
+    print("SECTION 3: BEST-SELLING PRODUCTS BY CATEGORY")
+    print("=" * 80 + "\n")
+
+    # Top products per category
+    print(format_best_sellers(top_sellers), end='')
+
+
+# ============================================================================
+# ANALYSIS 3: PRICE DISTRIBUTION
+# ============================================================================
+
+def print_price_distribution(agg):
+    print("\n\n" + "=" * 80)
+    print("SECTION 4: PRICE DISTRIBUTION ANALYSIS")
+    print("=" * 80 + "\n")
+
+    price_distribution = agg.price_distribution()
+
+    print("Price Band Performance:")
+    print(price_distribution.to_string())
+    print()
+
+    print("Key Insights:")
+    best_volume_band = price_distribution['Units_Sold'].idxmax()
+    best_revenue_band = price_distribution['Revenue'].idxmax()
+    print(f"• Highest Volume: {best_volume_band} ({price_distribution.loc[best_volume_band, 'Units_Sold']} units)")
+    print(f"• Highest Revenue: {best_revenue_band} (₹{price_distribution.loc[best_revenue_band, 'Revenue']:,.0f})")
+
+
+# ============================================================================
+# ANALYSIS 4: STOCK & AVAILABILITY
+# ============================================================================
+
+def print_stock_analysis(agg, oos_bestsellers):
+    print("\n\n" + "=" * 80)
+    print("SECTION 5: INVENTORY & STOCK ANALYSIS")
+    print("=" * 80 + "\n")
+
+    stock_analysis = agg.stock_analysis()
+
+    print("Stock Status by Category:")
+    print(stock_analysis.to_string())
+    print()
+
+    if agg.totals['oos_bestsellers'] > 0:
+        print(f"\n⚠️  CRITICAL: {agg.totals['oos_bestsellers']} Best-Selling Products Out of Stock!")
+        print("These represent lost revenue opportunities:")
+        print("-" * 80)
+
+        print(format_oos_bestsellers(oos_bestsellers.head(OOS_BESTSELLERS_SHOWN)), end='')
+
+
+# ============================================================================
+# ANALYSIS 5: CUSTOMER RATINGS & REVIEWS
+# ============================================================================
+
+def print_customer_satisfaction(agg, top_rated):
+    print("\n\n" + "=" * 80)
+    print("SECTION 6: CUSTOMER SATISFACTION ANALYSIS")
+    print("=" * 80 + "\n")
+
+    rating_analysis = agg.rating_analysis()
+
+    print("Customer Ratings by Category:")
+    print(rating_analysis.to_string())
+    print()
+
+    # Top rated products
+    print(f"\nTop {len(top_rated)} Highest Rated Products:")
+    print("-" * 80)
+    print(format_top_rated(top_rated), end='')
+
+
+# ============================================================================
+# EXECUTIVE SUMMARY
+# ============================================================================
+
+def print_executive_summary(agg):
+    category_analysis = agg.category_performance()
+    rating_analysis = agg.rating_analysis()
+    price_distribution = agg.price_distribution()
+
+    print("\n\n" + "=" * 80)
+    print("EXECUTIVE SUMMARY & RECOMMENDATIONS")
+    print("=" * 80 + "\n")
+
+    print("📊 KEY METRICS:")
+    print(f"• Total Products Analyzed: {agg.totals['products']}")
+    print(f"• Total Revenue (30 days): ₹{agg.totals['revenue']:,.0f}")
+    print(f"• Total Units Sold (30 days): {agg.totals['units']:,}")
+    print(f"• Average Order Value: ₹{agg.totals['avg_order_value']:,.0f}")
+    print(f"• Overall Customer Rating: {agg.totals['avg_rating']:.2f}/5.0")
+    print()
+
+    print("🏆 TOP PERFORMERS:")
+    print(f"• Best Revenue Category: {category_analysis.index[0]}")
+    print(f"• Best Rated Category: {category_analysis['Avg_Rating'].idxmax()}")
+    print(f"• Most Reviewed Category: {rating_analysis['Total_Reviews'].idxmax()}")
+    print()
+
+    print("💡 STRATEGIC RECOMMENDATIONS:")
+    print()
+    print("1. INVENTORY OPTIMIZATION:")
+    print(f"   • Restock {agg.totals['oos_bestsellers']} out-of-stock bestsellers immediately")
+    print(f"   • Focus on {category_analysis.index[0]} category (highest revenue)")
+    print()
+
+    print("2. PRICING STRATEGY:")
+    print(f"   • {price_distribution['Revenue'].idxmax()} generates highest revenue")
+    print(f"   • Consider expanding product range in this price segment")
+    print()
+
+    print("3. CATEGORY EXPANSION:")
+    lowest_revenue_cat = category_analysis.index[-1]
+    print(f"   • {lowest_revenue_cat} has growth potential (currently {category_analysis.loc[lowest_revenue_cat, 'Product_Count']:.0f} products)")
+    print(f"   • Consider adding premium/bestselling items to underperforming categories")
+    print()
+
+    print("4. CUSTOMER SATISFACTION:")
+    print(f"   • {agg.totals['high_rated_slow']} highly-rated products have low sales")
+    print(f"   • Opportunity for better marketing/promotion")
+    print()
+
+    print("5. QUICK WINS:")
+    print(f"   • Promote bestsellers in {category_analysis.index[0]} category")
+    print(f"   • Bundle high-rated slow-movers with bestsellers")
+    print(f"   • Run targeted campaigns for price-sensitive customer segment")
+
+    print("\n" + "=" * 80)
+    print("Analysis Complete!")
+    print("=" * 80)
+
+
+# Report sections in print order: name -> fn(agg, inputs)
+REPORT_SECTIONS = {
+    'dataset_overview': lambda agg, inputs: print_dataset_overview(agg, inputs),
+    'category_performance': lambda agg, inputs: print_category_performance(agg),
+    'best_sellers': lambda agg, inputs: print_best_sellers(inputs['top_sellers']),
+    'price_distribution': lambda agg, inputs: print_price_distribution(agg),
+    'stock_analysis': lambda agg, inputs: print_stock_analysis(agg, inputs['oos_bestsellers']),
+    'customer_satisfaction': lambda agg, inputs: print_customer_satisfaction(agg, inputs['top_rated']),
+    'executive_summary': lambda agg, inputs: print_executive_summary(agg),
+}
+
+
+def print_report(agg, inputs, instrument=None):
+    """Print every report section (each measured when an Instrumentation is given)"""
+    for name, section in REPORT_SECTIONS.items():
+        with track(instrument, name, rows=agg.totals['products']):
+            section(agg, inputs)
@@ -0,0 +1,249 @@
+"""
+THE SHOP INDIA - REPORT RENDERER
+================================
+Writes the analysis report in a machine-readable or presentation format:
+
+    text      the printed report (same layout as analysis_output.txt)
+    json      metrics, the aggregate tables and the full product lists
+    markdown  headings and pipe tables
+    html      a standalone page with one table per section
+
+Tables are rendered whole columns at a time and written to a buffered
+stream section by section, so leaderboards with thousands of entries do
+not cost one Python call per row.
+
+Usage:
+    python report_render.py product_analysis_data.csv --format json --output report.json
+    python report_render.py --output report.md --top-sellers 100 --top-rated 5000
+"""
+
+import argparse
+import contextlib
+import html
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from aggregations import CatalogAggregates
+from data_loader import load_products
+from report import (TOP_RATED_COUNT, TOP_SELLERS_PER_CATEGORY, format_thousands, lost_revenue,
+                    print_report, report_inputs, text_column)
+
+FORMATS = ('text', 'json', 'markdown', 'html')
+FORMAT_NAMES = {'text': 'Text', 'json': 'JSON', 'markdown': 'Markdown', 'html': 'HTML'}
+FORMAT_EXTENSIONS = {'.txt': 'text', '.json': 'json', '.md': 'markdown', '.html': 'html'}
+BUFFER_SIZE = 1 << 20
+
+# Columns of the product lists in the structured formats
+LIST_COLUMNS = {
+    'best_sellers': ['Main_Category', 'Rank', 'Product_ID', 'Product_Name', 'Sub_Category',
+                     'Price_INR', 'Units_Sold_30_Days', 'Revenue_30_Days', 'Customer_Rating',
+                     'Num_Reviews', 'Stock_Status'],
+    'oos_bestsellers': ['Product_ID', 'Product_Name', 'Main_Category', 'Sub_Category',
+                        'Price_INR', 'Units_Sold_30_Days', 'Estimated_Lost_Revenue'],
+    'top_rated': ['Product_Name', 'Main_Category', 'Customer_Rating', 'Num_Reviews', 'Price_INR'],
+}
+
+# Money columns shown as whole rupees with thousands separators
+MONEY_COLUMNS = {'Price_INR', 'Revenue_30_Days', 'Estimated_Lost_Revenue', 'Total_Revenue',
+                 'Avg_Price', 'Revenue', 'Avg_Revenue_Per_Product'}
+
+TITLES = {
+    'category_performance': 'Category Performance (Last 30 Days)',
+    'best_sellers': 'Best-Selling Products by Category',
+    'price_distribution': 'Price Band Performance',
+    'stock_analysis': 'Stock Status by Category',
+    'oos_bestsellers': 'Out-of-Stock Bestsellers',
+    'rating_analysis': 'Customer Ratings by Category',
+    'top_rated': 'Highest Rated Products',
+}
+
+
+def detect_format(path):
+    """Report format implied by a file extension (text if unknown)"""
+    return FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower(), 'text')
+
+
+def report_tables(agg, inputs):
+    """Every report table as a flat DataFrame, in report order"""
+    oos = inputs['oos_bestsellers'].assign(
+        Estimated_Lost_Revenue=lost_revenue(inputs['oos_bestsellers']))
+    lists = {
+        'best_sellers': inputs['top_sellers'],
+        'oos_bestsellers': oos,
+        'top_rated': inputs['top_rated'],
+    }
+    lists = {name: rows[[c for c in LIST_COLUMNS[name] if c in rows.columns]]
+             for name, rows in lists.items()}
+
+    return {
+        'category_performance': agg.category_performance().reset_index(),
+        'best_sellers': lists['best_sellers'],
+        'price_distribution': agg.price_distribution().reset_index(),
+        'stock_analysis': agg.stock_analysis().reset_index(),
+        'oos_bestsellers': lists['oos_bestsellers'],
+        'rating_analysis': agg.rating_analysis().reset_index(),
+        'top_rated': lists['top_rated'],
+    }
+
+
+def _metrics(agg):
+    """Catalog-wide totals as plain JSON values"""
+    return {key: (value.item() if isinstance(value, np.generic) else value)
+            for key, value in agg.totals.items()}
+
+
+def _display_columns(df):
+    """Table cells as object arrays of display text, one per column"""
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if col in MONEY_COLUMNS:
+            columns[col] = '₹' + format_thousands(values)
+        elif pd.api.types.is_float_dtype(values):
+            columns[col] = text_column(values.round(2))
+        else:
+            columns[col] = text_column(values)
+    return columns
+
+
+# ============================================================================
+# RENDERERS
+# ============================================================================
+
+def render_text(agg, inputs, out):
+    """The printed report, written to out"""
+    with contextlib.redirect_stdout(out):
+        print_report(agg, inputs)
+
+
+def render_json(agg, inputs, out):
+    """One JSON document; tables are written as record lists by pandas"""
+    out.write('{\n"metrics": ')
+    out.write(json.dumps(_metrics(agg), indent=2))
+    for name, table in report_tables(agg, inputs).items():
+        out.write(f',\n"{name}": ')
+        out.write(table.to_json(orient='records', double_precision=6, force_ascii=False))
+    out.write('\n}\n')
+
+
+def escape_markdown(cells):
+    """Escape pipes in a whole column of table cells"""
+    cells = np.asarray(cells, dtype=object).astype(str)
+    return np.char.replace(cells, '|', '\\|').astype(object)
+
+
+def markdown_table(df):
+    """Pipe table built from whole columns"""
+    columns = _display_columns(df)
+    header = '| ' + ' | '.join(str(c) for c in df.columns) + ' |\n'
+    rule = '|' + '|'.join('---' for _ in df.columns) + '|\n'
+    if len(df) == 0:
+        return header + rule
+    rows = '| ' + escape_markdown(columns[df.columns[0]])
+    for col in df.columns[1:]:
+        rows = rows + ' | ' + escape_markdown(columns[col])
+    return header + rule + ''.join(rows + ' |\n')
+
+
+def render_markdown(agg, inputs, out):
+    """Headings, key metrics and one pipe table per section"""
+    t = agg.totals
+    out.write("# The Shop India - Product Analysis\n\n")
+    out.write(f"- **Total Products:** {t['products']:,}\n")
+    out.write(f"- **Categories:** {t['categories']}\n")
+    out.write(f"- **Total Revenue (30 days):** ₹{t['revenue']:,.0f}\n")
+    out.write(f"- **Total Units Sold (30 days):** {t['units']:,}\n")
+    out.write(f"- **Average Order Value:** ₹{t['avg_order_value']:,.0f}\n")
+    out.write(f"- **Overall Customer Rating:** {t['avg_rating']:.2f}/5.0\n")
+    out.write(f"- **Out-of-Stock Bestsellers:** {t['oos_bestsellers']}\n")
+    for name, table in report_tables(agg, inputs).items():
+        out.write(f"\n## {TITLES[name]}\n\n")
+        out.write(markdown_table(table))
+
+
+def escape_html(cells):
+    """html.escape() applied to a whole column of cells"""
+    cells = np.asarray(cells, dtype=object).astype(str)
+    for char, entity in [('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;'), ('"', '&quot;'),
+                         ("'", '&#x27;')]:
+        cells = np.char.replace(cells, char, entity)
+    return cells.astype(object)
+
+
+def html_table(df):
+    """<table> built from whole columns"""
+    columns = _display_columns(df)
+    head = ''.join(f'<th>{html.escape(str(c))}</th>' for c in df.columns)
+    if len(df) == 0:
+        return f'<table>\n<thead><tr>{head}</tr></thead>\n<tbody></tbody>\n</table>\n'
+    rows = '<tr><td>' + escape_html(columns[df.columns[0]])
+    for col in df.columns[1:]:
+        rows = rows + '</td><td>' + escape_html(columns[col])
+    return (f'<table>\n<thead><tr>{head}</tr></thead>\n<tbody>\n' +
+            ''.join(rows + '</td></tr>\n') + '</tbody>\n</table>\n')
+
+
+def render_html(agg, inputs, out):
+    """Standalone HTML page with the key metrics and one table per section"""
+    t = agg.totals
+    out.write('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+              '<title>The Shop India - Product Analysis</title>\n'
+              '<style>table{border-collapse:collapse;margin-bottom:24px}'
+              'th,td{border:1px solid #ccc;padding:4px 8px;text-align:left}</style>\n'
+              '</head>\n<body>\n<h1>The Shop India - Product Analysis</h1>\n<ul>\n')
+    out.write(f"<li>Total Products: {t['products']:,}</li>\n")
+    out.write(f"<li>Total Revenue (30 days): ₹{t['revenue']:,.0f}</li>\n")
+    out.write(f"<li>Total Units Sold (30 days): {t['units']:,}</li>\n")
+    out.write(f"<li>Overall Customer Rating: {t['avg_rating']:.2f}/5.0</li>\n")
+    out.write(f"<li>Out-of-Stock Bestsellers: {t['oos_bestsellers']}</li>\n</ul>\n")
+    for name, table in report_tables(agg, inputs).items():
+        out.write(f'<h2>{html.escape(TITLES[name])}</h2>\n')
+        out.write(html_table(table))
+    out.write('</body>\n</html>\n')
+
+
+RENDERERS = {'text': render_text, 'json': render_json, 'markdown': render_markdown,
+             'html': render_html}
+
+
+def render_report(agg, inputs, fmt='text', out=None):
+    """Write the report in `fmt` to the stream out (default: stdout)"""
+    if fmt not in RENDERERS:
+        raise ValueError(f"Unknown report format {fmt!r}; choose from {', '.join(FORMATS)}")
+    RENDERERS[fmt](agg, inputs, sys.stdout if out is None else out)
+
+
+def write_report(agg, inputs, path, fmt=None):
+    """Write the report to path (format from the extension unless given)"""
+    fmt = fmt or detect_format(path)
+    with open(path, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as out:
+        render_report(agg, inputs, fmt, out)
+    return fmt
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Render the analysis report of a product CSV")
+    parser.add_argument('csv_path', nargs='?', default='product_analysis_data.csv')
+    parser.add_argument('--format', choices=FORMATS,
+                        help="report format (default: from the --output extension, else text)")
+    parser.add_argument('--output', help="report file (default: stdout)")
+    parser.add_argument('--top-sellers', type=int, default=TOP_SELLERS_PER_CATEGORY,
+                        help="best sellers per category")
+    parser.add_argument('--top-rated', type=int, default=TOP_RATED_COUNT,
+                        help="entries in the top-rated list")
+    args = parser.parse_args()
+
+    df = load_products(args.csv_path)
+    agg = CatalogAggregates.from_frame(df)
+    inputs = report_inputs(df, args.top_sellers, args.top_rated)
+    del df
+
+    if args.output:
+        fmt = write_report(agg, inputs, args.output, args.format)
+        print(f"✓ {FORMAT_NAMES[fmt]} report saved to: {args.output}")
+    else:
+        render_report(agg, inputs, args.format or 'text')
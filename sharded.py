@@ -0,0 +1,248 @@
+"""
+THE SHOP INDIA - SHARDED (MAP-REDUCE) ANALYSIS
+==============================================
+Runs the analysis over a directory of catalog partitions on a process pool.
+
+Map: every partition file is reduced on its own worker to
+- the partial aggregate table (category / price band / stock sums, counts,
+  rating min/max/sum, which also give the stock crosstab)
+- exact value counts of Price_INR and Units_Sold_30_Days (for describe())
+- local top-K candidates: best sellers per category, top rated, and the
+  out-of-stock bestsellers
+- the first row of each category (for the report's category order)
+
+Reduce: the pieces are merged into a CatalogAggregates and the report
+inputs. The partitions, read in file-name order, stand for one catalog;
+row order (which breaks ties exactly as nlargest does) is the partition
+index followed by the row within the partition, so the merged report is
+the one the single-frame path prints for the concatenated catalog.
+
+Usage:
+    python sharded.py partition product_analysis_data.csv catalog_parts/ --by category
+    python sharded.py run catalog_parts/ --workers 8
+    python sharded.py run catalog_parts/ --verify
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from aggregations import CatalogAggregates, partial_aggregates, top_k_per_group
+from data_loader import read_products_csv
+from report import (TOP_RATED_COUNT, TOP_SELLERS_PER_CATEGORY, oos_bestseller_mask, print_report,
+                    report_inputs)
+
+PARTITION_PATTERN = '*.csv'
+DEFAULT_PARTITION_ROWS = 250_000
+STAT_COLUMNS = {'price_stats': 'Price_INR', 'units_stats': 'Units_Sold_30_Days'}
+
+
+# ============================================================================
+# PARTITIONING
+# ============================================================================
+
+def write_partitions(df, output_dir, by='category', rows_per_partition=DEFAULT_PARTITION_ROWS):
+    """
+    Split a product table into CSV partitions, per Main_Category or per
+    Product_ID range (consecutive rows_per_partition rows). Returns the
+    paths in the order that reproduces the table's row order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if by == 'category':
+        groups = df.groupby('Main_Category', sort=False, observed=True)
+        parts = [(f'part-{i:05d}-{name}.csv', rows) for i, (name, rows) in enumerate(groups)]
+    elif by == 'id_range':
+        parts = [(f'part-{i // rows_per_partition:05d}.csv', df.iloc[i:i + rows_per_partition])
+                 for i in range(0, len(df), rows_per_partition)]
+    else:
+        raise ValueError(f"Unknown partitioning {by!r} (category or id_range)")
+
+    paths = []
+    for file_name, rows in parts:
+        path = os.path.join(output_dir, file_name.replace(' ', '_').replace('/', '_'))
+        rows.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def partition_paths(partition_dir):
+    """Partition files of a directory, in catalog order (file name order)"""
+    paths = sorted(glob.glob(os.path.join(partition_dir, PARTITION_PATTERN)))
+    if not paths:
+        raise ValueError(f"No {PARTITION_PATTERN} partitions in {partition_dir}")
+    return paths
+
+
+# ============================================================================
+# MAP
+# ============================================================================
+
+def map_partition(path, top_sellers=TOP_SELLERS_PER_CATEGORY, top_rated=TOP_RATED_COUNT):
+    """Partial results of one partition (runs on a worker process)"""
+    df = read_products_csv(path)
+    df['Local_Row'] = np.arange(len(df), dtype=np.int64)
+
+    first_rows = df.groupby('Main_Category', sort=False, observed=True)['Local_Row'].min()
+    return {
+        'path': path,
+        'rows': len(df),
+        'columns': len(df.columns) - 1,
+        'partial': partial_aggregates(df),
+        'value_counts': {col: np.unique(df[col].to_numpy(dtype=float), return_counts=True)
+                         for col in STAT_COLUMNS.values()},
+        'first_rows': {str(cat): int(row) for cat, row in first_rows.items()},
+        'top_sellers': top_k_per_group(df, 'Main_Category', 'Units_Sold_30_Days',
+                                       k=top_sellers).drop(columns='Rank'),
+        'top_rated': df.nlargest(top_rated, 'Customer_Rating'),
+        'oos_bestsellers': df[oos_bestseller_mask(df)],
+    }
+
+
+# ============================================================================
+# REDUCE
+# ============================================================================
+
+def _merge_value_counts(parts):
+    """Merge (values, counts) pairs into one sorted (values, counts)"""
+    values = np.concatenate([v for v, _ in parts])
+    counts = np.concatenate([c for _, c in parts])
+    unique, inverse = np.unique(values, return_inverse=True)
+    return unique, np.bincount(inverse, weights=counts, minlength=len(unique)).astype(np.int64)
+
+
+def describe_from_counts(values, counts, name=None):
+    """Series.describe() of a column given its exact value counts"""
+    n = int(counts.sum())
+    if n == 0:
+        return pd.Series({'count': 0.0, 'mean': np.nan, 'std': np.nan, 'min': np.nan,
+                          '25%': np.nan, '50%': np.nan, '75%': np.nan, 'max': np.nan}, name=name)
+    mean = float((values * counts).sum()) / n
+    std = np.sqrt(float((counts * (values - mean) ** 2).sum()) / (n - 1)) if n > 1 else np.nan
+    ends = np.cumsum(counts)                    # rank just past each distinct value
+
+    def quantile(q):
+        # Linear interpolation between the ranks around q * (n - 1). The lerp is
+        # numpy's two-sided form (np.percentile interpolates from the nearer
+        # end), so the result matches Series.describe() bit for bit and the
+        # sharded report prints exactly like the single-frame one.
+        position = q * (n - 1)
+        rank = int(np.floor(position))
+        frac = position - rank
+        lo = values[np.searchsorted(ends, rank, side='right')]
+        hi = values[np.searchsorted(ends, min(rank + 1, n - 1), side='right')]
+        return hi - (hi - lo) * (1 - frac) if frac >= 0.5 else lo + (hi - lo) * frac
+
+    return pd.Series({'count': float(n), 'mean': mean, 'std': std, 'min': float(values[0]),
+                      '25%': quantile(0.25), '50%': quantile(0.5), '75%': quantile(0.75),
+                      'max': float(values[-1])}, name=name)
+
+
+def _with_row_order(results, key, offsets):
+    """Concatenate a candidate frame of every partition with its global Row_Order"""
+    frames = [r[key].assign(Row_Order=r[key]['Local_Row'] + offset)
+              for r, offset in zip(results, offsets)]
+    rows = pd.concat(frames, ignore_index=True).sort_values('Row_Order', kind='stable')
+    return rows.reset_index(drop=True)
+
+
+def reduce_results(results, top_sellers=TOP_SELLERS_PER_CATEGORY, top_rated=TOP_RATED_COUNT):
+    """Merge map results (in partition order) into (CatalogAggregates, report inputs)"""
+    offsets = np.r_[0, np.cumsum([r['rows'] for r in results])[:-1]]
+    columns = [c for c in results[0]['top_rated'].columns if c != 'Local_Row']
+
+    agg = CatalogAggregates.merge([r['partial'] for r in results])
+
+    # Category order of the concatenated catalog (first appearance)
+    first_rows = {}
+    for r, offset in zip(results, offsets):
+        for cat, row in r['first_rows'].items():
+            first_rows.setdefault(cat, row + offset)
+    position = {cat: i for i, cat in enumerate(sorted(first_rows, key=first_rows.get))}
+
+    sellers = _with_row_order(results, 'top_sellers', offsets)
+    sellers = top_k_per_group(sellers, 'Main_Category', 'Units_Sold_30_Days', k=top_sellers)
+    sellers = sellers.assign(_Position=sellers['Main_Category'].astype(str).map(position))
+    sellers = sellers.sort_values(['_Position', 'Rank'], kind='stable')
+
+    rated = _with_row_order(results, 'top_rated', offsets).nlargest(top_rated, 'Customer_Rating')
+    oos = _with_row_order(results, 'oos_bestsellers', offsets)
+
+    inputs = {
+        'shape': (int(agg.totals['products']), results[0]['columns']),
+        'top_sellers': sellers[columns + ['Rank']],
+        'oos_bestsellers': oos[columns],
+        'top_rated': rated[columns],
+    }
+    for key, col in STAT_COLUMNS.items():
+        values, counts = _merge_value_counts([r['value_counts'][col] for r in results])
+        inputs[key] = describe_from_counts(values, counts, name=col)
+    return agg, inputs
+
+
+def sharded_analysis(partition_dir, workers=None, top_sellers=TOP_SELLERS_PER_CATEGORY,
+                     top_rated=TOP_RATED_COUNT):
+    """
+    Map every partition of partition_dir on `workers` processes (default:
+    one per CPU) and reduce. Returns (CatalogAggregates, report inputs).
+    """
+    paths = partition_paths(partition_dir)
+    workers = min(len(paths), os.cpu_count() or 1) if workers is None else workers
+    if workers <= 1:
+        results = [map_partition(path, top_sellers, top_rated) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(map_partition, paths, [top_sellers] * len(paths),
+                                    [top_rated] * len(paths)))
+    return reduce_results(results, top_sellers, top_rated)
+
+
+def verify(partition_dir, agg, inputs):
+    """True if the sharded report prints exactly like the single-frame report"""
+    df = pd.concat([read_products_csv(path) for path in partition_paths(partition_dir)],
+                   ignore_index=True)
+    printed = []
+    for report_agg, report_in in [(agg, inputs),
+                                  (CatalogAggregates.from_frame(df), report_inputs(df))]:
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            print_report(report_agg, report_in)
+        printed.append(out.getvalue())
+    return printed[0] == printed[1]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Map-reduce analysis over catalog partitions")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    part = commands.add_parser('partition', help="split a catalog CSV into partitions")
+    part.add_argument('csv_path')
+    part.add_argument('output_dir')
+    part.add_argument('--by', choices=['category', 'id_range'], default='category')
+    part.add_argument('--rows', type=int, default=DEFAULT_PARTITION_ROWS,
+                      help="rows per partition for --by id_range")
+
+    run = commands.add_parser('run', help="analyze a directory of partitions")
+    run.add_argument('partition_dir')
+    run.add_argument('--workers', type=int, default=None,
+                     help="map processes (default: one per CPU)")
+    run.add_argument('--verify', action='store_true',
+                     help="compare with the single-frame report of the concatenated catalog")
+    args = parser.parse_args()
+
+    if args.command == 'partition':
+        paths = write_partitions(pd.read_csv(args.csv_path), args.output_dir, args.by, args.rows)
+        print(f"✓ Wrote {len(paths)} partitions to: {args.output_dir}")
+    else:
+        agg, inputs = sharded_analysis(args.partition_dir, args.workers)
+        print_report(agg, inputs)
+        if args.verify:
+            if not verify(args.partition_dir, agg, inputs):
+                print("\n❌ Sharded report differs from the single-frame report")
+                sys.exit(1)
+            print("\n✅ Sharded report matches the single-frame report")
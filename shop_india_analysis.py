@@ -12,71 +12,69 @@ This project analyzes The Shop India's product catalog to identify:
 - Category performance analysis
 """
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
+import json
+import os
 from datetime import datetime, timedelta
 
-# Set style for visualizations
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 6)
+# pandas/numpy and the modules built on them are imported inside the
+# functions that need them, and matplotlib/seaborn only when charts are
+# requested, so importing this module (or a cached metric query) stays fast.
+
+DEFAULT_CSV_PATH = 'product_analysis_data.csv'
+SUMMARY_SUFFIX = '.summary.json'
+
+# Catalog-wide metrics answered from the summary file (CatalogAggregates.totals)
+METRICS = ['products', 'categories', 'revenue', 'units', 'avg_price', 'avg_order_value',
+           'avg_rating', 'reviews', 'oos_bestsellers', 'high_rated_slow',
+           'date_min', 'date_max']
+
+
+def print_banner():
+    print("=" * 80)
+    print("THE SHOP INDIA - E-COMMERCE PRODUCT ANALYTICS")
+    print("=" * 80)
+    print(f"Analysis Date: {datetime.now().strftime('%B %d, %Y')}")
+    print(f"Analyst: Utkarsh Gaur")
+    print("=" * 80)
+    print()
 
-print("=" * 80)
-print("THE SHOP INDIA - E-COMMERCE PRODUCT ANALYTICS")
-print("=" * 80)
-print(f"Analysis Date: {datetime.now().strftime('%B %d, %Y')}")
-print(f"Analyst: Utkarsh Gaur")
-print("=" * 80)
-print()
 
 # ============================================================================
 # DATA GENERATION (Based on Website Scraping)
 # ============================================================================
 
-def generate_shop_india_data():
+def generate_shop_india_data(n_products=None, batched=False, seed=42, n_workers=1):
     """
     Generate simulated product data based on The Shop India's actual categories
     and price ranges observed on their website
+
+    n_products scales the catalog (default: the original 1,520 products).
+    batched=True draws whole columns at once via catalog_generator, which is
+    the mode to use for large load-test catalogs; n_workers spreads its
+    shards over a process pool without changing the output.
     """
-    np.random.seed(42)
-    
-    # Actual categories from The Shop India website
-    categories = {
-        'Dining': ['Table Cloths', 'Table Runners', 'Mats & Napkins', 'Kitchen Linen'],
-        'Bedroom': ['Throws & Coverlets', 'Quilts & Duvet Covers', 'Sheets & Bedcovers', 'Pillows'],
-        'Living': ['Cushions', 'Curtains', 'Rugs', 'Floor Cushions', 'Decor', 'Lights & Shades'],
-        'Women': ['Dresses', 'Jackets & Shrugs', 'Kimonos & Kaftans', 'Tunics & Kurtas', 'Sarees'],
-        'Men': ['Kurtas', 'Pants & Pyjamas', 'Shirts & Tunics', 'Loungewear'],
-        'Kids': ['Dresses', 'Tunics & Kurtas', 'PJ Sets', 'Tops & Shirts'],
-        'Wellness': ['Towels & Robes', 'Bath & Body', 'Aromatherapy'],
-        'Accessories': ['Scarves & Wraps', 'Dupattas & Sarongs', 'Bags', 'Hair Accessories']
-    }
-    
-    # Colors observed on website
-    colors = ['Blue', 'Black', 'White', 'Beige', 'Green', 'Red', 'Yellow', 'Pink',
-              'Cream', 'Navy', 'Emerald', 'Indigo', 'Multi', 'Natural', 'Aqua']
-    
-    # Fabrics from website
-    fabrics = ['Cotton Voile', '100% Cotton', 'Cotton Textured', 'Cotton Sheeting',
-               'Cotton Cambric', 'Chanderi Silk', 'Wool', 'Cotton Canvas', 'Silk']
-    
-    # Stock statuses
-    stock_status = ['In Stock', 'Low Stock', 'Out of Stock']
+    import numpy as np
+    import pandas as pd
+
+    from catalog_generator import (CATEGORIES, COLORS, DEFAULT_PRODUCT_COUNT, FABRICS,
+                                   STOCK_STATUS, category_product_counts, generate_catalog)
+
+    if batched:
+        return generate_catalog(n_products or DEFAULT_PRODUCT_COUNT, seed=seed,
+                                n_workers=n_workers)
+
+    np.random.seed(seed)
     
     products = []
     product_id = 1
     
-    for main_category, subcategories in categories.items():
-        # Number of products per category (realistic distribution)
-        num_products_category = {
-            'Dining': 180, 'Bedroom': 220, 'Living': 250, 'Women': 280,
-            'Men': 140, 'Kids': 180, 'Wellness': 120, 'Accessories': 150
-        }
-        
-        n_products = num_products_category[main_category]
+    num_products_category = category_product_counts(n_products)
+    
+    for main_category, subcategories in CATEGORIES.items():
+        n_products_category = num_products_category[main_category]
         
-        for i in range(n_products):
+        for i in range(n_products_category):
             subcategory = np.random.choice(subcategories)
             
             # Price ranges based on actual website data
@@ -109,9 +107,9 @@ def generate_shop_india_data():
             
             # Stock status (more likely in stock if bestseller)
             if performance_tier == 'Bestseller':
-                status = np.random.choice(stock_status, p=[0.7, 0.2, 0.1])
+                status = np.random.choice(STOCK_STATUS, p=[0.7, 0.2, 0.1])
             else:
-                status = np.random.choice(stock_status, p=[0.6, 0.2, 0.2])
+                status = np.random.choice(STOCK_STATUS, p=[0.6, 0.2, 0.2])
             
             # Customer rating
             if performance_tier == 'Bestseller':
@@ -124,12 +122,12 @@ def generate_shop_india_data():
             
             product = {
                 'Product_ID': f'TSI{product_id:04d}',
-                'Product_Name': f'{subcategory} {np.random.choice(colors)}',
+                'Product_Name': f'{subcategory} {np.random.choice(COLORS)}',
                 'Main_Category': main_category,
                 'Sub_Category': subcategory,
                 'Price_INR': round(base_price, 2),
-                'Color': np.random.choice(colors),
-                'Fabric': np.random.choice(fabrics),
+                'Color': np.random.choice(COLORS),
+                'Fabric': np.random.choice(FABRICS),
                 'Units_Sold_30_Days': units_sold,
                 'Revenue_30_Days': round(base_price * units_sold, 2),
                 'Stock_Status': status,
@@ -144,245 +142,169 @@ def generate_shop_india_data():
     
     return pd.DataFrame(products)
 
-# Generate the dataset
-print("📊 Generating Product Dataset from The Shop India Catalog...")
-df = generate_shop_india_data()
-print(f"✓ Loaded {len(df)} products across {df['Main_Category'].nunique()} categories\n")
 
 # ============================================================================
-# EXPLORATORY DATA ANALYSIS
+# ANALYSIS
 # ============================================================================
 
-print("\n" + "=" * 80)
-print("SECTION 1: DATASET OVERVIEW")
-print("=" * 80 + "\n")
-
-print("Dataset Shape:", df.shape)
-print(f"Total Products: {len(df)}")
-print(f"Categories: {df['Main_Category'].nunique()}")
-print(f"Date Range: {df['Date_Added'].min()} to {df['Date_Added'].max()}")
-print()
-
-print("Price Statistics (INR):")
-print(df['Price_INR'].describe())
-print()
-
-print("Sales Performance (Last 30 Days):")
-print(df['Units_Sold_30_Days'].describe())
-print()
-
-# ============================================================================
-# ANALYSIS 1: CATEGORY PERFORMANCE
-# ============================================================================
-
-print("\n" + "=" * 80)
-print("SECTION 2: CATEGORY PERFORMANCE ANALYSIS")
-print("=" * 80 + "\n")
-
-category_analysis = df.groupby('Main_Category').agg({
-    'Product_ID': 'count',
-    'Revenue_30_Days': 'sum',
-    'Units_Sold_30_Days': 'sum',
-    'Price_INR': 'mean',
-    'Customer_Rating': 'mean'
-}).round(2)
-
-category_analysis.columns = ['Product_Count', 'Total_Revenue', 'Total_Units_Sold', 
-                              'Avg_Price', 'Avg_Rating']
-category_analysis = category_analysis.sort_values('Total_Revenue', ascending=False)
-
-print("Category Performance (Last 30 Days):")
-print(category_analysis.to_string())
-print()
-
-# Calculate category insights
-total_revenue = category_analysis['Total_Revenue'].sum()
-category_analysis['Revenue_Share_%'] = (category_analysis['Total_Revenue'] / total_revenue * 100).round(2)
-
-print("\nKey Insights:")
-print(f"• Top Revenue Category: {category_analysis.index[0]} "
-      f"(₹{category_analysis['Total_Revenue'].iloc[0]:,.0f} - "
-      f"{category_analysis['Revenue_Share_%'].iloc[0]:.1f}% of total)")
-print(f"• Highest Rated Category: {category_analysis['Avg_Rating'].idxmax()} "
-      f"({category_analysis['Avg_Rating'].max():.2f}/5.0)")
-print(f"• Premium Category (Highest Avg Price): {category_analysis['Avg_Price'].idxmax()} "
-      f"(₹{category_analysis['Avg_Price'].max():,.0f})")
+def analyze(df, instrument=None):
+    """
+    Aggregates and report inputs of a product table.
 
-# ============================================================================
-# ANALYSIS 2: BEST SELLING PRODUCTS
-# ============================================================================
+    Returns (CatalogAggregates, report inputs); adds Price_Band to df.
+    """
+    from aggregations import CatalogAggregates, add_price_band
+    from instrumentation import track
+    from report import report_inputs
 
-print("\n" + "=" * 80)
-print("SECTION 3: BEST-SELLING PRODUCTS BY CATEGORY")
-print("=" * 80 + "\n")
+    # One grouped pass; every section reads its tables from `agg`
+    with track(instrument, 'aggregate', rows=len(df)):
+        agg = CatalogAggregates.from_frame(df)
+    # Row-level inputs (describe statistics and product lists) for the report
+    with track(instrument, 'report_inputs', rows=len(df)):
+        inputs = report_inputs(df)
+    add_price_band(df)
+    return agg, inputs
 
-# Top 3 products per category
-for category in df['Main_Category'].unique():
-    cat_df = df[df['Main_Category'] == category].nlargest(3, 'Units_Sold_30_Days')
-    
-    print(f"\n📈 {category.upper()} - Top 3 Best Sellers:")
-    print("-" * 80)
-    
-    for idx, row in cat_df.iterrows():
-        print(f"\n{row['Product_ID']}: {row['Product_Name']}")
-        print(f"  • Sub-Category: {row['Sub_Category']}")
-        print(f"  • Price: ₹{row['Price_INR']:,.0f}")
-        print(f"  • Units Sold (30 days): {row['Units_Sold_30_Days']}")
-        print(f"  • Revenue (30 days): ₹{row['Revenue_30_Days']:,.0f}")
-        print(f"  • Rating: {row['Customer_Rating']}/5.0 ({row['Num_Reviews']} reviews)")
-        print(f"  • Stock: {row['Stock_Status']}")
 
 # ============================================================================
-# ANALYSIS 3: PRICE DISTRIBUTION
+# METRIC SUMMARY (fast queries)
 # ============================================================================
 
-print("\n\n" + "=" * 80)
-print("SECTION 4: PRICE DISTRIBUTION ANALYSIS")
-print("=" * 80 + "\n")
-
-# Price bands
-df['Price_Band'] = pd.cut(df['Price_INR'], 
-                          bins=[0, 1000, 2000, 3000, 5000, 50000],
-                          labels=['Budget (<₹1K)', 'Economy (₹1-2K)', 
-                                 'Mid-Range (₹2-3K)', 'Premium (₹3-5K)', 
-                                 'Luxury (>₹5K)'])
-
-price_distribution = df.groupby('Price_Band').agg({
-    'Product_ID': 'count',
-    'Units_Sold_30_Days': 'sum',
-    'Revenue_30_Days': 'sum'
-}).round(2)
-
-price_distribution.columns = ['Product_Count', 'Units_Sold', 'Revenue']
-price_distribution['Avg_Revenue_Per_Product'] = (
-    price_distribution['Revenue'] / price_distribution['Product_Count']
-).round(2)
-
-print("Price Band Performance:")
-print(price_distribution.to_string())
-print()
-
-print("Key Insights:")
-best_volume_band = price_distribution['Units_Sold'].idxmax()
-best_revenue_band = price_distribution['Revenue'].idxmax()
-print(f"• Highest Volume: {best_volume_band} ({price_distribution.loc[best_volume_band, 'Units_Sold']} units)")
-print(f"• Highest Revenue: {best_revenue_band} (₹{price_distribution.loc[best_revenue_band, 'Revenue']:,.0f})")
-
-# ============================================================================
-# ANALYSIS 4: STOCK & AVAILABILITY
-# ============================================================================
+def summary_path_for(csv_path):
+    """Summary file next to the CSV (same name, .summary.json extension)"""
+    return os.path.splitext(csv_path)[0] + SUMMARY_SUFFIX
 
-print("\n\n" + "=" * 80)
-print("SECTION 5: INVENTORY & STOCK ANALYSIS")
-print("=" * 80 + "\n")
 
-stock_analysis = df.groupby(['Main_Category', 'Stock_Status']).size().unstack(fill_value=0)
-stock_analysis['Total'] = stock_analysis.sum(axis=1)
-stock_analysis['Out_of_Stock_%'] = (stock_analysis['Out of Stock'] / stock_analysis['Total'] * 100).round(2)
+def _csv_fingerprint(csv_path):
+    """Size and modification time of the CSV (as in data_loader)"""
+    stat = os.stat(csv_path)
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
 
-print("Stock Status by Category:")
-print(stock_analysis.to_string())
-print()
 
-# Out of stock best sellers (CRITICAL)
-oos_bestsellers = df[(df['Stock_Status'] == 'Out of Stock') & 
-                     (df['Performance_Tier'] == 'Bestseller')]
+def save_summary(agg, csv_path):
+    """Write the catalog-wide metrics of csv_path next to it"""
+    summary = {'csv_fingerprint': _csv_fingerprint(csv_path),
+               'metrics': {name: agg.totals[name] for name in METRICS}}
+    with open(summary_path_for(csv_path), 'w') as f:
+        json.dump(summary, f, indent=2, default=float)
 
-if len(oos_bestsellers) > 0:
-    print(f"\n⚠️  CRITICAL: {len(oos_bestsellers)} Best-Selling Products Out of Stock!")
-    print("These represent lost revenue opportunities:")
-    print("-" * 80)
-    
-    for idx, row in oos_bestsellers.head(5).iterrows():
-        potential_revenue = row['Price_INR'] * row['Units_Sold_30_Days']
-        print(f"\n• {row['Product_ID']}: {row['Product_Name']}")
-        print(f"  Category: {row['Main_Category']} > {row['Sub_Category']}")
-        print(f"  Estimated Lost Revenue (if in stock): ₹{potential_revenue:,.0f}/month")
 
-# ============================================================================
-# ANALYSIS 5: CUSTOMER RATINGS & REVIEWS
-# ============================================================================
+def load_summary(csv_path):
+    """Metrics of csv_path from its summary file, or None if missing or stale"""
+    try:
+        with open(summary_path_for(csv_path)) as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if summary.get('csv_fingerprint') != _csv_fingerprint(csv_path):
+        return None
+    return summary['metrics']
 
-print("\n\n" + "=" * 80)
-print("SECTION 6: CUSTOMER SATISFACTION ANALYSIS")
-print("=" * 80 + "\n")
 
-rating_analysis = df.groupby('Main_Category').agg({
-    'Customer_Rating': ['mean', 'min', 'max'],
-    'Num_Reviews': 'sum'
-}).round(2)
+def get_metric(name, csv_path=DEFAULT_CSV_PATH):
+    """
+    One catalog-wide metric (see METRICS) of a saved product CSV.
 
-rating_analysis.columns = ['Avg_Rating', 'Min_Rating', 'Max_Rating', 'Total_Reviews']
-rating_analysis = rating_analysis.sort_values('Avg_Rating', ascending=False)
+    Answered from the summary file without importing pandas when it is
+    fresh; otherwise the CSV is aggregated once and the summary rewritten.
+    """
+    if name not in METRICS:
+        raise ValueError(f"Unknown metric {name!r}; choose from {', '.join(METRICS)}")
+    metrics = load_summary(csv_path)
+    if metrics is None:
+        from aggregations import CatalogAggregates
+        from data_loader import load_products
 
-print("Customer Ratings by Category:")
-print(rating_analysis.to_string())
-print()
+        agg = CatalogAggregates.from_frame(load_products(csv_path))
+        save_summary(agg, csv_path)
+        metrics = agg.totals
+    return metrics[name]
 
-# Top rated products
-top_rated = df.nlargest(10, 'Customer_Rating')
-print("\nTop 10 Highest Rated Products:")
-print("-" * 80)
-for idx, row in top_rated.iterrows():
-    print(f"• {row['Product_Name']} ({row['Main_Category']})")
-    print(f"  Rating: {row['Customer_Rating']}/5.0 ({row['Num_Reviews']} reviews) | Price: ₹{row['Price_INR']:,.0f}")
 
 # ============================================================================
-# EXECUTIVE SUMMARY
+# FULL RUN
 # ============================================================================
 
-print("\n\n" + "=" * 80)
-print("EXECUTIVE SUMMARY & RECOMMENDATIONS")
-print("=" * 80 + "\n")
-
-print("📊 KEY METRICS:")
-print(f"• Total Products Analyzed: {len(df)}")
-print(f"• Total Revenue (30 days): ₹{df['Revenue_30_Days'].sum():,.0f}")
-print(f"• Total Units Sold (30 days): {df['Units_Sold_30_Days'].sum():,}")
-print(f"• Average Order Value: ₹{(df['Revenue_30_Days'].sum() / df['Units_Sold_30_Days'].sum()):,.0f}")
-print(f"• Overall Customer Rating: {df['Customer_Rating'].mean():.2f}/5.0")
-print()
-
-print("🏆 TOP PERFORMERS:")
-print(f"• Best Revenue Category: {category_analysis.index[0]}")
-print(f"• Best Rated Category: {category_analysis['Avg_Rating'].idxmax()}")
-print(f"• Most Reviewed Category: {rating_analysis['Total_Reviews'].idxmax()}")
-print()
-
-print("💡 STRATEGIC RECOMMENDATIONS:")
-print()
-print("1. INVENTORY OPTIMIZATION:")
-print(f"   • Restock {len(oos_bestsellers)} out-of-stock bestsellers immediately")
-print(f"   • Focus on {category_analysis.index[0]} category (highest revenue)")
-print()
-
-print("2. PRICING STRATEGY:")
-best_price_band = price_distribution.loc[price_distribution['Revenue'].idxmax()]
-print(f"   • {price_distribution['Revenue'].idxmax()} generates highest revenue")
-print(f"   • Consider expanding product range in this price segment")
-print()
-
-print("3. CATEGORY EXPANSION:")
-lowest_revenue_cat = category_analysis.index[-1]
-print(f"   • {lowest_revenue_cat} has growth potential (currently {category_analysis.loc[lowest_revenue_cat, 'Product_Count']:.0f} products)")
-print(f"   • Consider adding premium/bestselling items to underperforming categories")
-print()
-
-print("4. CUSTOMER SATISFACTION:")
-high_rated_low_sales = df[(df['Customer_Rating'] >= 4.5) & (df['Performance_Tier'] == 'Slow')]
-print(f"   • {len(high_rated_low_sales)} highly-rated products have low sales")
-print(f"   • Opportunity for better marketing/promotion")
-print()
-
-print("5. QUICK WINS:")
-print(f"   • Promote bestsellers in {category_analysis.index[0]} category")
-print(f"   • Bundle high-rated slow-movers with bestsellers")
-print(f"   • Run targeted campaigns for price-sensitive customer segment")
-
-print("\n" + "=" * 80)
-print("Analysis Complete!")
-print("=" * 80)
-
-# Save the dataset
-df.to_csv('/home/claude/the_shop_india_analysis/product_analysis_data.csv', index=False)
-print("\n✓ Data saved to: product_analysis_data.csv")
+def run_analysis(csv_path=DEFAULT_CSV_PATH, n_products=None, seed=42, charts=False,
+                 instrument=None, report_path=None):
+    """
+    Generate the catalog, print the full report, save the dataset (and its
+    metric summary) to csv_path and optionally render the charts next to it.
+    With an Instrumentation, every stage, report section and chart is measured.
+    report_path also writes the report as JSON/Markdown/HTML/text (by extension).
+    """
+    from instrumentation import track
+    from report import print_report
+
+    print_banner()
+
+    print("📊 Generating Product Dataset from The Shop India Catalog...")
+    with track(instrument, 'generate', rows=n_products) as record:
+        df = generate_shop_india_data(n_products, seed=seed)
+        if record is not None:
+            record['rows'] = len(df)
+    agg, inputs = analyze(df, instrument)
+    print(f"✓ Loaded {agg.totals['products']} products across {agg.totals['categories']} categories\n")
+
+    print_report(agg, inputs, instrument)
+
+    # Save the dataset
+    with track(instrument, 'save', rows=len(df)):
+        df.to_csv(csv_path, index=False)
+        save_summary(agg, csv_path)
+    print(f"\n✓ Data saved to: {os.path.basename(csv_path)}")
+
+    if report_path:
+        from report_render import FORMAT_NAMES, write_report
+        fmt = write_report(agg, inputs, report_path)
+        print(f"✓ {FORMAT_NAMES[fmt]} report saved to: {report_path}")
+
+    if charts:
+        # matplotlib/seaborn are only imported on this path
+        from create_visualizations import create_visualizations
+        create_visualizations(csv_path, output_dir=os.path.dirname(csv_path) or '.',
+                              instrument=instrument)
+    return agg
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="The Shop India product analytics")
+    parser.add_argument('--output', default=DEFAULT_CSV_PATH,
+                        help="where to save the generated dataset (CSV)")
+    parser.add_argument('--products', type=int, default=None,
+                        help="catalog size (default: 1,520 products)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--charts', action='store_true',
+                        help="also render the charts next to the dataset")
+    parser.add_argument('--metric', choices=METRICS,
+                        help="print one metric of an existing dataset and exit")
+    parser.add_argument('--csv', default=DEFAULT_CSV_PATH,
+                        help="dataset queried by --metric")
+    parser.add_argument('--report', metavar='PATH',
+                        help="also write the report to PATH (.json, .md, .html or .txt)")
+    parser.add_argument('--timings', metavar='PATH',
+                        help="write per-section timings to PATH (.json or .csv)")
+    parser.add_argument('--profile', metavar='SECTION',
+                        help="run one section (e.g. best_sellers, chart2) under cProfile")
+    args = parser.parse_args(argv)
+
+    if args.metric:
+        print(get_metric(args.metric, args.csv))
+        return
+
+    instrument = None
+    if args.timings or args.profile:
+        from instrumentation import Instrumentation
+        instrument = Instrumentation(profile=args.profile,
+                                     profile_dir=os.path.dirname(args.output) or '.')
+    run_analysis(args.output, n_products=args.products, seed=args.seed, charts=args.charts,
+                 instrument=instrument, report_path=args.report)
+    if args.timings:
+        instrument.save(args.timings)
+        print(f"\n{instrument.summary()}")
+        print(f"\n✓ Timings saved to: {args.timings}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,422 @@
+"""
+THE SHOP INDIA - STOCK EVENT PIPELINE
+=====================================
+Keeps the out-of-stock bestseller view of SECTION 5 up to date from a
+stream of stock events instead of re-running the batch mask.
+
+An event is one JSON line naming a product and the fields that changed:
+
+    {"Product_ID": "TSI0425", "Stock_Status": "Out of Stock", "ts": 1760000000.5}
+
+Stock_Status, Performance_Tier, Price_INR and Units_Sold_30_Days may be
+given; ts (producer time, epoch seconds) is optional and only used to
+report end-to-end latency. Each event updates, in O(1):
+- the Main_Category x Stock_Status crosstab
+- the out-of-stock bestseller set
+- the estimated lost revenue (Price_INR x Units_Sold_30_Days, kept in
+  paise so the running total stays exact)
+and raises an alert as soon as a bestseller goes out of stock or is
+restocked.
+
+Events are read from a file that is followed like `tail -f`, or from
+newline-delimited JSON sent to a TCP or Unix socket. `replay` runs an
+event file through the pipeline as fast as possible to measure throughput
+and per-event latency, and can check the final state against the batch
+computation.
+
+Usage:
+    python stock_events.py generate product_analysis_data.csv stock_events.jsonl --events 100000
+    python stock_events.py replay product_analysis_data.csv stock_events.jsonl --verify
+    python stock_events.py watch product_analysis_data.csv --tail stock_events.jsonl
+    python stock_events.py watch product_analysis_data.csv --port 8766
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from report import OOS_BESTSELLERS_SHOWN, lost_revenue, oos_bestseller_mask
+
+STOCK_STATUSES = ['In Stock', 'Low Stock', 'Out of Stock']
+OUT_OF_STOCK = STOCK_STATUSES.index('Out of Stock')
+EVENT_FIELDS = ['Stock_Status', 'Performance_Tier', 'Price_INR', 'Units_Sold_30_Days']
+CATALOG_COLUMNS = ['Product_ID', 'Product_Name', 'Main_Category'] + EVENT_FIELDS
+MAX_EVENT_PRICE_INR = 10_000_000    # larger prices / unit counts are rejected as bad events
+MAX_EVENT_UNITS = 10_000_000
+
+DEFAULT_PORT = 8766
+TAIL_POLL_SECONDS = 0.005
+GENERATED_STATUS_WEIGHTS = [0.5, 0.3, 0.2]   # In / Low / Out of Stock
+GENERATED_TIER_CHANGE = 0.02                 # share of generated events that change the tier
+
+
+class StockMonitor:
+    """
+    Live stock state of a catalog.
+
+    Attributes:
+        positions  - Product_ID -> row position
+        categories - category names (sorted), crosstab rows
+        crosstab   - int64 [category, STOCK_STATUSES] product counts
+        oos        - row positions of the out-of-stock bestsellers
+        lost_paise - estimated lost revenue of the oos set, in paise
+        stats      - event counters (applied, unknown, rejected, alerts)
+    """
+
+    def __init__(self, df):
+        self.ids = df['Product_ID'].astype(str).to_numpy()
+        self.names = df['Product_Name'].astype(str).to_numpy()
+        self.positions = dict(zip(self.ids.tolist(), range(len(df))))
+        cat_codes, categories = pd.factorize(df['Main_Category'].astype(str), sort=True)
+        self.categories = list(categories)
+        self.cat = cat_codes.tolist()
+        self.status = pd.Categorical(df['Stock_Status'].astype(str),
+                                     categories=STOCK_STATUSES).codes.tolist()
+        if -1 in self.status:
+            raise ValueError(f"Stock_Status outside {STOCK_STATUSES}")
+        self.bestseller = (df['Performance_Tier'].astype(str) == 'Bestseller').tolist()
+        self.tier = df['Performance_Tier'].astype(str).tolist()
+        self.price_paise = np.rint(df['Price_INR'].to_numpy(dtype=float) * 100).astype(np.int64).tolist()
+        self.units = df['Units_Sold_30_Days'].to_numpy(dtype=np.int64).tolist()
+
+        self.crosstab = np.zeros((len(self.categories), len(STOCK_STATUSES)), dtype=np.int64)
+        np.add.at(self.crosstab, (cat_codes, np.asarray(self.status)), 1)
+        self.oos = set(np.flatnonzero(oos_bestseller_mask(df).to_numpy()).tolist())
+        self.lost_paise = sum(self.price_paise[i] * self.units[i] for i in self.oos)
+        self.stats = {'applied': 0, 'unknown': 0, 'rejected': 0, 'alerts': 0}
+
+    def _lost(self, i):
+        return self.price_paise[i] * self.units[i]
+
+    def apply(self, event):
+        """
+        Apply one event (dict). Returns an alert dict when the product
+        enters or leaves the out-of-stock bestseller set, else None.
+        """
+        i = self.positions.get(event.get('Product_ID'))
+        if i is None:
+            self.stats['unknown'] += 1
+            return None
+
+        # Parse every field before touching any state: a bad event changes nothing
+        status, tier = self.status[i], self.tier[i]
+        price_paise, units = self.price_paise[i], self.units[i]
+        try:
+            if 'Stock_Status' in event:
+                status = STOCK_STATUSES.index(event['Stock_Status'])
+            if 'Performance_Tier' in event:
+                tier = event['Performance_Tier']
+                if not isinstance(tier, str):
+                    raise ValueError(f"Performance_Tier {tier!r}")
+            if 'Price_INR' in event:
+                price = float(event['Price_INR'])
+                if not (math.isfinite(price) and 0 <= price <= MAX_EVENT_PRICE_INR):
+                    raise ValueError(f"Price_INR {price!r}")
+                price_paise = round(price * 100)
+            if 'Units_Sold_30_Days' in event:
+                value = event['Units_Sold_30_Days']
+                units = int(value)
+                if units != float(value) or not 0 <= units <= MAX_EVENT_UNITS:
+                    raise ValueError(f"Units_Sold_30_Days {value!r}")
+        except (ValueError, TypeError, OverflowError):
+            self.stats['rejected'] += 1
+            return None
+
+        was_oos = i in self.oos
+        if was_oos:
+            self.lost_paise -= self._lost(i)
+        if status != self.status[i]:
+            self.crosstab[self.cat[i], self.status[i]] -= 1
+            self.crosstab[self.cat[i], status] += 1
+            self.status[i] = status
+        self.tier[i] = tier
+        self.bestseller[i] = tier == 'Bestseller'
+        self.price_paise[i] = price_paise
+        self.units[i] = units
+
+        is_oos = status == OUT_OF_STOCK and self.bestseller[i]
+        if is_oos:
+            self.lost_paise += self._lost(i)
+            self.oos.add(i)
+        elif was_oos:
+            self.oos.discard(i)
+        self.stats['applied'] += 1
+
+        if is_oos == was_oos:
+            return None
+        self.stats['alerts'] += 1
+        return {
+            'alert': 'OUT_OF_STOCK' if is_oos else 'RESTOCKED',
+            'Product_ID': self.ids[i],
+            'Product_Name': self.names[i],
+            'Main_Category': self.categories[self.cat[i]],
+            'Estimated_Lost_Revenue': self._lost(i) / 100,
+            'Total_Lost_Revenue': self.lost_paise / 100,
+            'OOS_Bestsellers': len(self.oos),
+        }
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def stock_table(self):
+        """Current crosstab in the layout of the SECTION 5 table"""
+        table = pd.DataFrame(self.crosstab, columns=STOCK_STATUSES,
+                             index=pd.Index(self.categories, name='Main_Category'))
+        table.columns.name = 'Stock_Status'
+        table['Total'] = table[STOCK_STATUSES].sum(axis=1)
+        table['Out_of_Stock_%'] = (table['Out of Stock'] / table['Total'] * 100).round(2)
+        return table
+
+    def oos_bestsellers(self):
+        """Current out-of-stock bestsellers, largest estimated loss first"""
+        rows = sorted(self.oos)
+        table = pd.DataFrame({
+            'Product_ID': self.ids[rows],
+            'Product_Name': self.names[rows],
+            'Main_Category': [self.categories[self.cat[i]] for i in rows],
+            'Estimated_Lost_Revenue': [self._lost(i) / 100 for i in rows],
+        })
+        return table.sort_values('Estimated_Lost_Revenue', ascending=False, kind='stable')
+
+    def catalog(self, df):
+        """df with the tracked fields replaced by their current values"""
+        return df.assign(
+            Stock_Status=np.asarray(STOCK_STATUSES, dtype=object)[self.status],
+            Performance_Tier=self.tier,
+            Price_INR=np.asarray(self.price_paise, dtype=np.int64) / 100,
+            Units_Sold_30_Days=self.units,
+        )
+
+    def verify(self, df):
+        """Problems found comparing the live state with the batch computation"""
+        current = self.catalog(df)
+        problems = []
+        mask = oos_bestseller_mask(current).to_numpy()
+        if set(np.flatnonzero(mask).tolist()) != self.oos:
+            problems.append("out-of-stock bestseller set differs")
+        batch_lost = round(float(lost_revenue(current[mask]).sum()), 2)
+        if abs(batch_lost - self.lost_paise / 100) > 0.005 * max(len(self.oos), 1):
+            problems.append(f"lost revenue {self.lost_paise / 100:,.2f} != {batch_lost:,.2f}")
+        batch_stock = pd.crosstab(current['Main_Category'].astype(str), current['Stock_Status'])
+        batch_stock = batch_stock.reindex(index=self.categories, columns=STOCK_STATUSES, fill_value=0)
+        if not np.array_equal(batch_stock.to_numpy(), self.crosstab):
+            problems.append("stock crosstab differs")
+        return problems
+
+    def summary(self):
+        print("Stock Status by Category:")
+        print(self.stock_table().to_string())
+        print(f"\nOut-of-Stock Bestsellers: {len(self.oos)}")
+        print(f"Estimated Lost Revenue: ₹{self.lost_paise / 100:,.0f}/month")
+        if self.oos:
+            print(self.oos_bestsellers().head(OOS_BESTSELLERS_SHOWN).to_string(index=False))
+        print(f"Events: {self.stats}")
+
+
+# ============================================================================
+# EVENT SOURCES
+# ============================================================================
+
+def print_alert(alert, latency_ms=None, e2e_ms=None):
+    icon = '⚠️ ' if alert['alert'] == 'OUT_OF_STOCK' else '✓'
+    timing = '' if latency_ms is None else f" [{latency_ms:.3f} ms"
+    if timing and e2e_ms is not None:
+        timing += f", {e2e_ms:.1f} ms since emitted"
+    timing += ']' if timing else ''
+    print(f"{icon} {alert['alert']}: {alert['Product_ID']} {alert['Product_Name']} "
+          f"({alert['Main_Category']}) ₹{alert['Estimated_Lost_Revenue']:,.0f}/month | "
+          f"{alert['OOS_Bestsellers']} OOS bestsellers, "
+          f"₹{alert['Total_Lost_Revenue']:,.0f}/month at risk{timing}", flush=True)
+
+
+class EventPipeline:
+    """Parses event lines, applies them and dispatches alerts"""
+
+    def __init__(self, monitor, alerts_path=None, quiet=False):
+        self.monitor = monitor
+        self.alerts_file = open(alerts_path, 'a', encoding='utf-8') if alerts_path else None
+        self.quiet = quiet
+
+    def handle_line(self, line, received_at=None):
+        received_at = time.perf_counter() if received_at is None else received_at
+        line = line.strip()
+        if not line:
+            return None
+        # A malformed line is counted and skipped; it never stops the watcher
+        try:
+            event = json.loads(line)
+            if not isinstance(event, dict):
+                raise ValueError("event is not a JSON object")
+            sent_at = float(event['ts']) if 'ts' in event else None
+            alert = self.monitor.apply(event)
+        except (ValueError, TypeError, KeyError, OverflowError):
+            self.monitor.stats['rejected'] += 1
+            return None
+        if alert is not None:
+            latency_ms = (time.perf_counter() - received_at) * 1e3
+            e2e_ms = (time.time() - sent_at) * 1e3 if sent_at is not None else None
+            if self.alerts_file:
+                self.alerts_file.write(json.dumps({**alert, 'latency_ms': round(latency_ms, 3)},
+                                                  ensure_ascii=False) + '\n')
+                self.alerts_file.flush()
+            if not self.quiet:
+                print_alert(alert, latency_ms, e2e_ms)
+        return alert
+
+    def close(self):
+        if self.alerts_file:
+            self.alerts_file.close()
+
+
+async def follow_file(pipeline, path, from_start=False):
+    """Apply lines appended to path as they arrive (like tail -f)"""
+    with open(path, encoding='utf-8') as f:
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        pending = ''
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                await asyncio.sleep(TAIL_POLL_SECONDS)
+                continue
+            pending += chunk
+            if pending.endswith('\n'):      # complete line written
+                pipeline.handle_line(pending)
+                pending = ''
+
+
+async def serve_events(pipeline, port=DEFAULT_PORT, unix_path=None):
+    """Apply newline-delimited JSON events sent by any number of clients"""
+    async def handle(reader, writer):
+        try:
+            async for line in reader:
+                pipeline.handle_line(line.decode('utf-8'))
+        finally:
+            writer.close()
+
+    if unix_path:
+        server = await asyncio.start_unix_server(handle, path=unix_path)
+    else:
+        server = await asyncio.start_server(handle, '127.0.0.1', port)
+    async with server:
+        await server.serve_forever()
+
+
+# ============================================================================
+# REPLAY & EVENT GENERATION
+# ============================================================================
+
+def replay(pipeline, path):
+    """Apply every event of a file as fast as possible; returns throughput stats"""
+    with open(path, encoding='utf-8') as f:
+        lines = f.readlines()
+    latencies = np.empty(len(lines))
+    start = time.perf_counter()
+    for n, line in enumerate(lines):
+        received = time.perf_counter()
+        pipeline.handle_line(line, received)
+        latencies[n] = time.perf_counter() - received
+    elapsed = time.perf_counter() - start
+    return {
+        'events': len(lines),
+        'seconds': elapsed,
+        'events_per_s': len(lines) / elapsed if elapsed else float('inf'),
+        'p50_us': float(np.percentile(latencies, 50) * 1e6) if len(lines) else 0.0,
+        'p99_us': float(np.percentile(latencies, 99) * 1e6) if len(lines) else 0.0,
+        'max_us': float(latencies.max() * 1e6) if len(lines) else 0.0,
+    }
+
+
+def generate_events(df, n_events, seed=42):
+    """Random stock-status changes (a few also change the tier) as JSON lines"""
+    rng = np.random.default_rng(seed)
+    ids = df['Product_ID'].astype(str).to_numpy()[rng.integers(0, len(df), n_events)]
+    statuses = np.asarray(STOCK_STATUSES)[rng.choice(len(STOCK_STATUSES), n_events,
+                                                     p=GENERATED_STATUS_WEIGHTS)]
+    tiers = np.where(rng.random(n_events) < GENERATED_TIER_CHANGE,
+                     rng.choice(['Bestseller', 'Average', 'Slow'], n_events), '')
+    lines = ('{"Product_ID": "' + ids.astype(object) + '", "Stock_Status": "' +
+             statuses.astype(object) + '"' +
+             np.where(tiers != '', ', "Performance_Tier": "' + tiers.astype(object) + '"',
+                      '').astype(object) + '}\n')
+    return ''.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Streaming out-of-stock bestseller alerts")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    gen = commands.add_parser('generate', help="write random stock events for a catalog")
+    gen.add_argument('csv_path')
+    gen.add_argument('events_path')
+    gen.add_argument('--events', type=int, default=100_000)
+    gen.add_argument('--seed', type=int, default=42)
+
+    rep = commands.add_parser('replay', help="benchmark: apply an event file as fast as possible")
+    rep.add_argument('csv_path')
+    rep.add_argument('events_path')
+    rep.add_argument('--alerts-file', help="append alerts as JSON lines")
+    rep.add_argument('--show-alerts', action='store_true', help="print every alert")
+    rep.add_argument('--verify', action='store_true',
+                     help="check the final state against the batch computation")
+
+    watch = commands.add_parser('watch', help="apply live events and print alerts")
+    watch.add_argument('csv_path')
+    source = watch.add_mutually_exclusive_group(required=True)
+    source.add_argument('--tail', metavar='EVENTS_PATH', help="follow an event file")
+    source.add_argument('--port', type=int, help=f"listen on a TCP port (e.g. {DEFAULT_PORT})")
+    source.add_argument('--unix', metavar='PATH', help="listen on a Unix socket")
+    watch.add_argument('--from-start', action='store_true',
+                       help="with --tail, apply the events already in the file first")
+    watch.add_argument('--alerts-file', help="append alerts as JSON lines")
+
+    args = parser.parse_args()
+    df = pd.read_csv(args.csv_path, usecols=CATALOG_COLUMNS)
+
+    if args.command == 'generate':
+        with open(args.events_path, 'w', encoding='utf-8') as f:
+            f.write(generate_events(df, args.events, args.seed))
+        print(f"✓ {args.events:,} events saved to: {args.events_path}")
+        sys.exit(0)
+
+    monitor = StockMonitor(df)
+    print(f"✓ Monitoring {len(df):,} products: {len(monitor.oos)} out-of-stock bestsellers, "
+          f"₹{monitor.lost_paise / 100:,.0f}/month at risk")
+
+    if args.command == 'replay':
+        pipeline = EventPipeline(monitor, args.alerts_file, quiet=not args.show_alerts)
+        result = replay(pipeline, args.events_path)
+        pipeline.close()
+        print(f"\n📈 {result['events']:,} events in {result['seconds']:.3f}s "
+              f"({result['events_per_s']:,.0f} events/s)")
+        print(f"   Per-event latency: p50 {result['p50_us']:.1f} µs, "
+              f"p99 {result['p99_us']:.1f} µs, max {result['max_us']:.1f} µs\n")
+        monitor.summary()
+        if args.verify:
+            problems = monitor.verify(df)
+            if problems:
+                print("\n❌ Verification FAILED:")
+                for problem in problems:
+                    print(f"  • {problem}")
+                sys.exit(1)
+            print("\n✅ Live state matches the batch computation")
+    else:
+        pipeline = EventPipeline(monitor, args.alerts_file)
+        try:
+            if args.tail:
+                asyncio.run(follow_file(pipeline, args.tail, args.from_start))
+            else:
+                asyncio.run(serve_events(pipeline, args.port, args.unix))
+        except KeyboardInterrupt:
+            print()
+            monitor.summary()
+        finally:
+            pipeline.close()
@@ -0,0 +1,245 @@
+"""
+THE SHOP INDIA - STREAMING (OUT-OF-CORE) ANALYSIS
+=================================================
+Analyzes a product CSV that does not fit in memory.
+
+The CSV is read in fixed-size chunks. Each chunk is reduced to a partial
+aggregate table (aggregations.partial_aggregates) and merged into the
+running total, so sums, counts, means, min/max and the stock crosstab are
+exact. The describe() percentiles of Price_INR and Units_Sold_30_Days come
+from mergeable quantile sketches. Peak memory is bounded by the chunk size.
+
+Usage:
+    python streaming.py product_analysis_data.csv --chunksize 250000
+"""
+
+import argparse
+import math
+
+import numpy as np
+import pandas as pd
+
+from aggregations import GROUP_KEYS, CatalogAggregates, partial_aggregates, rollup
+
+DEFAULT_CHUNKSIZE = 250_000
+
+# Only the columns the aggregates need are parsed from each chunk
+STREAM_COLUMNS = ['Main_Category', 'Price_INR', 'Units_Sold_30_Days', 'Revenue_30_Days',
+                  'Stock_Status', 'Customer_Rating', 'Num_Reviews', 'Performance_Tier',
+                  'Date_Added']
+
+SKETCH_COLUMNS = ['Price_INR', 'Units_Sold_30_Days']
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative-error guarantees (DDSketch).
+
+    Positive values go into logarithmic buckets of width `relative_accuracy`,
+    so every quantile estimate is within that relative error of a true
+    sample value. Count, mean, std, min and max are tracked exactly, and two
+    sketches built on disjoint data merge by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy=0.005):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0              # sum of squared deviations (for std)
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values):
+        """Add an array of non-negative values"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        if (values < 0).any():
+            raise ValueError("QuantileSketch only accepts non-negative values")
+
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        index = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+        for i, c in zip(*np.unique(index, return_counts=True)):
+            self.buckets[int(i)] = self.buckets.get(int(i), 0) + int(c)
+
+        n = len(values)
+        mean = float(values.mean())
+        self._combine_moments(n, mean, float(((values - mean) ** 2).sum()))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        return self
+
+    def merge(self, other):
+        """Fold another sketch (same relative accuracy) into this one"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for i, c in other.buckets.items():
+            self.buckets[i] = self.buckets.get(i, 0) + c
+        self.zero_count += other.zero_count
+        self._combine_moments(other.count, other.mean, other._m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def remove(self, values):
+        """
+        Remove values that were previously added (deletions in incremental
+        state). Min and max are not tracked through removals; callers that
+        need them exact must maintain them separately.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        positive = values[values > 0]
+        self.zero_count -= len(values) - len(positive)
+        index = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+        for i, c in zip(*np.unique(index, return_counts=True)):
+            left = self.buckets.get(int(i), 0) - int(c)
+            if left < 0 or self.zero_count < 0:
+                raise ValueError("Removing values that were never added to the sketch")
+            if left:
+                self.buckets[int(i)] = left
+            else:
+                del self.buckets[int(i)]
+
+        n = len(values)
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        remaining = self.count - n
+        if remaining <= 0:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return self
+        # Inverse of the parallel update in _combine_moments
+        rest_mean = (self.count * self.mean - n * mean) / remaining
+        delta = mean - rest_mean
+        self._m2 = max(0.0, self._m2 - m2 - delta ** 2 * remaining * n / self.count)
+        self.mean = rest_mean
+        self.count = remaining
+        return self
+
+    def _combine_moments(self, n, mean, m2):
+        """Chan et al. parallel update of count, mean and M2"""
+        if n == 0:
+            return
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1, as pandas)"""
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+    def quantile(self, q):
+        """Approximate q-quantile (same rank convention as pandas: q * (n - 1))"""
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+            if seen > rank:
+                value = 2 * self.gamma ** i / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def describe(self, name=None):
+        """Series laid out like pandas' Series.describe()"""
+        return pd.Series({
+            'count': float(self.count),
+            'mean': self.mean if self.count else math.nan,
+            'std': self.std,
+            'min': self.min if self.count else math.nan,
+            '25%': self.quantile(0.25),
+            '50%': self.quantile(0.50),
+            '75%': self.quantile(0.75),
+            'max': self.max if self.count else math.nan,
+        }, name=name)
+
+
+def stream_catalog(csv_path, chunksize=DEFAULT_CHUNKSIZE, relative_accuracy=0.005):
+    """
+    Aggregate a product CSV chunk by chunk.
+
+    Returns (CatalogAggregates, {column: QuantileSketch}). At most one chunk
+    plus the (small) merged partial table is held in memory at a time.
+    """
+    partial = None
+    sketches = {col: QuantileSketch(relative_accuracy) for col in SKETCH_COLUMNS}
+
+    for chunk in pd.read_csv(csv_path, usecols=STREAM_COLUMNS, chunksize=chunksize):
+        chunk_partial = partial_aggregates(chunk)
+        partial = chunk_partial if partial is None else rollup(
+            pd.concat([partial, chunk_partial], ignore_index=True), GROUP_KEYS)
+        for col, sketch in sketches.items():
+            sketch.add(chunk[col].to_numpy())
+
+    if partial is None:
+        raise ValueError(f"No product rows in {csv_path}")
+    return CatalogAggregates(partial), sketches
+
+
+def print_streaming_report(agg, sketches):
+    """Print the dataset overview and the aggregate tables of the report"""
+    print("=" * 80)
+    print("THE SHOP INDIA - STREAMING CATALOG ANALYSIS")
+    print("=" * 80 + "\n")
+
+    print(f"Total Products: {agg.totals['products']}")
+    print(f"Categories: {agg.totals['categories']}")
+    print(f"Date Range: {agg.totals['date_min']} to {agg.totals['date_max']}")
+    print()
+
+    print("Price Statistics (INR, approximate percentiles):")
+    print(sketches['Price_INR'].describe('Price_INR'))
+    print()
+
+    print("Sales Performance (Last 30 Days, approximate percentiles):")
+    print(sketches['Units_Sold_30_Days'].describe('Units_Sold_30_Days'))
+    print()
+
+    print("Category Performance (Last 30 Days):")
+    print(agg.category_performance().to_string())
+    print()
+
+    print("Price Band Performance:")
+    print(agg.price_distribution().to_string())
+    print()
+
+    print("Stock Status by Category:")
+    print(agg.stock_analysis().to_string())
+    print()
+
+    print("Customer Ratings by Category:")
+    print(agg.rating_analysis().to_string())
+    print()
+
+    print(f"Out-of-Stock Bestsellers: {agg.totals['oos_bestsellers']}")
+    print(f"Total Revenue (30 days): ₹{agg.totals['revenue']:,.0f}")
+    print(f"Total Units Sold (30 days): {agg.totals['units']:,}")
+    print(f"Overall Customer Rating: {agg.totals['avg_rating']:.2f}/5.0")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Chunked analysis of a product CSV")
+    parser.add_argument('csv_path', nargs='?', default='product_analysis_data.csv')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help="rows per chunk (bounds peak memory)")
+    parser.add_argument('--relative-accuracy', type=float, default=0.005,
+                        help="relative error of the percentile sketches")
+    args = parser.parse_args()
+
+    agg, sketches = stream_catalog(args.csv_path, args.chunksize, args.relative_accuracy)
+    print_streaming_report(agg, sketches)